@@ -0,0 +1,158 @@
+"""
+asgi_app.py
+
+/message, /menu 스킬의 비동기(ASGI) 서빙 모드. app.py 와 같은 MessageService / MenuService 를 쓰므로
+카카오 응답 JSON 은 바이트 단위까지 동일합니다.
+
+- 캐시/메모리 인덱스 적중은 이벤트 루프에서 바로 응답
+- DB 조회만 크기가 제한된 스레드 풀(ASYNC_DB_WORKERS, 기본=DB 풀 크기)로 넘김
+  같은 조건으로 동시에 온 요청은 한 조회를 루프에서 같이 기다림 (스레드를 더 잡지 않음)
+  → 느린 쿼리가 다른 요청을 막지 않고, DB 동시 접속도 풀 상한을 넘지 않음
+
+실행:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, PlainTextResponse
+from starlette.routing import Route
+
+from configs.db_config import DB_POOL_CONFIG
+from scripts.serving.message_service import MessageQuery, SearchQuery, get_db_connection, create_message_service
+from scripts.serving.menu_service import create_menu_service
+from scripts.serving.warmup import Warmup
+from scripts.serving.kakao_response import dumps
+from scripts.utils.db_pool import PoolTimeoutError
+from scripts.utils.metrics import StageTimer
+from scripts.serving.observability import request_id, record, render_metrics, health, CONTENT_TYPE
+
+SERVICE = create_message_service(get_db_connection)
+MENU = create_menu_service(SERVICE.pool.connection, SERVICE.today)
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ASYNC_DB_WORKERS", DB_POOL_CONFIG['max_size'])),
+    thread_name_prefix="db-offload",
+)
+WARMUP = Warmup(SERVICE, MENU,
+                connections=SERVICE.config.warmup_connections,
+                queries=SERVICE.config.warmup_queries.split(";"))
+
+
+class KakaoJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+async def hello(request: Request):
+    return PlainTextResponse('안녕')
+
+
+async def stats(request: Request):
+    return KakaoJSONResponse({**SERVICE.stats(), "menu_index": MENU.stats(), "warmup": WARMUP.stats()})
+
+
+async def metrics(request: Request):
+    return Response(render_metrics(SERVICE, MENU, WARMUP), headers={"content-type": CONTENT_TYPE})
+
+
+async def healthz(request: Request):
+    # DB 확인(SELECT 1)은 블로킹이므로 스레드로
+    ready, body = await asyncio.get_running_loop().run_in_executor(
+        DB_EXECUTOR, health, SERVICE, MENU, WARMUP if SERVICE.config.warmup_enabled else None)
+    return KakaoJSONResponse(body, status_code=200 if ready else 503)
+
+
+def _respond(route: str, timer: StageTimer, rid: str, data, payload) -> KakaoJSONResponse:
+    with timer.stage("serialize"):
+        response = KakaoJSONResponse(payload)
+    record(route, timer, rid, data)
+    return response
+
+
+def _invalid_json(route: str, timer: StageTimer, rid: str) -> PlainTextResponse:
+    timer.label(outcome="invalid_json")
+    record(route, timer, rid, status=400)
+    return PlainTextResponse('Invalid JSON', status_code=400)
+
+
+async def message(request: Request):
+    timer = StageTimer()
+    rid = request_id(request.headers)
+    try:
+        with timer.stage("json_parse"):
+            data = await request.json()
+    except Exception:
+        return _invalid_json("message", timer, rid)
+
+    q = SERVICE.parse(data, timer)
+    if isinstance(q, SearchQuery):
+        # 메모리 역색인 조회라 루프에서 바로
+        return _respond("message", timer, rid, data, SERVICE.search(q, timer))
+    if not isinstance(q, MessageQuery):
+        return _respond("message", timer, rid, data, q)
+
+    page = SERVICE.cached_page(q, timer)
+    if page is None:
+        job = SERVICE.callback_job(data, q, timer)
+        if job is not None:
+            # 콜백 블록: budget 안에 못 끝나면 '찾는 중' 먼저, 결과는 작업자가 callbackUrl 로 POST
+            payload = await job.result_async(SERVICE.callback_budget(timer))
+            return _respond("message", timer, rid, data, payload if payload is not None else SERVICE.waiting(timer))
+        try:
+            page = await SERVICE.load_page_async(q, timer, DB_EXECUTOR)
+        except PoolTimeoutError:
+            return _respond("message", timer, rid, data, SERVICE.busy(timer))
+    return _respond("message", timer, rid, data, SERVICE.render(q, page))
+
+
+async def menu(request: Request):
+    timer = StageTimer()
+    rid = request_id(request.headers)
+    try:
+        with timer.stage("json_parse"):
+            data = await request.json()
+    except Exception:
+        return _invalid_json("menu", timer, rid)
+
+    if MENU.index.is_stale():
+        # 새 주 식단 적재(드묾)만 스레드로, 나머지는 스냅샷 조회라 루프에서 바로
+        await asyncio.get_running_loop().run_in_executor(DB_EXECUTOR, MENU.index.ensure_fresh)
+    reply = MENU.handle(data, timer)
+    return _respond("menu", timer, rid, data, reply)
+
+
+def _startup():
+    # 시작 준비는 스레드에서 (루프는 바로 요청을 받고, 준비 전 /healthz 는 503)
+    if SERVICE.config.warmup_enabled:
+        WARMUP.start()
+
+
+def _shutdown():
+    DB_EXECUTOR.shutdown(wait=False)
+    SERVICE.index.stop()
+    if SERVICE.search_index is not None:
+        SERVICE.search_index.stop()
+    if SERVICE.callbacks is not None:
+        SERVICE.callbacks.shutdown()
+    MENU.index.stop()
+    SERVICE.pool.close()
+
+
+app = Starlette(
+    routes=[
+        Route('/', hello),
+        Route('/stats', stats),
+        Route('/metrics', metrics),
+        Route('/healthz', healthz),
+        Route('/message', message, methods=['POST']),
+        Route('/menu', menu, methods=['POST']),
+    ],
+    on_startup=[_startup],
+    on_shutdown=[_shutdown],
+)
@@ -10,4 +10,20 @@ DB_CONFIG = {
     'user': os.getenv("DB_USER"),
     'password': os.getenv("DB_PASSWORD"),
     'database': os.getenv("DB_NAME"),
-}
\ No newline at end of file
+}
+
+# 웹훅용 커넥션 풀 설정 (scripts/utils/db_pool.py)
+DB_POOL_CONFIG = {
+    'max_size': int(os.getenv("DB_POOL_SIZE", 5)),
+    'max_age': float(os.getenv("DB_POOL_MAX_AGE", 1800)),   # 초, 넘으면 재연결
+    'timeout': float(os.getenv("DB_POOL_TIMEOUT", 3)),      # 초, 상한 도달 시 대기 한도
+    'ping_after': float(os.getenv("DB_POOL_PING_AFTER", 30)),  # 초, 이만큼 놀았으면 SELECT 1 확인
+}
+
+# 저장소 백엔드: mssql(운영 Azure SQL, 기본) / sqlite(로컬 벤치마크·부하 테스트, scripts/utils/sqlite_backend.py)
+DB_BACKEND = os.getenv("DB_BACKEND", "mssql").strip().lower()
+
+SQLITE_CONFIG = {
+    'path': os.getenv("SQLITE_PATH", "data/knuchatbot.sqlite3"),
+    'timeout': float(os.getenv("SQLITE_BUSY_TIMEOUT", 5)),  # 초, 다른 연결이 쓰는 중이면 기다리는 한도
+}
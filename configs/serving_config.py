@@ -0,0 +1,59 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+load_dotenv()
+
+@dataclass
+class ServingConfig:
+    result_cache_size: int    # 캐시할 (topic, department, sort, today) 조합 수
+    result_cache_ttl: float   # 초, 카드 중 가장 이른 마감일이 지나는 KST 자정을 넘기지는 않음
+    result_cache_prewarm_size: int     # KST 자정 직후 다시 채울 인기 조합 수 (0 이면 끔)
+    result_cache_prewarm_ttl: float    # 초, 자정에 다시 채운 항목 유효 시간 (아침 피크까지)
+    notice_index_enabled: bool          # 메모리 인덱스로 먼저 답하고 없으면 DB
+    notice_index_refresh_interval: float  # 초, 세대 번호 확인 주기
+    singleflight_enabled: bool  # 같은 조건으로 동시에 온 DB 조회를 한 번으로 합침
+    notice_snapshot_path: str           # 비어 있지 않으면 워커는 DB 대신 적재기가 쓴 스냅샷 파일을 매핑 (serving/notice_snapshot.py)
+    topn_enabled: bool        # DB 경로에서 미리 채워 둔 조합별 상위 N건(dbo.notice_topn)을 먼저 읽음
+    topn_size: int            # 조합·정렬마다 채울 건수 (db_tasks/topn_repo.py)
+    search_index_enabled: bool          # '주제, 학과' 형식이 아닌 발화는 자유 검색 (n-gram 역색인)
+    kakao_more_block_id: str  # '더 보기' 바로가기가 연결될 오픈빌더 블록 ID (커서는 extra 로 전달; 없으면 워커 메모리에 사용자별로 보관)
+    web_workers: int          # 워커 프로세스 수 (gunicorn 도 WEB_CONCURRENCY 를 -w 기본값으로 씀), 2 이상인데 블록 ID 가 없으면 '더 보기'를 끔
+    menu_refresh_interval: float  # 초, 식단 세대 번호(새 주 적재) 확인 주기
+    callback_enabled: bool    # 요청에 callbackUrl 이 있으면 느린 조회를 콜백으로 넘김 (블록에서 콜백 설정 필요)
+    callback_budget: float    # 초, 요청 시작부터 이만큼 안에 못 끝나면 '찾는 중' 응답 후 콜백 POST
+    callback_workers: int     # 콜백 작업자 수
+    warmup_enabled: bool      # 시작 직후 커넥션/인덱스/자주 찾는 조합을 미리 준비, 끝나기 전 /healthz 는 503
+    warmup_connections: int   # 미리 열 DB 커넥션 수 (풀 상한 안에서)
+    warmup_queries: str       # 캐시를 미리 채울 발화, ';' 로 구분 ('주제, 학과[, 정렬]')
+    request_log_enabled: bool        # 요청별 JSON 한 줄 로그 (logs/requests.jsonl, 백그라운드 스레드가 씀)
+    request_log_sample_rate: float   # 0~1, 전체 카카오 페이로드까지 남길 요청 비율
+    request_log_queue_size: int      # 쓰기 대기 줄 수 상한, 넘치면 요청을 막지 않고 버림
+    request_log_stdout: bool         # App Service 로그 스트림(stdout)에도 같은 줄 출력
+
+def get_serving_config() -> ServingConfig:
+    return ServingConfig(
+        result_cache_size=int(os.getenv("RESULT_CACHE_SIZE", 512)),
+        result_cache_ttl=float(os.getenv("RESULT_CACHE_TTL", 600)),
+        result_cache_prewarm_size=int(os.getenv("RESULT_CACHE_PREWARM_SIZE", 50)),
+        result_cache_prewarm_ttl=float(os.getenv("RESULT_CACHE_PREWARM_TTL", 6 * 3600)),
+        notice_index_enabled=os.getenv("NOTICE_INDEX_ENABLED", "1") == "1",
+        notice_index_refresh_interval=float(os.getenv("NOTICE_INDEX_REFRESH_INTERVAL", 30)),
+        singleflight_enabled=os.getenv("SINGLEFLIGHT_ENABLED", "1") == "1",
+        notice_snapshot_path=os.getenv("NOTICE_SNAPSHOT_PATH", ""),
+        topn_enabled=os.getenv("TOPN_ENABLED", "1") == "1",
+        topn_size=int(os.getenv("TOPN_SIZE", 20)),
+        search_index_enabled=os.getenv("SEARCH_INDEX_ENABLED", "1") == "1",
+        kakao_more_block_id=os.getenv("KAKAO_MORE_BLOCK_ID", ""),
+        web_workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        menu_refresh_interval=float(os.getenv("MENU_REFRESH_INTERVAL", 60)),
+        callback_enabled=os.getenv("KAKAO_CALLBACK_ENABLED", "1") == "1",
+        callback_budget=float(os.getenv("KAKAO_CALLBACK_BUDGET", 3.0)),
+        callback_workers=int(os.getenv("KAKAO_CALLBACK_WORKERS", 4)),
+        warmup_enabled=os.getenv("WARMUP_ENABLED", "1") == "1",
+        warmup_connections=int(os.getenv("WARMUP_CONNECTIONS", 2)),
+        warmup_queries=os.getenv("WARMUP_QUERIES", "장학, 전체;공모전, 전체;취업, 전체"),
+        request_log_enabled=os.getenv("REQUEST_LOG_ENABLED", "1") == "1",
+        request_log_sample_rate=float(os.getenv("REQUEST_LOG_SAMPLE_RATE", 0.01)),
+        request_log_queue_size=int(os.getenv("REQUEST_LOG_QUEUE_SIZE", 10000)),
+        request_log_stdout=os.getenv("REQUEST_LOG_STDOUT", "0") == "1",
+    )
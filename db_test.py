@@ -2,6 +2,8 @@ import pyodbc
 import os
 from datetime import datetime
 from dotenv import load_dotenv
+from scripts.serving.notice_query import build_notice_query
+from scripts.utils.key_utils import like_prefix
 
 load_dotenv()
 
@@ -25,42 +27,9 @@ today = datetime.today().date()
 topic = topic.replace(' ', '').lower()
 department = department.replace(' ', '').lower()
 
-query = """
-SELECT DISTINCT
-    n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
-    a.file_url,
-    dep.departments
-FROM dbo.notice n
-JOIN (
-    SELECT
-        notice_id,
-        STRING_AGG(department, ', ') AS departments
-    FROM dbo.notice_department
-    GROUP BY notice_id
-) dep ON n.id = dep.notice_id
-OUTER APPLY (
-    SELECT TOP 1 file_url
-    FROM dbo.notice_attachment
-    WHERE notice_id = n.id
-    ORDER BY file_order ASC
-) a
-WHERE n.id IN (
-    SELECT notice_id
-    FROM dbo.notice_department
-    WHERE REPLACE(LOWER(department), ' ', '') LIKE ?
-)
-AND REPLACE(LOWER(n.topic), ' ', '') LIKE ?
-AND (n.deadline IS NULL OR n.deadline >= ?)
-
-    """
-if sort_option == '마감순':
-       query += " ORDER BY n.deadline ASC"
-elif sort_option == '최신순':
-        query += " ORDER BY n.created_at DESC"
-elif sort_option == '오래된순':
-        query += " ORDER BY n.created_at ASC"
+query, _ = build_notice_query(sort_option)
 
-cursor.execute(query, f"%{department[:2]}%", f"%{topic}%", today)
+cursor.execute(query, like_prefix(department[:2]), like_prefix(topic), today)
 rows = cursor.fetchall()
 
 for row in rows:
@@ -0,0 +1,129 @@
+"""
+bench/callback_standin.py
+
+카카오 콜백 URL 대역(stand-in). 오픈빌더 없이 useCallback 흐름(serving/callback.py)을 확인합니다.
+
+- CallbackStandin: 로컬 HTTP 서버. POST 본문을 받은 시각과 함께 모아 둠
+  status / delay 로 만료된 URL(4xx), 일시 오류(5xx), 느린 수신을 흉내
+- main(): 합성 DB 의 쿼리 지연을 스킬 제한(5초)보다 길게 두고 /message 를 한 번 보내
+  '찾는 중' 응답이 budget 안에 오고, 캐러셀이 콜백 URL 로 도착하는지 확인
+
+사용:
+    python -m scripts.bench.callback_standin --query-latency 6 --budget 3
+    python -m scripts.bench.callback_standin --status 503      # 재시도 후 실패 집계
+"""
+
+from __future__ import annotations
+import argparse
+import dataclasses
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+__all__ = ["CallbackStandin"]
+
+
+class CallbackStandin:
+    """
+    사용:
+        with CallbackStandin() as cb:
+            payload["userRequest"]["callbackUrl"] = cb.url
+            ...
+            bodies = cb.wait(1, timeout=10)
+    """
+    def __init__(self, port: int = 0, status: int = 200, delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.received: List[Tuple[float, dict]] = []
+        self._cond = threading.Condition()
+        standin = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if standin.delay:
+                    time.sleep(standin.delay)
+                with standin._cond:
+                    standin.received.append((time.perf_counter(), json.loads(body or b"null")))
+                    standin._cond.notify_all()
+                out = json.dumps({"taskId": "standin", "status": "SUCCESS"}).encode()
+                self.send_response(standin.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/callback"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "CallbackStandin":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def wait(self, n: int, timeout: float = 60.0) -> List[dict]:
+        """POST 가 n 건 올 때까지 (최대 timeout 초) 기다렸다가 받은 본문들."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self.received) < n:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            return [body for _, body in self.received]
+
+
+def main():
+    from configs.serving_config import get_serving_config
+    from scripts.bench.standin_db import StandinDatabase
+    from scripts.bench.kakao_loadtest import kakao_payload
+    from scripts.serving.message_service import create_message_service
+    from scripts.utils.metrics import StageTimer
+
+    parser = argparse.ArgumentParser(description="카카오 콜백 흐름 확인 (로컬 콜백 URL 대역)")
+    parser.add_argument("--query-latency", type=float, default=6.0, help="초, 합성 DB 쿼리 지연 (콜드 스타트 흉내)")
+    parser.add_argument("--budget", type=float, default=3.0, help="초, 바로 응답할지 콜백으로 넘길지 가르는 시간")
+    parser.add_argument("--status", type=int, default=200, help="콜백 URL 이 돌려줄 HTTP 상태")
+    parser.add_argument("--utterance", default="공모전, 전체, 최신순")
+    args = parser.parse_args()
+
+    db = StandinDatabase(2000, connect_latency=0.0, query_latency=args.query_latency, jitter=0.0)
+    config = dataclasses.replace(get_serving_config(), notice_index_enabled=False, result_cache_ttl=0,
+                                 search_index_enabled=False, callback_enabled=True,
+                                 callback_budget=args.budget)
+    service = create_message_service(db.connect, config=config, start_background=False)
+    with CallbackStandin(status=args.status) as cb:
+        data = kakao_payload(args.utterance, "standin-user")
+        data["userRequest"]["callbackUrl"] = cb.url
+        timer = StageTimer()
+        t0 = time.perf_counter()
+        reply = service.handle(data, timer)
+        print(f"[REPLY] {(time.perf_counter() - t0) * 1000:.0f} ms outcome={timer.labels.get('outcome')} "
+              f"useCallback={reply.get('useCallback', False)}")
+        if reply.get("useCallback"):
+            bodies = cb.wait(1, timeout=args.query_latency + 30)
+            if bodies:
+                at = cb.received[0][0]
+                outputs = bodies[0].get("template", {}).get("outputs", [])
+                print(f"[CALLBACK] {(at - t0) * 1000:.0f} ms after request, outputs={[list(o)[0] for o in outputs]}")
+            else:
+                print("[CALLBACK] nothing received")
+            for _ in range(50):  # 재시도가 끝날 때까지
+                if service.callbacks.stats()["pending"] == 0:
+                    break
+                time.sleep(0.1)
+        print(f"[STATS] {service.callbacks.stats()}")
+    service.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+bench/importtime_report.py
+
+콜드 스타트의 import 구간 측정 (`python -X importtime` 출력 요약).
+
+- 모듈마다 새 인터프리터로 --repeat 번 import 하고 총 시간 중앙값과
+  누적(cumulative) 기준 상위 모듈을 출력
+- 결과를 --history(JSON 한 줄씩)에 덧붙이고, 같은 모듈의 직전 기록과 차이를 보여줌
+  → 무거운 import 가 다시 모듈 최상단으로 올라오면 바로 보임
+
+사용:
+    python -m scripts.bench.importtime_report                        # app, asgi_app
+    python -m scripts.bench.importtime_report scripts.ingestion.run_ingestion --top 20
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MODULES = ["app", "asgi_app"]
+DEFAULT_HISTORY = "logs/importtime.jsonl"
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    `import time: self [us] | cumulative | imported package` 줄들을 읽어
+    (최상위 import 누적 합(ms), {모듈: (self_us, cumulative_us)})
+    """
+    modules: Dict[str, Tuple[int, int]] = {}
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 머리글 줄
+        self_us, cum_us, name = int(parts[0]), int(parts[1]), parts[2]
+        stripped = name.strip()
+        modules[stripped] = (self_us, cum_us)
+        if len(name) - len(name.lstrip()) <= 1:  # 들여쓰기 없음 = 최상위 import
+            total_us += cum_us
+    return total_us / 1000.0, modules
+
+
+def measure(module: str, repeat: int = 5) -> Tuple[float, Dict[str, Tuple[int, int]], List[float]]:
+    """새 인터프리터로 repeat 번 import. (중앙값 ms, 중앙값 실행의 모듈별 시간, 전체 ms 목록)"""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=os.getcwd(),
+        )
+        if proc.returncode != 0:
+            tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+            raise RuntimeError(f"import {module} failed: {tail[0]}")
+        startup_total, modules = parse_importtime(proc.stderr)
+        # 인터프리터 시작(site 등)은 빼고 대상 모듈의 누적 시간만
+        total = modules[module][1] / 1000.0 if module in modules else startup_total
+        runs.append((total, modules))
+    runs.sort(key=lambda r: r[0])
+    total, modules = runs[len(runs) // 2]
+    return total, modules, [r[0] for r in runs]
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _last_record(history: str, module: str) -> Optional[dict]:
+    last = None
+    try:
+        with open(history, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec.get("module") == module:
+                    last = rec
+    except FileNotFoundError:
+        pass
+    return last
+
+
+def main():
+    parser = argparse.ArgumentParser(description="python -X importtime 요약 + 기록")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 몇 개 모듈을 보여줄지")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON 한 줄씩 덧붙일 파일 ('' 이면 저장 안 함)")
+    args = parser.parse_args()
+
+    rev = _git_rev()
+    for module in args.modules:
+        total, modules, runs = measure(module, args.repeat)
+        top = sorted(modules.items(), key=lambda kv: kv[1][1], reverse=True)[:args.top]
+        print(f"\n== import {module}: median {total:.1f} ms "
+              f"(min {min(runs):.1f} / max {max(runs):.1f}, n={len(runs)})")
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for name, (self_us, cum_us) in top:
+            print(f"{cum_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+        if not args.history:
+            continue
+        prev = _last_record(args.history, module)
+        if prev is not None:
+            delta = total - prev["total_ms"]
+            print(f"-- vs {prev.get('git') or '?'} ({prev['at']}): {prev['total_ms']:.1f} ms → "
+                  f"{total:.1f} ms ({delta:+.1f} ms)")
+        record = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git": rev,
+            "python": platform.python_version(),
+            "module": module,
+            "total_ms": round(total, 1),
+            "runs_ms": [round(r, 1) for r in runs],
+            "top": [[name, round(cum_us / 1000, 1), round(self_us / 1000, 1)] for name, (self_us, cum_us) in top],
+        }
+        d = os.path.dirname(args.history)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+bench/kakao_loadtest.py
+
+카카오 오픈빌더 스킬 요청(payload)을 재생하는 부하 테스트 도구. 운영 Azure SQL 없이 오프라인으로 돕니다.
+
+- 페이로드: 프롬프트의 주제/학과 어휘(serving/resolver.py)로 실제와 같은 모양의 userRequest/action 을 생성
+  · 정식 학과명 / 약칭·단과대학 / 오타 / skillData / 잘못된 형식 / 학식(/menu) 을 섞음
+  · 인기 조합이 몰리도록 Zipf 분포, --seed 로 재현 가능, --save/--replay 로 JSONL 저장·재생
+  · --follow-rate: 응답에 '더 보기' 바로가기가 있으면 그 확률로 이어서 요청(같은 사용자)
+- 대상: 로컬 서버(--target wsgi|asgi, bench/standin_db.py 합성 DB 사용) 또는 --url 로 띄워 둔 서버
+- 부하: --rate 를 주면 개방형(초당 요청 수 고정, 지연은 예정 시각부터 측정해 coordinated omission 방지),
+  안 주면 --concurrency 만큼 쉬지 않고 보내는 폐쇄형
+- 변형(--variants): 풀/결과 캐시/메모리 인덱스를 켜고 끈 조합을 같은 페이로드로 차례로 측정
+
+사용:
+    python -m scripts.bench.kakao_loadtest --requests 3000 --concurrency 32
+    python -m scripts.bench.kakao_loadtest --target asgi --rate 200 --duration 20 --variants pool,pool+cache+index
+    python -m scripts.bench.kakao_loadtest --save payloads.jsonl --requests 5000
+    python -m scripts.bench.kakao_loadtest --replay payloads.jsonl --url http://127.0.0.1:5000
+"""
+
+from __future__ import annotations
+import argparse
+import dataclasses
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from scripts.bench.serving_bench import start_wsgi, start_asgi, _percentile
+from scripts.bench.synthetic import RESTAURANTS
+from scripts.serving.resolver import COLLEGE_ALIASES, DEPARTMENT_ALIASES, default_resolver
+
+SORTS = ["마감순", "최신순", "오래된순"]
+
+# 요청 종류 비율
+MIX = {
+    "canonical": 0.40,   # '공모전, 컴퓨터공학과, 최신순'
+    "alias": 0.20,       # '장학, 컴공' / '취업, 공대'
+    "typo": 0.08,        # '공모쩐, 컴퓨타공학과'
+    "skill_data": 0.10,  # skillData.topic / department
+    "malformed": 0.04,   # '안녕'
+    "menu": 0.18,        # '오늘 학식' → /menu
+}
+
+# 비교 변형: DB_POOL_CONFIG 덮어쓰기 + 결과 캐시 TTL + 메모리 인덱스
+VARIANTS = {
+    # max_age 를 아주 짧게 → 반납 즉시 폐기되어 요청마다 새 연결 (풀 도입 전과 같은 DB 왕복)
+    "baseline": {"pool": {"max_age": 1e-6}, "cache_ttl": 0, "index": False},
+    "pool": {"pool": {}, "cache_ttl": 0, "index": False},
+    "pool+cache": {"pool": {}, "cache_ttl": 600, "index": False},
+    "pool+cache+index": {"pool": {}, "cache_ttl": 600, "index": True},
+}
+
+
+# ---------- 페이로드 ----------
+def kakao_payload(utterance: str, user_id: str, block: str = "공지 검색",
+                  params: Optional[Dict[str, str]] = None, skill_data: Optional[dict] = None,
+                  client_extra: Optional[dict] = None) -> dict:
+    """오픈빌더 스킬 서버가 받는 요청 본문 모양."""
+    params = params or {}
+    payload = {
+        "intent": {"id": "intent-" + block, "name": block},
+        "userRequest": {
+            "timezone": "Asia/Seoul",
+            "params": {"ignoreMe": "true"},
+            "block": {"id": "block-" + block, "name": block},
+            "utterance": utterance,
+            "lang": "ko",
+            "user": {"id": user_id, "type": "botUserKey", "properties": {}},
+        },
+        "bot": {"id": "knuchat-bench", "name": "KNU챗봇"},
+        "action": {
+            "name": "skill",
+            "clientExtra": client_extra or {},
+            "params": dict(params),
+            "id": "action-" + block,
+            "detailParams": {k: {"origin": v, "value": v, "groupName": ""} for k, v in params.items()},
+        },
+    }
+    if skill_data:
+        payload["skillData"] = skill_data
+    return payload
+
+
+def _zipf(items: List[str], rnd: random.Random, s: float = 1.1) -> Tuple[List[str], List[float]]:
+    order = items[:]
+    rnd.shuffle(order)
+    return order, [1.0 / (rank ** s) for rank in range(1, len(order) + 1)]
+
+
+def _typo(word: str, rnd: random.Random) -> str:
+    if len(word) < 3:
+        return word
+    i = rnd.randrange(1, len(word))
+    op = rnd.choice(("sub", "del", "dup"))
+    if op == "del":
+        return word[:i] + word[i + 1:]
+    if op == "dup":
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + rnd.choice("가나다라마바사아자차카타파하") + word[i + 1:]
+
+
+def generate_requests(n: int, seed: int = 7, users: int = 500) -> List[dict]:
+    """
+    재현 가능한 요청 n개. 각 항목: {"path": "/message"|"/menu", "body": payload, "follow": 0~1 난수}
+    """
+    rnd = random.Random(seed)
+    resolver = default_resolver()
+    topics, topic_w = _zipf(resolver.topic_names(), rnd)
+    depts, dept_w = _zipf(resolver.department_names() + ["전체"] * 5, rnd)
+    aliases = list(DEPARTMENT_ALIASES) + list(COLLEGE_ALIASES) + ["IT대학", "사범대", "경영대"]
+    kinds, kind_w = list(MIX), list(MIX.values())
+    menu_phrases = ["오늘 학식", "내일 학식", "이번주 학식", "오늘 {r}", "내일 {r} 점심", "{r} 저녁", "금요일 학식"]
+
+    out = []
+    for _ in range(n):
+        user = f"bench-user-{rnd.randrange(users)}"
+        kind = rnd.choices(kinds, kind_w)[0]
+        topic = rnd.choices(topics, topic_w)[0]
+        dept = rnd.choices(depts, dept_w)[0]
+        sort = rnd.choice(SORTS + [None])
+        tail = f", {sort}" if sort else ""
+        if kind == "menu":
+            phrase = rnd.choice(menu_phrases).format(r=rnd.choice(RESTAURANTS))
+            out.append({"path": "/menu", "body": kakao_payload(phrase, user, block="학식")})
+            continue
+        if kind == "alias":
+            body = kakao_payload(f"{topic}, {rnd.choice(aliases)}{tail}", user)
+        elif kind == "typo":
+            body = kakao_payload(f"{_typo(topic, rnd)}, {_typo(dept, rnd)}{tail}", user)
+        elif kind == "skill_data":
+            body = kakao_payload(f"{topic} {dept}", user,
+                                 skill_data={"topic": topic, "department": dept, "sort": sort or "마감순"})
+        elif kind == "malformed":
+            body = kakao_payload(rnd.choice(["안녕", "공지", "도움말", "컴공"]), user)
+        else:
+            body = kakao_payload(f"{topic}, {dept}{tail}", user)
+        out.append({"path": "/message", "body": body, "follow": rnd.random()})
+    return out
+
+
+def save_requests(items: List[dict], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for it in items:
+            f.write(json.dumps(it, ensure_ascii=False) + "\n")
+
+
+def load_requests(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ---------- 실행 ----------
+@dataclasses.dataclass
+class RunResult:
+    variant: str
+    sent: int = 0
+    ok: int = 0
+    http_errors: int = 0
+    invalid: int = 0        # 200 이지만 카카오 응답 모양이 아님
+    timeouts: int = 0
+    follow_ups: int = 0
+    elapsed: float = 0.0
+    latencies_ms: List[float] = dataclasses.field(default_factory=list)
+    db_connects: Optional[int] = None
+    db_queries: Optional[int] = None
+
+    def summary(self) -> Dict[str, object]:
+        lat = sorted(self.latencies_ms)
+        errors = self.http_errors + self.invalid + self.timeouts
+        return {
+            "variant": self.variant,
+            "sent": self.sent,
+            "follow_ups": self.follow_ups,
+            "rps": round(self.sent / self.elapsed, 1) if self.elapsed else 0.0,
+            "error_rate": round(errors / self.sent, 4) if self.sent else 0.0,
+            "http_errors": self.http_errors,
+            "invalid": self.invalid,
+            "timeouts": self.timeouts,
+            "p50_ms": round(_percentile(lat, 0.50), 1),
+            "p90_ms": round(_percentile(lat, 0.90), 1),
+            "p95_ms": round(_percentile(lat, 0.95), 1),
+            "p99_ms": round(_percentile(lat, 0.99), 1),
+            "max_ms": round(lat[-1], 1) if lat else 0.0,
+            "db_connects": self.db_connects,
+            "db_queries": self.db_queries,
+        }
+
+
+def _more_reply(body: dict) -> Optional[dict]:
+    for qr in body.get("template", {}).get("quickReplies") or ():
+        if qr.get("label") == "더 보기":
+            return qr
+    return None
+
+
+def replay(base_url: str, items: List[dict], variant: str, concurrency: int,
+           rate: float = 0.0, follow_rate: float = 0.0, timeout: float = 10.0) -> RunResult:
+    result = RunResult(variant)
+    lock = threading.Lock()
+    local = threading.local()
+    t_start = time.perf_counter()
+
+    def post(path: str, body: dict, scheduled: float) -> Optional[dict]:
+        s = getattr(local, "session", None)
+        if s is None:
+            s = local.session = requests.Session()
+        status, parsed = None, None
+        try:
+            r = s.post(base_url + path, data=json.dumps(body, ensure_ascii=False).encode("utf-8"),
+                       headers={"Content-Type": "application/json"}, timeout=timeout)
+            status = r.status_code
+            if status == 200:
+                parsed = r.json()
+        except requests.Timeout:
+            status = "timeout"
+        except (requests.RequestException, ValueError):
+            status = None
+        ms = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            result.sent += 1
+            if status == "timeout":
+                result.timeouts += 1
+            elif status != 200:
+                result.http_errors += 1
+            elif not (isinstance(parsed, dict) and parsed.get("version") == "2.0" and "template" in parsed):
+                result.invalid += 1
+            else:
+                result.ok += 1
+                result.latencies_ms.append(ms)
+        return parsed
+
+    def one(i: int):
+        item = items[i]
+        scheduled = t_start + i / rate if rate > 0 else time.perf_counter()
+        if rate > 0:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        parsed = post(item["path"], item["body"], scheduled)
+        more = _more_reply(parsed) if parsed else None
+        if more and item.get("follow", 1.0) < follow_rate:
+            user = item["body"]["userRequest"]["user"]["id"]
+            follow = kakao_payload(more.get("messageText", "더 보기"), user,
+                                   client_extra=more.get("extra"))
+            with lock:
+                result.follow_ups += 1
+            post(item["path"], follow, time.perf_counter())
+
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, range(len(items))))
+    result.elapsed = time.perf_counter() - t_start
+    return result
+
+
+def run_local_variant(name: str, items: List[dict], args) -> RunResult:
+    """합성 DB + 변형 설정으로 서버를 띄워 측정한 뒤 내림."""
+    from configs.serving_config import get_serving_config
+    from scripts.bench.standin_db import StandinDatabase
+    from scripts.serving.message_service import create_message_service
+    from scripts.serving.menu_service import create_menu_service
+
+    spec = VARIANTS[name]
+    db = StandinDatabase(args.notices, seed=args.seed,
+                         connect_latency=args.connect_latency, query_latency=args.query_latency)
+    config = dataclasses.replace(get_serving_config(),
+                                 result_cache_ttl=spec["cache_ttl"], notice_index_enabled=spec["index"])
+    pool_config = {"max_size": args.pool_size, **spec["pool"]}
+    service = create_message_service(db.connect, config=config, start_background=False, pool_config=pool_config)
+    menu = create_menu_service(service.pool.connection, service.today, config=config, start_background=False)
+    if spec["index"]:
+        service.index.build()
+    if service.search_index is not None:
+        service.search_index.build()  # 쉼표 없는 발화(자유 검색)는 변형과 관계없이 역색인으로
+    menu.index.load()
+    db.connects = db.queries = 0  # 적재 쿼리는 빼고 측정
+
+    port = args.port
+    stop = (start_wsgi(service, port, args.wsgi_workers, menu) if args.target == "wsgi"
+            else start_asgi(service, port, menu))
+    try:
+        base = f"http://127.0.0.1:{port}"
+        replay(base, items[:min(50, len(items))], name, min(args.concurrency, 8))  # 워밍업
+        db.connects = db.queries = 0
+        result = replay(base, items, name, args.concurrency, args.rate, args.follow_rate, args.timeout)
+        result.db_connects, result.db_queries = db.connects, db.queries
+        return result
+    finally:
+        stop()
+        service.pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카카오 스킬 페이로드 재생 부하 테스트 (오프라인)")
+    parser.add_argument("--requests", type=int, default=2000, help="생성할 요청 수 (--duration 과 --rate 를 주면 무시)")
+    parser.add_argument("--duration", type=float, default=0.0, help="초, --rate 와 함께 주면 rate*duration 개")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 요청 수 (0 이면 폐쇄형)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--follow-rate", type=float, default=0.2, help="'더 보기' 를 이어서 누를 확률")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", help="생성한 페이로드를 JSONL 로 저장하고 종료")
+    parser.add_argument("--replay", help="저장한 JSONL 페이로드 재생")
+    parser.add_argument("--url", help="이미 떠 있는 서버 (예: http://127.0.0.1:5000). 주면 변형/합성 DB 없이 그대로 측정")
+    parser.add_argument("--target", choices=["wsgi", "asgi"], default="wsgi")
+    parser.add_argument("--variants", default="baseline,pool,pool+cache,pool+cache+index")
+    parser.add_argument("--notices", type=int, default=5000)
+    parser.add_argument("--connect-latency", type=float, default=0.05, help="초, 합성 DB 연결 지연")
+    parser.add_argument("--query-latency", type=float, default=0.02, help="초, 합성 DB 쿼리 왕복 지연")
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--wsgi-workers", type=int, default=8, help="동기 서버 동시 처리 수")
+    parser.add_argument("--port", type=int, default=18090)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--out", help="결과를 JSON 으로 저장")
+    args = parser.parse_args()
+
+    if args.replay:
+        items = load_requests(args.replay)
+    else:
+        n = int(args.rate * args.duration) if (args.rate and args.duration) else args.requests
+        items = generate_requests(n, seed=args.seed)
+    if args.save:
+        save_requests(items, args.save)
+        print(f"[SAVE] {len(items)} requests → {args.save}")
+        return
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    run_id = uuid.uuid4().hex[:8]
+    results = []
+    if args.url:
+        results.append(replay(args.url.rstrip("/"), items, "external", args.concurrency,
+                              args.rate, args.follow_rate, args.timeout))
+    else:
+        for name in [v.strip() for v in args.variants.split(",") if v.strip()]:
+            if name not in VARIANTS:
+                parser.error(f"unknown variant: {name} (choices: {', '.join(VARIANTS)})")
+            results.append(run_local_variant(name, items, args))
+
+    summaries = [r.summary() for r in results]
+    for s in summaries:
+        print(f"[{s['variant']}] " + "  ".join(f"{k}={v}" for k, v in s.items() if k != "variant"))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"run_id": run_id, "args": vars(args), "results": summaries}, f, ensure_ascii=False, indent=2)
+        print(f"[OUT] {args.out}")
+
+
+if __name__ == "__main__":
+    main()
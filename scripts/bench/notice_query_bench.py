@@ -0,0 +1,196 @@
+"""
+bench/notice_query_bench.py
+
+/message 공지 조회 쿼리 before/after 벤치마크.
+
+- 세션 임시 테이블(#notice, #notice_department, #notice_attachment)에
+  합성 공지 N건(기본 100,000)을 채움 → 운영 테이블은 건드리지 않음
+- before: REPLACE(LOWER(x), ' ', '') LIKE '%x%' (기존 쿼리)
+- after : topic_norm / department_norm 접두 탐색 + 인덱스 (serving/notice_query.py)
+- after+top: 위 쿼리 + TOP (PAGE_SIZE + 1)
+- +exact: 해석기(serving/resolver.py)로 찾은 허용 값 IN (...) 정확 일치 + TOP (웹훅이 실제로 보내는 형태)
+- 같은 (topic, department, sort) 조합을 반복 실행해 p50/p95/max(ms) 출력
+
+사용:
+    python -m scripts.bench.notice_query_bench --notices 100000 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date
+
+from scripts.utils.db_utils import get_connection
+from scripts.utils.key_utils import normalize_search_key, like_prefix
+from scripts.serving.notice_query import build_notice_query
+from scripts.serving.pagination import PAGE_SIZE
+from scripts.serving.resolver import default_resolver
+from scripts.bench.synthetic import generate_corpus
+
+BENCH_TABLES = {
+    "notice": "#notice",
+    "department": "#notice_department",
+    "attachment": "#notice_attachment",
+}
+
+LEGACY_QUERY = """
+SELECT DISTINCT
+    n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
+    a.file_url,
+    dep.departments
+FROM {notice} n
+JOIN (
+    SELECT
+        notice_id,
+        STRING_AGG(department, ', ') AS departments
+    FROM {department}
+    GROUP BY notice_id
+) dep ON n.id = dep.notice_id
+OUTER APPLY (
+    SELECT TOP 1 file_url
+    FROM {attachment}
+    WHERE notice_id = n.id
+    ORDER BY file_order ASC
+) a
+WHERE n.id IN (
+    SELECT notice_id
+    FROM {department}
+    WHERE REPLACE(LOWER(department), ' ', '') LIKE ?
+)
+AND REPLACE(LOWER(n.topic), ' ', '') LIKE ?
+AND (n.deadline IS NULL OR n.deadline >= ?)
+"""
+
+LEGACY_ORDER_BY = {
+    "마감순": " ORDER BY n.deadline ASC",
+    "최신순": " ORDER BY n.created_at DESC",
+    "오래된순": " ORDER BY n.created_at ASC",
+}
+
+PROBES = [
+    ("공모전", "컴퓨터공학과", "마감순"),
+    ("장학", "전체", "마감순"),
+    ("일반", "전체", "최신순"),
+    ("취업", "경영학전공", "마감순"),
+    ("비교과", "ai융합학과", "오래된순"),
+]
+
+
+def create_tables(cur):
+    cur.execute("""
+        CREATE TABLE #notice (
+            id INT PRIMARY KEY, title NVARCHAR(300), url NVARCHAR(500),
+            topic NVARCHAR(50), topic_norm NVARCHAR(100), oneline NVARCHAR(300),
+            deadline DATE NULL, created_at DATETIME2
+        );
+        CREATE TABLE #notice_department (
+            id INT IDENTITY PRIMARY KEY, notice_id INT,
+            department NVARCHAR(100), department_norm NVARCHAR(200)
+        );
+        CREATE TABLE #notice_attachment (
+            id INT IDENTITY PRIMARY KEY, notice_id INT,
+            file_url NVARCHAR(500), file_order INT, thumbnail_url NVARCHAR(500)
+        );
+    """)
+
+
+def seed(conn, n_notices: int, seed_value: int = 42, chunk: int = 5000):
+    cur = conn.cursor()
+    cur.fast_executemany = True
+
+    notices, dep_rows, att_rows = [], [], []
+    for sn in generate_corpus(n_notices, seed=seed_value):
+        notices.append((sn.id, sn.title, sn.url, sn.topic, normalize_search_key(sn.topic),
+                        sn.oneline, sn.deadline, sn.created_at))
+        for d in sn.departments:
+            dep_rows.append((sn.id, d, normalize_search_key(d)))
+        for order, url in enumerate(sn.attachments):
+            att_rows.append((sn.id, url, order))
+
+        if len(notices) >= chunk or sn.id == n_notices:
+            cur.executemany("INSERT INTO #notice VALUES (?, ?, ?, ?, ?, ?, ?, ?)", notices)
+            if dep_rows:
+                cur.executemany("INSERT INTO #notice_department (notice_id, department, department_norm) VALUES (?, ?, ?)", dep_rows)
+            if att_rows:
+                cur.executemany("INSERT INTO #notice_attachment (notice_id, file_url, file_order) VALUES (?, ?, ?)", att_rows)
+            notices, dep_rows, att_rows = [], [], []
+    conn.commit()
+    cur.close()
+
+
+def create_indexes(cur):
+    # migrations/0001_notice_search_norm.sql, 0005_serving_indexes.sql 과 같은 인덱스
+    cur.execute("CREATE INDEX IX_notice_department_norm ON #notice_department (department_norm, notice_id);")
+    cur.execute("CREATE INDEX IX_notice_topic_norm ON #notice (topic_norm, deadline) INCLUDE (created_at);")
+    cur.execute("CREATE INDEX IX_notice_attachment_notice ON #notice_attachment (notice_id, file_order) INCLUDE (file_url, thumbnail_url);")
+    cur.execute("CREATE INDEX IX_notice_department_notice ON #notice_department (notice_id) INCLUDE (department, department_norm);")
+
+
+def time_query(cur, sql: str, params: tuple, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        cur.execute(sql, *params)
+        cur.fetchall()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def summarize(samples: list[float]) -> str:
+    s = sorted(samples)
+    p95 = s[min(len(s) - 1, int(round(0.95 * (len(s) - 1))))]
+    return f"p50={statistics.median(s):8.2f}ms  p95={p95:8.2f}ms  max={s[-1]:8.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/message 조회 쿼리 before/after 벤치마크 (임시 테이블 사용)")
+    parser.add_argument("--notices", type=int, default=100_000, help="합성 공지 수")
+    parser.add_argument("--repeat", type=int, default=20, help="조합별 반복 횟수")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        create_tables(cur)
+        t0 = time.perf_counter()
+        seed(conn, args.notices)
+        print(f"[SEED] notices={args.notices} ({time.perf_counter() - t0:.1f}s)")
+
+        today = date.today()
+        legacy = LEGACY_QUERY.format(**BENCH_TABLES)
+        before = {}
+        for topic, dept, sort in PROBES:
+            sql = legacy + LEGACY_ORDER_BY.get(sort, "")
+            params = (f"%{normalize_search_key(dept)}%", f"%{normalize_search_key(topic)}%", today)
+            before[(topic, dept, sort)] = time_query(cur, sql, params, args.repeat)
+
+        create_indexes(cur)
+        conn.commit()
+        after, after_top, exact = {}, {}, {}
+        resolver = default_resolver()
+        for topic, dept, sort in PROBES:
+            params = (like_prefix(normalize_search_key(dept)), like_prefix(normalize_search_key(topic)), today)
+            sql, _ = build_notice_query(sort, tables=BENCH_TABLES)
+            after[(topic, dept, sort)] = time_query(cur, sql, params, args.repeat)
+            sql, _ = build_notice_query(sort, tables=BENCH_TABLES, limit=PAGE_SIZE + 1)
+            after_top[(topic, dept, sort)] = time_query(cur, sql, params, args.repeat)
+            # 해석기로 허용 값을 찾은 경우: IN (...) 정확 일치
+            topics = tuple(c.norm for c in resolver.topics(topic))
+            depts = tuple(c.norm for c in resolver.departments(dept))
+            sql, _ = build_notice_query(sort, tables=BENCH_TABLES, limit=PAGE_SIZE + 1,
+                                        n_departments=len(depts), n_topics=len(topics))
+            exact[(topic, dept, sort)] = time_query(cur, sql, depts + topics + (today,), args.repeat)
+
+        for key in PROBES:
+            print(f"{key}")
+            print(f"  before  {summarize(before[key])}")
+            print(f"  after   {summarize(after[key])}")
+            print(f"  +TOP    {summarize(after_top[key])}")
+            print(f"  +exact  {summarize(exact[key])}")
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
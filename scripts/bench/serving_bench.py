@@ -0,0 +1,210 @@
+"""
+bench/serving_bench.py
+
+동기(Flask, app.py) vs 비동기(ASGI, asgi_app.py) /message 처리량/지연 비교.
+
+- 두 서버 모두 로컬 DB 대역(bench/standin_db.py)을 쓰도록 SERVICE 를 교체
+- 동기 서버는 --wsgi-workers 개 요청만 동시에 처리 (gunicorn sync 워커 수 흉내)
+- 비동기 서버는 uvicorn 단일 프로세스 + DB 오프로드 스레드 풀
+- 결과 캐시/메모리 인덱스는 기본으로 끔 → 매 요청이 DB 경로를 탐
+- --sqlite PATH: 대역 대신 실제 SQL 을 실행하는 SQLite 파일 (utils/sqlite_backend.py, 비어 있으면 합성 공지로 채움)
+
+사용:
+    python -m scripts.bench.serving_bench --concurrency 32 --requests 2000 --query-latency 0.05
+    python -m scripts.bench.serving_bench --sqlite /tmp/knu_bench.sqlite3 --notices 20000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from scripts.bench.synthetic import TOPICS, allowed_departments
+
+SORTS = ["마감순", "최신순", "오래된순"]
+
+
+def _payloads(n: int, seed: int = 7) -> list[bytes]:
+    rnd = random.Random(seed)
+    depts = allowed_departments() + ["전체"] * 10
+    out = []
+    for _ in range(n):
+        utterance = f"{rnd.choice(TOPICS)}, {rnd.choice(depts)}, {rnd.choice(SORTS)}"
+        out.append(json.dumps({"userRequest": {"utterance": utterance}}, ensure_ascii=False).encode("utf-8"))
+    return out
+
+
+def _percentile(sorted_ms: list[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(round(p * (len(sorted_ms) - 1))))]
+
+
+def fire(url: str, payloads: list[bytes], concurrency: int) -> dict:
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(body: bytes):
+        nonlocal errors
+        s = getattr(local, "session", None)
+        if s is None:
+            s = local.session = requests.Session()
+        t0 = time.perf_counter()
+        try:
+            r = s.post(url, data=body, headers={"Content-Type": "application/json"}, timeout=30)
+            ok = r.status_code == 200
+        except requests.RequestException:
+            ok = False
+        ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            if ok:
+                latencies.append(ms)
+            else:
+                errors += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, payloads))
+    elapsed = time.perf_counter() - t0
+    lat = sorted(latencies)
+    return {
+        "requests": len(payloads),
+        "errors": errors,
+        "rps": round(len(payloads) / elapsed, 1),
+        "p50_ms": round(statistics.median(lat), 1) if lat else 0.0,
+        "p95_ms": round(_percentile(lat, 0.95), 1),
+        "p99_ms": round(_percentile(lat, 0.99), 1),
+    }
+
+
+def start_wsgi(service, port: int, workers: int, menu=None):
+    from werkzeug.serving import make_server
+    import app as flask_module
+
+    flask_module.SERVICE = service
+    if menu is not None:
+        flask_module.MENU = menu
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    gate = threading.BoundedSemaphore(workers)
+
+    def gated(environ, start_response):
+        with gate:  # 동기 워커 수만큼만 동시에 처리
+            return flask_module.app(environ, start_response)
+
+    server = make_server("127.0.0.1", port, gated, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def start_asgi(service, port: int, menu=None):
+    import uvicorn
+    import asgi_app
+
+    asgi_app.SERVICE = service
+    if menu is not None:
+        asgi_app.MENU = menu
+    server = uvicorn.Server(uvicorn.Config(asgi_app.app, host="127.0.0.1", port=port, log_level="warning"))
+    server.install_signal_handlers = lambda: None  # 메인 스레드가 아니므로
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop():
+        server.should_exit = True
+    return stop
+
+
+class _SqliteCounter:
+    """StandinDatabase 처럼 connect / connects 만 (db_connects 집계용)"""
+    def __init__(self, path: str):
+        self.path = path
+        self.connects = 0
+
+    def connect(self):
+        from scripts.utils.sqlite_backend import connect
+        self.connects += 1
+        return connect(self.path)
+
+
+def seed_sqlite(path: str, n_notices: int) -> None:
+    """합성 공지로 SQLite 파일 채우기 (이미 공지가 있으면 그대로) + 상위 N건 테이블"""
+    from scripts.bench.synthetic import generate_corpus
+    from scripts.db_tasks.notice_repo import bulk_upsert_notices
+    from scripts.db_tasks.topn_repo import rebuild_topn
+    from scripts.utils.key_utils import normalize_url, sha256_hex
+    from scripts.utils.sqlite_backend import connect
+
+    conn = connect(path)
+    try:
+        if conn.execute("SELECT COUNT(*) FROM dbo.notice").fetchone()[0]:
+            return
+        batch = []
+        for n in generate_corpus(n_notices):
+            batch.append({"url_hash": sha256_hex(normalize_url(n.url)), "title": n.title, "url": n.url,
+                          "topic": n.topic, "oneline": n.oneline, "deadline": n.deadline,
+                          "departments": n.departments, "attachments": n.attachments, "ocr_text": n.ocr_text})
+            if len(batch) >= 1000:
+                bulk_upsert_notices(conn, batch)
+                batch = []
+        if batch:
+            bulk_upsert_notices(conn, batch)
+        rebuild_topn(conn)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기 vs 비동기 /message 벤치마크 (로컬 DB 대역)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--notices", type=int, default=5000)
+    parser.add_argument("--connect-latency", type=float, default=0.05, help="초, DB 연결 지연")
+    parser.add_argument("--query-latency", type=float, default=0.05, help="초, 쿼리 왕복 지연")
+    parser.add_argument("--wsgi-workers", type=int, default=4, help="동기 서버 동시 처리 수")
+    parser.add_argument("--with-cache", action="store_true", help="결과 캐시/메모리 인덱스를 켠 채로 측정")
+    parser.add_argument("--sqlite", default=None, help="대역 대신 이 SQLite 파일로 (지연 옵션은 무시)")
+    args = parser.parse_args()
+
+    if not args.with_cache:
+        os.environ["RESULT_CACHE_TTL"] = "0"
+        os.environ["NOTICE_INDEX_ENABLED"] = "0"
+
+    from scripts.bench.standin_db import StandinDatabase
+    from scripts.serving.message_service import create_message_service
+
+    if args.sqlite:
+        seed_sqlite(args.sqlite, args.notices)
+
+    payloads = _payloads(args.requests)
+    results = {}
+    for name, port in (("wsgi", 18081), ("asgi", 18082)):
+        if args.sqlite:
+            db = _SqliteCounter(args.sqlite)
+        else:
+            db = StandinDatabase(args.notices, connect_latency=args.connect_latency, query_latency=args.query_latency)
+        service = create_message_service(db.connect)
+        stop = start_wsgi(service, port, args.wsgi_workers) if name == "wsgi" else start_asgi(service, port)
+        try:
+            url = f"http://127.0.0.1:{port}/message"
+            fire(url, payloads[:50], min(args.concurrency, 8))  # 워밍업
+            results[name] = fire(url, payloads, args.concurrency)
+            results[name]["db_connects"] = db.connects
+        finally:
+            stop()
+            service.index.stop()
+            service.pool.close()
+
+    for name, r in results.items():
+        print(f"[{name}] " + "  ".join(f"{k}={v}" for k, v in r.items()))
+
+
+if __name__ == "__main__":
+    main()
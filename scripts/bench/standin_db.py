@@ -0,0 +1,244 @@
+"""
+bench/standin_db.py
+
+운영 Azure SQL 없이 웹훅을 벤치마크하기 위한 로컬 DB 대역(stand-in).
+
+- pyodbc 와 같은 모양의 connect() / cursor() / execute(sql, *params) / fetchall()
+- 합성 코퍼스(bench/synthetic.py)를 메모리에 두고, 서빙 쿼리(serving/notice_query.py)와
+  메모리 인덱스 적재 쿼리(serving/notice_index.py), 검색 색인 적재 쿼리(serving/search_index.py),
+  상위 N건 테이블 조회(notice_query.fetch_topn_rows, 오늘 rebuild_topn 을 돌린 것처럼),
+  식단 적재 쿼리(serving/menu_index.py)를
+  파라미터로 해석해 같은 결과를 돌려줌
+  (SQL 엔진이 아니라 두 모듈이 보내는 쿼리만 아는 대역)
+- connect_latency / query_latency 만큼 sleep 해서 네트워크 왕복을 흉내
+  (sleep 은 GIL 을 놓으므로 실제 pyodbc I/O 대기와 같은 동시성 특성)
+
+사용:
+    db = StandinDatabase(n_notices=5000, connect_latency=0.05, query_latency=0.02)
+    service = create_message_service(db.connect)
+"""
+
+from __future__ import annotations
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import List, Optional
+
+from configs.serving_config import get_serving_config
+from scripts.bench.synthetic import generate_corpus, generate_menu
+from scripts.utils.key_utils import normalize_search_key
+from scripts.serving.notice_index import NoticeIndex
+from scripts.serving.pagination import PageCursor
+
+__all__ = ["StandinDatabase"]
+
+_FAMILY_SORT = {"deadline": "마감순", "created_desc": "최신순", "created_asc": "오래된순"}
+
+_TOP = re.compile(r"SELECT TOP \((\d+)\)")
+_IN = re.compile(r"(department_norm|topic_norm) IN \(([?, ]+)\)")
+
+
+def _unlike_prefix(pattern: str) -> str:
+    """key_utils.like_prefix 의 역변환."""
+    p = pattern[:-1] if pattern.endswith("%") else pattern
+    return p.replace("[%]", "%").replace("[_]", "_").replace("[[]", "[")
+
+
+def _thumbnail(file_url: str) -> str:
+    """썸네일 백필이 끝난 것처럼 (utils.thumbnail_utils.thumbnail_blob_path 와 같은 이름 규칙)."""
+    return file_url.rsplit(".", 1)[0] + ".thumb.jpg"
+
+
+class StandinDatabase:
+    def __init__(self, n_notices: int = 5000, seed: int = 42,
+                 connect_latency: float = 0.05, query_latency: float = 0.02, jitter: float = 0.2):
+        self.connect_latency = connect_latency
+        self.query_latency = query_latency
+        self.jitter = jitter
+        self._rnd = random.Random(seed)
+        self._rnd_lock = threading.Lock()
+        self.corpus = list(generate_corpus(n_notices, seed=seed))
+        monday = date.today() - timedelta(days=date.today().weekday())
+        self.menu = list(generate_menu(monday, days=14, seed=seed))
+        self.connects = 0
+        self.queries = 0
+        self._index: Optional[NoticeIndex] = None
+        self._index_day: Optional[date] = None
+        self._index_lock = threading.Lock()
+
+    # ---------- 지연 흉내 ----------
+    def _sleep(self, base: float) -> None:
+        if base <= 0:
+            return
+        with self._rnd_lock:
+            f = self._rnd.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(base * f)
+
+    def connect(self) -> "_StandinConnection":
+        self._sleep(self.connect_latency)
+        self.connects += 1
+        return _StandinConnection(self, latency=True)
+
+    # ---------- 적재 쿼리 응답 (notice_index.py) ----------
+    def notice_rows(self, since_id: int, today: date) -> List[tuple]:
+        return [(n.id, n.title, n.deadline, n.oneline, n.topic, normalize_search_key(n.topic),
+                 n.created_at, n.url)
+                for n in self.corpus
+                if n.id > since_id and (n.deadline is None or n.deadline >= today)]
+
+    def department_rows(self, since_id: int, today: date) -> List[tuple]:
+        return [(n.id, d, normalize_search_key(d))
+                for n in self.corpus
+                if n.id > since_id and (n.deadline is None or n.deadline >= today)
+                for d in n.departments]
+
+    def active_rows(self, today: date) -> List[tuple]:
+        return [(n.id,) for n in self.corpus if n.deadline is None or n.deadline >= today]
+
+    def attachment_rows(self, since_id: int) -> List[tuple]:
+        return [(n.id, n.attachments[0], _thumbnail(n.attachments[0]))
+                for n in self.corpus if n.id > since_id and n.attachments]
+
+    def search_rows(self, since_id: int, today: date) -> List[tuple]:
+        return [(n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
+                 n.attachments[0] if n.attachments else None,
+                 ", ".join(n.departments) or None,
+                 _thumbnail(n.attachments[0]) if n.attachments else None, n.ocr_text or None)
+                for n in self.corpus
+                if n.id > since_id and (n.deadline is None or n.deadline >= today)]
+
+    def menu_rows(self, start: date, end: date) -> List[tuple]:
+        return [r for r in self.menu if start <= r[3] <= end]
+
+    # ---------- 서빙 쿼리 응답 (notice_query.py) ----------
+    def _serving_index(self, today: date) -> NoticeIndex:
+        with self._index_lock:
+            if self._index is None or self._index_day != today:
+                @contextmanager
+                def _direct():
+                    yield _StandinConnection(self, latency=False)
+                self._index = NoticeIndex(_direct, today_fn=lambda: today)
+                self._index.build()
+                self._index_day = today
+            return self._index
+
+    def topn_rows(self, sql: str, params: tuple) -> List[tuple]:
+        n_exact = {col: vals.count("?") for col, vals in _IN.findall(sql)}
+        topics = params[:n_exact["topic_norm"]]
+        depts = params[len(topics):len(topics) + n_exact["department_norm"]]
+        family = params[-1]
+        today = date.today()
+        index = self._serving_index(today)
+        size = get_serving_config().topn_size
+        out = []
+        for t in sorted(topics):
+            for d in sorted(depts):
+                rows = index.lookup("", "", _FAMILY_SORT[family], today, limit=len(self.corpus),
+                                    department_norms=(d,), topic_norms=(t,)) or []
+                out.extend((today, t, d, len(rows)) + row for row in rows[:size])
+        return out or [(today,) + (None,) * 12]
+
+    def serve(self, sql: str, params: tuple) -> List[tuple]:
+        # 정확 일치(IN) 면 값 개수만큼, 접두 LIKE 면 패턴 하나
+        n_exact = {col: vals.count("?") for col, vals in _IN.findall(sql)}
+        n_dept = n_exact.get("department_norm", 0)
+        n_topic = n_exact.get("topic_norm", 0)
+        dept_params = params[:max(n_dept, 1)]
+        topic_params = params[len(dept_params):len(dept_params) + max(n_topic, 1)]
+        rest = params[len(dept_params) + len(topic_params):]
+        today, seek = rest[0], rest[1:]
+        if "n.created_at DESC" in sql:
+            sort_option = "최신순"
+        elif "n.created_at ASC" in sql:
+            sort_option = "오래된순"
+        else:
+            sort_option = "마감순"
+        topic = "" if n_topic else _unlike_prefix(topic_params[0])
+        department = "" if n_dept else _unlike_prefix(dept_params[0])
+
+        after = None
+        if len(seek) == 1:
+            after = PageCursor(topic, department, sort_option, int(seek[0]), deadline=None)
+        elif len(seek) == 3:
+            if sort_option == "마감순":
+                after = PageCursor(topic, department, sort_option, int(seek[2]), deadline=seek[0])
+            else:
+                after = PageCursor(topic, department, sort_option, int(seek[2]), created_at=seek[0])
+
+        m = _TOP.search(sql)
+        limit = int(m.group(1)) if m else len(self.corpus)
+        return self._serving_index(today).lookup(topic, department, sort_option, today,
+                                                 limit=limit, after=after,
+                                                 department_norms=dept_params if n_dept else (),
+                                                 topic_norms=topic_params if n_topic else ()) or []
+
+
+class _StandinConnection:
+    def __init__(self, db: StandinDatabase, latency: bool):
+        self.db = db
+        self.latency = latency
+
+    def cursor(self) -> "_StandinCursor":
+        return _StandinCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _StandinCursor:
+    def __init__(self, conn: _StandinConnection):
+        self.conn = conn
+        self._rows: List[tuple] = []
+
+    def execute(self, sql: str, *params):
+        db = self.conn.db
+        if len(params) == 1 and isinstance(params[0], (tuple, list)):
+            params = tuple(params[0])
+        if self.conn.latency:
+            db._sleep(db.query_latency)
+            db.queries += 1
+
+        if sql.strip() == "SELECT 1":
+            self._rows = [(1,)]
+        elif "MIN_ACTIVE_ROWVERSION()" in sql:
+            self._rows = [(1,)]
+        elif "row_version >=" in sql:
+            self._rows = []  # 코퍼스는 바뀌지 않음 — 변경 표시 이후 바뀐 공지 없음
+        elif "SELECT id FROM dbo.notice\n" in sql:
+            self._rows = db.active_rows(params[0])
+        elif "WHERE department_norm" in sql:
+            self._rows = db.serve(sql, params)
+        elif "FROM dbo.notice_topn_state" in sql:
+            self._rows = db.topn_rows(sql, params)
+        elif "dbo.notice_ocr_text" in sql:
+            self._rows = db.search_rows(params[0], params[1])
+        elif "FROM dbo.cafeteria_menu" in sql:
+            self._rows = db.menu_rows(params[0], params[1])
+        elif "ROW_NUMBER()" in sql:
+            self._rows = db.attachment_rows(params[0])
+        elif "FROM dbo.notice_department d" in sql:
+            self._rows = db.department_rows(params[0], params[1])
+        elif "FROM dbo.notice n" in sql:
+            self._rows = db.notice_rows(params[0], params[1])
+        else:
+            raise NotImplementedError(f"stand-in DB does not understand: {sql[:80]!r}")
+        return self
+
+    def fetchall(self) -> List[tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
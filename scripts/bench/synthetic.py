@@ -0,0 +1,87 @@
+"""
+bench/synthetic.py
+
+벤치마크/부하 테스트용 합성 공지 코퍼스 / 식단 생성기.
+학과/주제 어휘는 실제 분류 프롬프트(prompt_template.TEST_PROMPT_KR)와 같은 값을 씁니다.
+"""
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional
+
+from scripts.serving.resolver import default_resolver
+
+__all__ = ["TOPICS", "RESTAURANTS", "allowed_departments", "SyntheticNotice", "generate_corpus", "generate_menu"]
+
+TOPICS = default_resolver().topic_names()
+RESTAURANTS = ["천지관", "백록관", "크누테리아"]  # crawl/menu_crawl.CAFETERIAS
+_MEALS = ["아침", "점심", "저녁"]
+# 자유 검색(serving/search_index.py) 벤치용 제목/본문 어휘
+_TITLE_WORDS = ["해커톤", "토익 응시료 지원금", "현장실습", "멘토링", "SW 경진대회", "창업 캠프",
+                "봉사활동", "교환학생", "근로장학생", "튜터링", "취업 특강", "글로벌 인턴십"]
+_DISHES = ["쌀밥", "잡곡밥", "김치찌개", "된장국", "제육볶음", "돈까스", "비빔밥", "우동", "배추김치", "샐러드"]
+
+
+def allowed_departments() -> List[str]:
+    """프롬프트의 '학과 목록 (허용 값)' 학과명 (serving/resolver.py 와 같은 목록)."""
+    return default_resolver().department_names()
+
+
+@dataclass
+class SyntheticNotice:
+    id: int
+    title: str
+    url: str
+    topic: str
+    oneline: str
+    deadline: Optional[date]
+    created_at: datetime
+    departments: List[str] = field(default_factory=list)
+    attachments: List[str] = field(default_factory=list)
+    ocr_text: str = ""
+
+
+def generate_corpus(n: int, seed: int = 42, today: Optional[date] = None) -> Iterator[SyntheticNotice]:
+    """
+    재현 가능한 합성 공지 n건.
+    - deadline: 30% NULL, 나머지는 today 기준 -200 ~ +60일
+    - 학과 1~3개 ('전체' 비중을 실제처럼 높게), 첨부 0~2개
+    """
+    rnd = random.Random(seed)
+    text_rnd = random.Random(seed + 1)  # 제목/본문 어휘는 별도 난수열 (다른 필드 분포가 바뀌지 않도록)
+    depts = allowed_departments() + ["전체"] * 20
+    today = today or date.today()
+    now = datetime.now().replace(microsecond=0)
+    for i in range(1, n + 1):
+        words = text_rnd.sample(_TITLE_WORDS, 2)
+        yield SyntheticNotice(
+            id=i,
+            title=f"[{words[0]}] 합성 공지 {i}",
+            url=f"https://example.ac.kr/n/{i}",
+            topic=rnd.choice(TOPICS),
+            oneline=f"요약 {i}",
+            deadline=None if rnd.random() < 0.3 else today + timedelta(days=rnd.randint(-200, 60)),
+            created_at=now - timedelta(minutes=rnd.randint(0, 60 * 24 * 365)),
+            departments=list(dict.fromkeys(rnd.sample(depts, rnd.randint(1, 3)))),
+            attachments=[f"https://example.blob.core.windows.net/images/{i}_{o}.jpg"
+                         for o in range(rnd.randint(0, 2))],
+            ocr_text=f"{words[0]} {words[1]} 신청 안내 문의는 학생지원팀" if text_rnd.random() < 0.6 else "",
+        )
+
+
+def generate_menu(start: date, days: int = 14, seed: int = 42) -> Iterator[tuple]:
+    """
+    dbo.cafeteria_menu 행 모양 (restaurant, menu_group, meal_type, service_date, menu).
+    주말은 크누테리아만 점심 운영.
+    """
+    rnd = random.Random(seed)
+    for i in range(days):
+        d = start + timedelta(days=i)
+        for restaurant in RESTAURANTS:
+            if d.weekday() >= 5 and restaurant != "크누테리아":
+                continue
+            for meal in (_MEALS if d.weekday() < 5 else ["점심"]):
+                for group in ("A코너", "B코너") if restaurant == "천지관" else ("",):
+                    yield (restaurant, group, meal, d, " / ".join(rnd.sample(_DISHES, 4)))
@@ -12,10 +12,7 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from tqdm import tqdm
 from difflib import SequenceMatcher
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
 from datetime import datetime, timedelta
-from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import AzureError, ResourceNotFoundError  
 from dotenv import load_dotenv
 
@@ -39,16 +36,25 @@ AZURE_CONNECTION_STRING = os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
 AZURE_CONTAINER_NAME = "images"            # 이미지 저장 컨테이너
 AZURE_CSV_CONTAINER_NAME = "data"          # CSV 저장 컨테이너
 
-# Azure 서비스 클라이언트 초기화
-blob_service_client = None
-try:
-    if AZURE_CONNECTION_STRING:
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
-        print("☁️  Azure Blob Storage 클라이언트가 성공적으로 초기화되었습니다.")
-    else:
-        print("‼️  중요: AZURE_STORAGE_CONNECTION_STRING 환경 변수가 설정되지 않았습니다. 이미지/CSV의 Blob 업로드를 건너뜁니다.")
-except Exception as e:
-    print(f"❌ Azure 클라이언트 초기화 실패: {e}. 이미지/CSV의 Blob 업로드를 건너뜁니다.")
+# Azure 서비스 클라이언트: import 시점이 아니라 처음 쓸 때 초기화 (실패/미설정이면 None)
+_blob_service_client = None
+_blob_service_client_initialized = False
+
+def get_blob_service_client():
+    global _blob_service_client, _blob_service_client_initialized
+    if _blob_service_client_initialized:
+        return _blob_service_client
+    _blob_service_client_initialized = True
+    try:
+        if AZURE_CONNECTION_STRING:
+            from azure.storage.blob import BlobServiceClient
+            _blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
+            print("☁️  Azure Blob Storage 클라이언트가 성공적으로 초기화되었습니다.")
+        else:
+            print("‼️  중요: AZURE_STORAGE_CONNECTION_STRING 환경 변수가 설정되지 않았습니다. 이미지/CSV의 Blob 업로드를 건너뜁니다.")
+    except Exception as e:
+        print(f"❌ Azure 클라이언트 초기화 실패: {e}. 이미지/CSV의 Blob 업로드를 건너뜁니다.")
+    return _blob_service_client
 
 # --- 세션 및 재시도 설정 ---
 session = requests.Session()
@@ -71,6 +77,7 @@ def save_image(img_url, folder, prefix, idx, original_name="image.jpg", referer_
     이미지를 다운로드하여 Azure Blob Storage에 저장합니다.
     Azure 클라이언트가 설정되지 않았다면 이미지 저장을 건너뜁니다.
     """
+    blob_service_client = get_blob_service_client()
     if not blob_service_client:
         return None
 
@@ -199,6 +206,7 @@ def load_existing_data():
     global pre_existing_data, existing_keys_set
 
     # 1) Azure Blob 시도
+    blob_service_client = get_blob_service_client()
     if blob_service_client:
         try:
             blob_client = blob_service_client.get_blob_client(container=AZURE_CSV_CONTAINER_NAME, blob=CSV_FILE)
@@ -264,8 +272,13 @@ def add_notice_if_not_duplicate(title, date, content, link, images):
             return False
 
         seq_ratio = SequenceMatcher(None, norm_title1, norm_title2).ratio()
+        if seq_ratio < SEQ_MATCHER_THRESHOLD:
+            return False  # 두 조건을 모두 넘어야 중복이므로 TF-IDF 계산은 생략
 
         try:
+            # scikit-learn 은 무거워서 문자열 유사도를 넘긴 후보가 나왔을 때만 로딩
+            from sklearn.metrics.pairwise import cosine_similarity
+            from sklearn.feature_extraction.text import TfidfVectorizer
             vectorizer = TfidfVectorizer()
             tfidf_matrix = vectorizer.fit_transform([norm_title1, norm_title2])
             cosine_sim = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
@@ -897,6 +910,7 @@ if __name__ == "__main__":
             print(f"💾 로컬 저장 완료: {CSV_PATH} (총 {len(final_data_to_save)}건)")
 
             # 4) 그 다음 Azure Blob에도 업로드(가능할 때)
+            blob_service_client = get_blob_service_client()
             if not blob_service_client:
                 print("⚠️ Azure 클라이언트가 없어 Blob 업로드는 건너뜁니다.")
             else:
@@ -1,17 +1,40 @@
-from typing import Optional
+from contextlib import nullcontext
+from typing import Callable, List, Optional
 import pandas as pd
 from scripts.utils.db_utils import insert_and_return_id, insert_data
 from scripts.utils.parsing_utils import parse_image_paths, parse_department
 from scripts.utils.key_utils import normalize_url, sha256_hex
 from scripts.utils.log_utils import init_runtime_logger, capture_unhandled_exception
-from scripts.utils.db_utils import get_connection
+from scripts.utils.db_utils import maybe_open, unit_of_work
 from scripts.db_tasks.notice_repo import(
     upsert_notice_keys, apply_llm_result,
-    add_departments, add_attachments, upsert_ocr_text
+    add_departments, add_attachments, upsert_ocr_text,
+    bulk_upsert_notices
 )
+from scripts.db_tasks.thumbnail_repo import build_thumbnails, first_thumbnails
 
 logger = init_runtime_logger()
 
+# insert_notice_all 이 끝난 뒤 호출될 콜백 (notice_id, parsed)
+# 같은 프로세스의 메모리 색인(serving/search_index.py 등)을 바로 갱신하는 용도
+_INSERT_LISTENERS: List[Callable[[int, dict], None]] = []
+
+def add_insert_listener(fn: Callable[[int, dict], None]) -> None:
+    if fn not in _INSERT_LISTENERS:
+        _INSERT_LISTENERS.append(fn)
+
+def remove_insert_listener(fn: Callable[[int, dict], None]) -> None:
+    if fn in _INSERT_LISTENERS:
+        _INSERT_LISTENERS.remove(fn)
+
+def _notify_inserted(notice_id: int, parsed: dict) -> None:
+    # 리스너 실패가 적재를 실패시키지 않도록
+    for fn in list(_INSERT_LISTENERS):
+        try:
+            fn(notice_id, parsed)
+        except Exception:
+            logger.exception("[INSERT] listener failed - notice_id=%s", notice_id)
+
 def clean_row(row):
     raw_deadline = row.get("deadline", "")
     deadline = None if pd.isna(raw_deadline) or str(raw_deadline).strip() == "" else str(raw_deadline)
@@ -40,9 +63,7 @@ def clean_row(row):
     }
 
 def insert_notice(parsed: dict, conn: Optional = None) -> int:
-    own = False
-    if conn is None:
-        conn = get_connection(); own = True
+    conn, own = maybe_open(conn)
     try:
         title = str(parsed.get("title", "") or "")
         url   = str(parsed.get("url", "") or "")
@@ -58,9 +79,7 @@ def insert_notice(parsed: dict, conn: Optional = None) -> int:
         if own: conn.close()
 
 def insert_notice_department(notice_id: int, departments, conn: Optional = None):
-    own = False
-    if conn is None:
-        conn = get_connection(); own = True
+    conn, own = maybe_open(conn)
     try:
         if not isinstance(departments, list):
             departments = list(departments)
@@ -69,36 +88,46 @@ def insert_notice_department(notice_id: int, departments, conn: Optional = None)
         if own: conn.close()
 
 def insert_notice_attachment(notice_id: int, image_paths, conn: Optional = None):
-    own = False
-    if conn is None:
-        conn = get_connection(); own = True
+    conn, own = maybe_open(conn)
     try:
         urls = parse_image_paths(image_paths)
         add_attachments(conn, notice_id, urls)
     finally:
         if own: conn.close()
 
+def insert_notice_thumbnail(notice_id: int, conn: Optional = None) -> Optional[str]:
+    # 첫 첨부(카드 이미지)의 썸네일 — 실패해도 적재는 계속 (카드는 원본으로 폴백, 백필 --retry-failed 로 다시)
+    conn, own = maybe_open(conn)
+    try:
+        ids, _failed = build_thumbnails(conn, notice_ids=[notice_id])
+        return first_thumbnails(conn, ids).get(notice_id) if ids else None
+    except Exception as e:
+        capture_unhandled_exception(index=None, phase="DB", url=None, exc=e,
+                                    extra={"step": "thumbnail", "notice_id": notice_id})
+        return None
+    finally:
+        if own: conn.close()
+
 def insert_notice_ocr_text(notice_id: int, ocr_text: str, conn: Optional = None):
     text = (ocr_text or "").strip()
     if not text:
         return
-    own = False
-    if conn is None:
-        conn = get_connection(); own = True
+    conn, own = maybe_open(conn)
     try:
         upsert_ocr_text(conn, notice_id, text)
     finally:
         if own: conn.close()
 
 def insert_notice_all(parsed: dict, conn: Optional = None) -> int:
+    """
+    공지 하나(본문/학과/첨부/OCR)를 한 작업 단위로 적재 — 커넥션 하나, 커밋 한 번.
+    conn 을 넘기면 그 연결(또는 작업 단위)에서 실행하고 커밋 시점은 넘긴 쪽이 정함.
+    첨부 썸네일은 다운로드/업로드가 있어 커밋 뒤에 따로 (실패해도 적재는 유지).
+    """
     parsed = clean_row(parsed)
 
-    own = False
-    if conn is None:
-        conn = get_connection()
-        own = True
-    try:
-        notice_id = insert_notice(parsed, conn=conn)
+    with (unit_of_work() if conn is None else nullcontext(conn)) as c:
+        notice_id = insert_notice(parsed, conn=c)
 
         depts = parsed.get("department", [])
         if not isinstance(depts, list):
@@ -109,23 +138,64 @@ def insert_notice_all(parsed: dict, conn: Optional = None) -> int:
                                             exc=e, extra={"field": "department"})
                 depts = []
         if depts:
-            insert_notice_department(notice_id, depts, conn=conn)
+            insert_notice_department(notice_id, depts, conn=c)
 
         img_paths = parsed.get("image_paths", "")
         if img_paths:
-            insert_notice_attachment(notice_id, img_paths, conn=conn)
+            insert_notice_attachment(notice_id, img_paths, conn=c)
 
         ocr_text = (parsed.get("ocr_text") or "").strip()
         if ocr_text:
-            insert_notice_ocr_text(notice_id, ocr_text, conn=conn)
+            insert_notice_ocr_text(notice_id, ocr_text, conn=c)
 
-        return notice_id
-    finally:
-        if own:
-            try:
-                conn.close()
-            except Exception:
-                capture_unhandled_exception(
-                    index=None, phase="DB", url=parsed.get("url"),
-                    exc=RuntimeError("connection close failed"), extra={}
-                )
\ No newline at end of file
+    thumbnail_url = insert_notice_thumbnail(notice_id, conn=conn) if img_paths else None
+
+    if _INSERT_LISTENERS:
+        _notify_inserted(notice_id, {**parsed, "department": depts, "thumbnail_url": thumbnail_url})
+    return notice_id
+
+def insert_notices_bulk(parsed_list: List[dict], conn: Optional = None) -> List[int]:
+    """
+    insert_notice_all 의 배치판. 공지 N건을 notice_repo.bulk_upsert_notices 로 한 트랜잭션에 적재
+    (공지마다 5~6번 왕복/커밋하던 것을 배치당 몇 번으로). 반환: 입력 순서대로 notice_id
+    clean_row/학과 파싱 실패는 insert_notice_all 과 같이 예외 → 호출 쪽에서 한 건씩 다시 시도
+    """
+    rows = [clean_row(p) for p in parsed_list]
+    items = []
+    for parsed in rows:
+        depts = parsed.get("department", [])
+        if not isinstance(depts, list):
+            depts = parse_department(depts)
+            parsed["department"] = depts
+        url = str(parsed.get("url", "") or "")
+        img_paths = parsed.get("image_paths", "")
+        items.append({
+            "url_hash": sha256_hex(normalize_url(url)),
+            "title": str(parsed.get("title", "") or ""),
+            "url": url,
+            "topic": parsed.get("topic") or None,
+            "oneline": parsed.get("oneline") or None,
+            "deadline": parsed.get("deadline") or None,
+            "departments": depts,
+            "attachments": parse_image_paths(img_paths) if img_paths else [],
+            "ocr_text": parsed.get("ocr_text") or "",
+        })
+
+    with (unit_of_work() if conn is None else nullcontext(conn)) as c:
+        ids = [nid for nid, _created in bulk_upsert_notices(c, items)]
+
+    # 썸네일은 커밋 뒤 (insert_notice_all 과 같음)
+    thumbnails = {}
+    with_images = [nid for nid, item in zip(ids, items) if item["attachments"]]
+    if with_images:
+        try:
+            build_thumbnails(conn, notice_ids=with_images)
+            thumbnails = first_thumbnails(conn, with_images)
+        except Exception as e:
+            capture_unhandled_exception(index=None, phase="DB", url=None, exc=e,
+                                        extra={"step": "thumbnail", "notices": len(with_images)})
+
+    if _INSERT_LISTENERS:
+        for nid, parsed in zip(ids, rows):
+            _notify_inserted(nid, {**parsed, "thumbnail_url": thumbnails.get(nid)})
+    return ids
@@ -1,16 +1,17 @@
 from __future__ import annotations
-from typing import Optional, Iterable, Tuple
-import pyodbc
+import json
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, Optional, Iterable, List, Tuple
 
-from scripts.utils.db_utils import get_connection
+from scripts.utils.db_utils import maybe_open
+from scripts.utils.key_utils import sha256_hex
+from scripts.utils.sql_dialect import SQLITE, dialect_of
 from scripts.utils.log_utils import init_runtime_logger
 
-logger = init_runtime_logger()
+if TYPE_CHECKING:
+    import pyodbc
 
-def _maybe_open(conn: Optional[pyodbc.Connection]):
-    if conn is not None:
-        return conn, False
-    return get_connection(), True
+logger = init_runtime_logger()
 
 def insert_menu_rows(
     conn: Optional[pyodbc.Connection],
@@ -19,7 +20,7 @@ def insert_menu_rows(
     """
     중복 허용일 때 빠르게 꽂기.
     """
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
         cur.fast_executemany = True
@@ -35,3 +36,109 @@ def insert_menu_rows(
         return len(rows)
     finally:
         if close_after: c.close()
+
+MenuRow = Tuple[str, str, str, date, str]  # (restaurant, menu_group, meal_type, service_date, menu)
+
+def _as_date(v) -> date:
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    return date.fromisoformat(str(v).strip()[:10])
+
+def normalize_menu_rows(rows: Iterable[tuple]) -> List[MenuRow]:
+    """
+    공백 정리 + 날짜 변환 + (식당, 식단, 끼니, 날짜) 중복 제거 (마지막 행이 이김 — 서빙 쪽과 같은 규칙).
+    키 순서로 정렬해 돌려주므로 같은 내용이면 같은 해시가 나옴
+    """
+    latest: Dict[Tuple[str, str, str, date], str] = {}
+    for restaurant, menu_group, meal_type, service_date, menu in rows:
+        key = (str(restaurant or "").strip(), str(menu_group or "").strip(),
+               str(meal_type or "").strip(), _as_date(service_date))
+        latest[key] = str(menu or "").strip()
+    return [(*key, menu) for key, menu in sorted(latest.items(), key=lambda kv: (kv[0][3], kv[0][:3]))]
+
+def menu_content_hash(rows: List[MenuRow]) -> str:
+    return sha256_hex(json.dumps([[r, g, m, d.isoformat(), menu] for r, g, m, d, menu in rows],
+                                 ensure_ascii=False, separators=(",", ":")))
+
+def replace_menu_range(conn: Optional[pyodbc.Connection], rows: Iterable[tuple], force: bool = False) -> int:
+    """
+    수집한 날짜 범위(가장 이른 ~ 가장 늦은 service_date)의 식단을 통째로 교체 (migrations/0004).
+    - 범위의 내용 해시가 지난 적재와 같으면 아무것도 쓰지 않고 0 (force 로 무시)
+    - 아니면 한 트랜잭션에서: 임시 테이블에 fast_executemany → 범위 삭제 → 삽입 → 해시 기록
+      (읽는 쪽은 교체 전이나 후만 봄 — 반쯤 지워진 주를 보지 않음)
+    반환: 새로 쓴 행 수
+    """
+    menu_rows = normalize_menu_rows(rows)
+    if not menu_rows:
+        return 0
+    start, end = menu_rows[0][3], menu_rows[-1][3]
+    content_hash = menu_content_hash(menu_rows)
+
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        if not force:
+            cur.execute("""
+                SELECT content_hash FROM dbo.cafeteria_menu_load
+                WHERE range_start = ? AND range_end = ?;
+            """, (start, end))
+            row = cur.fetchone()
+            if row is not None and row[0] == content_hash:
+                logger.info("[MENU_REPO] unchanged - range=%s~%s rows=%d (skip)", start, end, len(menu_rows))
+                return 0
+
+        if dialect_of(c) == SQLITE:
+            _swap_range_sqlite(cur, menu_rows, start, end, content_hash)
+        else:
+            _swap_range_mssql(cur, menu_rows, start, end, content_hash)
+        c.commit()
+        logger.info("[MENU_REPO] replaced - range=%s~%s rows=%d", start, end, len(menu_rows))
+        return len(menu_rows)
+    except Exception:
+        c.rollback()
+        raise
+    finally:
+        if close_after: c.close()
+
+def _swap_range_mssql(cur, menu_rows: List[MenuRow], start: date, end: date, content_hash: str) -> None:
+    # 임시 테이블에 fast_executemany 로 올린 뒤 한 배치로 교체
+    cur.execute("""
+        CREATE TABLE #menu_stage (
+            restaurant NVARCHAR(200) NOT NULL, menu_group NVARCHAR(200) NOT NULL,
+            meal_type NVARCHAR(100) NOT NULL, service_date DATE NOT NULL, menu NVARCHAR(4000) NOT NULL
+        );
+    """)
+    cur.fast_executemany = True
+    cur.executemany("INSERT INTO #menu_stage VALUES (?, ?, ?, ?, ?);", menu_rows)
+    cur.fast_executemany = False
+    cur.execute("""
+        SET NOCOUNT ON;
+        DELETE FROM dbo.cafeteria_menu WHERE service_date BETWEEN ? AND ?;
+        INSERT INTO dbo.cafeteria_menu (restaurant, menu_group, meal_type, service_date, menu)
+        SELECT restaurant, menu_group, meal_type, service_date, menu FROM #menu_stage;
+        MERGE dbo.cafeteria_menu_load AS t
+        USING (SELECT ? AS range_start, ? AS range_end) AS s
+        ON t.range_start = s.range_start AND t.range_end = s.range_end
+        WHEN NOT MATCHED THEN
+          INSERT (range_start, range_end, content_hash, row_count, loaded_at)
+          VALUES (s.range_start, s.range_end, ?, ?, SYSUTCDATETIME())
+        WHEN MATCHED THEN
+          UPDATE SET content_hash = ?, row_count = ?, loaded_at = SYSUTCDATETIME();
+        DROP TABLE #menu_stage;
+    """, (start, end, start, end, content_hash, len(menu_rows), content_hash, len(menu_rows)))
+
+def _swap_range_sqlite(cur, menu_rows: List[MenuRow], start: date, end: date, content_hash: str) -> None:
+    # 로컬 벤치마크용 (utils/sqlite_backend) — 프로세스 안이라 임시 테이블 없이 바로
+    cur.execute("DELETE FROM dbo.cafeteria_menu WHERE service_date BETWEEN ? AND ?;", (start, end))
+    cur.executemany("""
+        INSERT INTO dbo.cafeteria_menu (restaurant, menu_group, meal_type, service_date, menu)
+        VALUES (?, ?, ?, ?, ?);
+    """, menu_rows)
+    cur.execute("""
+        INSERT INTO dbo.cafeteria_menu_load (range_start, range_end, content_hash, row_count, loaded_at)
+        VALUES (?, ?, ?, ?, SYSUTCDATETIME())
+        ON CONFLICT (range_start, range_end) DO UPDATE SET
+          content_hash = excluded.content_hash, row_count = excluded.row_count, loaded_at = excluded.loaded_at;
+    """, (start, end, content_hash, len(menu_rows)))
@@ -0,0 +1,164 @@
+# scripts/db_tasks/migrate.py
+# migrations/NNNN_*.sql 을 번호 순서로 적용하고 dbo.schema_migrations 에 기록 (버전 관리된 스키마).
+# 파일 하나 = 트랜잭션 하나: GO 로 나눈 배치를 차례로 실행하고 기록까지 한 번에 커밋, 실패하면 전부 롤백.
+# 모든 파일이 여러 번 실행해도 안전하게 작성돼 있으므로, 예전에 sqlcmd 로 손으로 적용한 DB 에서
+# 처음 돌려도 이미 있는 것은 건너뛰고 기록만 남음.
+#
+#   python -m scripts.db_tasks.migrate                 # 남은 migration 적용
+#   python -m scripts.db_tasks.migrate --status        # 적용 상태만
+#   python -m scripts.db_tasks.migrate --check-plans   # 적용 후 서빙 쿼리 실행 계획 검사 (plan_check)
+from __future__ import annotations
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+import pyodbc
+
+from scripts.utils.db_utils import get_connection
+from scripts.utils.key_utils import sha256_hex
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+LOCK_TIMEOUT_MS = 60_000  # 다른 배포가 적용 중이면 기다리는 시간
+
+_FILE = re.compile(r"^(\d{4})_([\w-]+)\.sql$")
+_GO = re.compile(r"^\s*GO\s*;?\s*$", re.IGNORECASE | re.MULTILINE)
+
+_TRACKING_SQL = """
+IF OBJECT_ID('dbo.schema_migrations', 'U') IS NULL
+    CREATE TABLE dbo.schema_migrations (
+        version     INT            NOT NULL CONSTRAINT PK_schema_migrations PRIMARY KEY,
+        name        NVARCHAR(200)  NOT NULL,
+        checksum    CHAR(64)       NOT NULL,   -- 적용 당시 파일 내용의 sha256
+        applied_at  DATETIME2      NOT NULL CONSTRAINT DF_schema_migrations_applied_at DEFAULT SYSUTCDATETIME()
+    );
+"""
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return sha256_hex(self.sql)
+
+    def batches(self) -> List[str]:
+        # sqlcmd 처럼 GO 줄로 배치를 나눔 (빈 배치/주석뿐인 배치도 서버에는 무해)
+        return [b.strip() for b in _GO.split(self.sql) if b.strip()]
+
+# 1) migrations 폴더의 파일 목록 (번호 순). 번호가 겹치면 어느 것이 먼저인지 모호하므로 에러
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    found: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        m = _FILE.match(path.name)
+        if not m:
+            logger.warning("[MIGRATE] skip - unexpected file name: %s", path.name)
+            continue
+        version = int(m.group(1))
+        if version in found:
+            raise ValueError(f"duplicate migration version {version:04d}: {found[version].path.name}, {path.name}")
+        found[version] = Migration(version, m.group(2), path, path.read_text(encoding="utf-8"))
+    return [found[v] for v in sorted(found)]
+
+# 2) 기록 테이블 + 적용된 버전 → checksum
+def applied_versions(conn: pyodbc.Connection) -> Dict[int, str]:
+    cur = conn.cursor()
+    try:
+        cur.execute(_TRACKING_SQL)
+        conn.commit()
+        cur.execute("SELECT version, checksum FROM dbo.schema_migrations;")
+        return {int(v): str(c).strip() for v, c in cur.fetchall()}
+    finally:
+        cur.close()
+
+# 3) 파일 하나 적용 — 배치 전부 + 기록을 한 트랜잭션으로
+def apply_migration(conn: pyodbc.Connection, migration: Migration) -> None:
+    cur = conn.cursor()
+    try:
+        for i, batch in enumerate(migration.batches(), 1):
+            logger.debug("[MIGRATE] %04d batch %d", migration.version, i)
+            cur.execute(batch)
+            while cur.nextset():  # 배치 안의 여러 문장 결과를 끝까지 소비해야 뒤 문장의 에러가 올라옴
+                pass
+        cur.execute("""
+            INSERT INTO dbo.schema_migrations (version, name, checksum)
+            VALUES (?, ?, ?);
+        """, (migration.version, migration.name, migration.checksum))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+def _lock(conn: pyodbc.Connection) -> None:
+    # 두 배포가 동시에 돌아도 한쪽만 적용 (세션 단위 applock, 연결을 닫으면 풀림)
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            DECLARE @rc INT;
+            EXEC @rc = sp_getapplock @Resource = 'schema_migrations', @LockMode = 'Exclusive',
+                                     @LockOwner = 'Session', @LockTimeout = ?;
+            SELECT @rc;
+        """, (LOCK_TIMEOUT_MS,))
+        rc = cur.fetchone()[0]
+    finally:
+        cur.close()
+    if rc < 0:
+        raise RuntimeError(f"could not acquire migration lock (sp_getapplock={rc})")
+
+# 4) 남은 migration 적용. 반환: 이번에 적용한 버전 목록
+def migrate(conn: pyodbc.Connection, target: Optional[int] = None,
+            migrations: Optional[List[Migration]] = None) -> List[int]:
+    migrations = discover() if migrations is None else migrations
+    _lock(conn)
+    applied = applied_versions(conn)
+    for m in migrations:
+        if m.version in applied and applied[m.version] != m.checksum:
+            # 적용 후 파일이 바뀜 — 다시 돌리지는 않음 (바꿀 내용은 새 번호로)
+            logger.warning("[MIGRATE] checksum mismatch - %04d_%s was edited after it was applied", m.version, m.name)
+    done = []
+    for m in migrations:
+        if m.version in applied or (target is not None and m.version > target):
+            continue
+        logger.info("[MIGRATE] applying %04d_%s", m.version, m.name)
+        apply_migration(conn, m)
+        done.append(m.version)
+    logger.info("[MIGRATE] done - applied=%d total=%d", len(done), len(applied) + len(done))
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 migration 적용 (db_tasks/migrations)")
+    parser.add_argument("--status", action="store_true", help="적용 상태만 출력")
+    parser.add_argument("--target", type=int, default=None, help="이 번호까지만 적용")
+    parser.add_argument("--check-plans", action="store_true", help="적용 후 서빙 쿼리 실행 계획에서 scan 검사")
+    args = parser.parse_args()
+
+    migrations = discover()
+    conn = get_connection()
+    try:
+        if args.status:
+            applied = applied_versions(conn)
+            for m in migrations:
+                state = "pending"
+                if m.version in applied:
+                    state = "applied" if applied[m.version] == m.checksum else "applied (edited since)"
+                print(f"{m.version:04d}_{m.name:<32} {state}")
+            return
+        migrate(conn, target=args.target, migrations=migrations)
+        if args.check_plans:
+            from scripts.db_tasks.plan_check import check_serving_plans, print_report
+            findings = check_serving_plans(conn)
+            print_report(findings)
+            if any(scans for _name, scans in findings):
+                sys.exit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
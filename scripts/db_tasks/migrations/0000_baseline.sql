@@ -0,0 +1,54 @@
+-- 0000: 기준 스키마 — 그동안 SQL 문자열로만 가정하던 테이블을 버전 관리 아래로
+-- 이미 있는 운영 DB 에서는 아무것도 하지 않음 (없을 때만 생성). 정규화 컬럼/썸네일 열 등은 0001~ 이 추가.
+-- 열 모양은 repo 코드가 쓰는 그대로 (notice_repo / insertion / menu_repo / serving).
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분, db_tasks/migrate.py 가 차례로 적용)
+
+IF OBJECT_ID('dbo.notice', 'U') IS NULL
+    CREATE TABLE dbo.notice (
+        id          INT IDENTITY(1,1) NOT NULL CONSTRAINT PK_notice PRIMARY KEY,
+        title       NVARCHAR(500)  NULL,
+        url         NVARCHAR(1000) NULL,
+        url_hash    VARCHAR(64)    NOT NULL,   -- sha256(normalize_url(url)), MERGE 키 (유일 인덱스는 0005)
+        topic       NVARCHAR(50)   NULL,
+        oneline     NVARCHAR(MAX)  NULL,
+        deadline    DATE           NULL,
+        llm_status  TINYINT        NOT NULL CONSTRAINT DF_notice_llm_status DEFAULT 0,  -- 0 대기, 1 완료, 2 실패, 3 재시도
+        created_at  DATETIME2      NOT NULL CONSTRAINT DF_notice_created_at DEFAULT SYSUTCDATETIME()
+    );
+GO
+
+IF OBJECT_ID('dbo.notice_department', 'U') IS NULL
+    CREATE TABLE dbo.notice_department (
+        id          INT IDENTITY(1,1) NOT NULL CONSTRAINT PK_notice_department PRIMARY KEY,
+        notice_id   INT            NOT NULL CONSTRAINT FK_notice_department_notice REFERENCES dbo.notice (id),
+        department  NVARCHAR(100)  NOT NULL
+    );
+GO
+
+IF OBJECT_ID('dbo.notice_attachment', 'U') IS NULL
+    CREATE TABLE dbo.notice_attachment (
+        id          INT IDENTITY(1,1) NOT NULL CONSTRAINT PK_notice_attachment PRIMARY KEY,
+        notice_id   INT            NOT NULL CONSTRAINT FK_notice_attachment_notice REFERENCES dbo.notice (id),
+        file_url    NVARCHAR(1000) NOT NULL,
+        file_order  INT            NOT NULL
+    );
+GO
+
+IF OBJECT_ID('dbo.notice_ocr_text', 'U') IS NULL
+    CREATE TABLE dbo.notice_ocr_text (
+        notice_id   INT            NOT NULL CONSTRAINT PK_notice_ocr_text PRIMARY KEY
+                                            CONSTRAINT FK_notice_ocr_text_notice REFERENCES dbo.notice (id),
+        ocr_text    NVARCHAR(MAX)  NOT NULL
+    );
+GO
+
+IF OBJECT_ID('dbo.cafeteria_menu', 'U') IS NULL
+    CREATE TABLE dbo.cafeteria_menu (
+        id            INT IDENTITY(1,1) NOT NULL CONSTRAINT PK_cafeteria_menu PRIMARY KEY,
+        restaurant    NVARCHAR(200)  NOT NULL,
+        menu_group    NVARCHAR(200)  NOT NULL,
+        meal_type     NVARCHAR(100)  NOT NULL,
+        service_date  DATE           NOT NULL,
+        menu          NVARCHAR(4000) NOT NULL
+    );
+GO
@@ -0,0 +1,37 @@
+-- 0001: 검색용 정규화 컬럼 + 인덱스
+-- topic_norm / department_norm = REPLACE(LOWER(x), ' ', '')
+-- 쓰기 시점(notice_repo.apply_llm_result / add_departments)에 채우고,
+-- /message 쿼리는 이 컬럼에 접두(LIKE 'x%') 탐색만 함.
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분)
+
+IF COL_LENGTH('dbo.notice', 'topic_norm') IS NULL
+    ALTER TABLE dbo.notice ADD topic_norm NVARCHAR(100) NULL;
+GO
+
+IF COL_LENGTH('dbo.notice_department', 'department_norm') IS NULL
+    ALTER TABLE dbo.notice_department ADD department_norm NVARCHAR(200) NULL;
+GO
+
+-- 기존 데이터 백필
+UPDATE dbo.notice
+SET topic_norm = REPLACE(LOWER(topic), ' ', '')
+WHERE topic IS NOT NULL AND topic_norm IS NULL;
+GO
+
+UPDATE dbo.notice_department
+SET department_norm = REPLACE(LOWER(department), ' ', '')
+WHERE department IS NOT NULL AND department_norm IS NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_department_norm' AND object_id = OBJECT_ID('dbo.notice_department'))
+    CREATE INDEX IX_notice_department_norm
+        ON dbo.notice_department (department_norm, notice_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_topic_norm' AND object_id = OBJECT_ID('dbo.notice'))
+    CREATE INDEX IX_notice_topic_norm
+        ON dbo.notice (topic_norm, deadline)
+        INCLUDE (created_at);
+GO
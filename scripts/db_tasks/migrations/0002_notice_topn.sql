@@ -0,0 +1,38 @@
+-- 0002: (topic_norm, department_norm, 정렬) 조합별 상위 N건을 미리 만들어 둔 서빙 테이블
+-- 수집 후 db_tasks/topn_repo.rebuild_topn 이 채움: KST 날짜가 바뀐 뒤 첫 실행은 전체를 다시 채우고,
+-- 그 밖에는 새로 들어온 공지가 걸친 조합만 (빠진 공지의 행은 다음 전체 재적재 때 정리 — topn_repo 머리말).
+-- /message 는 PK 범위 조회 한 번으로 카드 행을 읽음 (serving/notice_query.fetch_topn_rows).
+-- 마지막 전체 재적재(notice_topn_state.built_for)가 TOPN_MAX_AGE_DAYS 보다 오래되면 이 표 대신 기존 쿼리.
+-- 카드에 필요한 열(제목/마감/요약/첫 첨부/학과 목록)을 같이 저장해 조인하지 않음.
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분)
+
+IF OBJECT_ID('dbo.notice_topn', 'U') IS NULL
+    CREATE TABLE dbo.notice_topn (
+        topic_norm       NVARCHAR(100)  NOT NULL,
+        department_norm  NVARCHAR(200)  NOT NULL,
+        sort_family      VARCHAR(16)    NOT NULL,   -- deadline / created_desc / created_asc
+        rank_no          SMALLINT       NOT NULL,   -- 1부터
+        notice_id        INT            NOT NULL,
+        title            NVARCHAR(MAX)  NULL,
+        deadline         DATE           NULL,
+        oneline          NVARCHAR(MAX)  NULL,
+        topic            NVARCHAR(100)  NULL,
+        created_at       DATETIME2      NULL,
+        url              NVARCHAR(MAX)  NULL,
+        file_url         NVARCHAR(MAX)  NULL,
+        departments      NVARCHAR(MAX)  NULL,
+        pair_total       INT            NOT NULL,   -- 다시 채운 시점의 조합 전체 활성 공지 수 (> N 이면 잘린 목록)
+        CONSTRAINT PK_notice_topn PRIMARY KEY (topic_norm, department_norm, sort_family, rank_no)
+    );
+GO
+
+-- 한 행짜리 상태 테이블: 행이 없으면 아직 한 번도 채우지 않은 것 (웹훅은 기존 쿼리로 폴백)
+IF OBJECT_ID('dbo.notice_topn_state', 'U') IS NULL
+    CREATE TABLE dbo.notice_topn_state (
+        id           TINYINT    NOT NULL CONSTRAINT PK_notice_topn_state PRIMARY KEY
+                                         CONSTRAINT CK_notice_topn_state_single CHECK (id = 1),
+        built_for    DATE       NOT NULL,   -- 마지막 전체 재적재 날짜 (조합 단위 갱신은 안 바꿈)
+        size         INT        NOT NULL,
+        rebuilt_at   DATETIME2  NOT NULL
+    );
+GO
@@ -0,0 +1,26 @@
+-- 0003: 첨부 이미지 썸네일 (카드 thumbnail.imageUrl 용)
+-- 원본 포스터(수 MB)는 그대로 두고, 카카오 카드 크기로 줄인 JPEG/WebP 를 원본 옆(같은 컨테이너)에 올린 뒤
+-- 그 URL 을 thumbnail_url 에 기록 (db_tasks/thumbnail_repo.build_thumbnails).
+-- thumbnail_status: 0 = 아직, 1 = 완료, 2 = 실패(이미지가 아님/다운로드 실패 — 원본으로 폴백)
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분)
+
+IF COL_LENGTH('dbo.notice_attachment', 'thumbnail_url') IS NULL
+    ALTER TABLE dbo.notice_attachment ADD thumbnail_url NVARCHAR(MAX) NULL;
+GO
+
+IF COL_LENGTH('dbo.notice_attachment', 'thumbnail_status') IS NULL
+    ALTER TABLE dbo.notice_attachment ADD thumbnail_status TINYINT NOT NULL
+        CONSTRAINT DF_notice_attachment_thumbnail_status DEFAULT 0;
+GO
+
+-- 백필이 아직 안 된 첨부를 notice_id 순으로 훑음
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_attachment_thumbnail_status' AND object_id = OBJECT_ID('dbo.notice_attachment'))
+    CREATE INDEX IX_notice_attachment_thumbnail_status
+        ON dbo.notice_attachment (thumbnail_status, notice_id, file_order);
+GO
+
+-- 상위 N건 서빙 테이블(0002)에도 카드용 썸네일 열
+IF OBJECT_ID('dbo.notice_topn', 'U') IS NOT NULL AND COL_LENGTH('dbo.notice_topn', 'thumbnail_url') IS NULL
+    ALTER TABLE dbo.notice_topn ADD thumbnail_url NVARCHAR(MAX) NULL;
+GO
@@ -0,0 +1,33 @@
+-- 0004: 식단 적재를 다시 돌려도 같은 주가 두 번 들어가지 않도록
+-- db_tasks/menu_repo.replace_menu_range 가 수집한 날짜 범위의 행을 한 트랜잭션에서 통째로 교체하고,
+-- 범위별 내용 해시를 여기에 남겨 바뀐 게 없으면 쓰기 자체를 건너뜀.
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분)
+
+IF OBJECT_ID('dbo.cafeteria_menu_load', 'U') IS NULL
+    CREATE TABLE dbo.cafeteria_menu_load (
+        range_start   DATE       NOT NULL,
+        range_end     DATE       NOT NULL,
+        content_hash  CHAR(64)   NOT NULL,   -- 정규화한 행 목록의 sha256
+        row_count     INT        NOT NULL,
+        loaded_at     DATETIME2  NOT NULL,
+        CONSTRAINT PK_cafeteria_menu_load PRIMARY KEY (range_start, range_end)
+    );
+GO
+
+-- 그동안 중복 허용으로 쌓인 행 정리: (식당, 식단, 끼니, 날짜) 마다 가장 나중에 넣은 행만
+-- (서빙 쪽 serving/menu_index.py 도 마지막 행이 이김)
+WITH d AS (
+    SELECT ROW_NUMBER() OVER (
+               PARTITION BY restaurant, menu_group, meal_type, service_date
+               ORDER BY id DESC) AS rn
+    FROM dbo.cafeteria_menu
+)
+DELETE FROM d WHERE rn > 1;
+GO
+
+-- 서빙(serving/menu_index.py)의 주 단위 범위 조회와 교체 시 범위 삭제
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_cafeteria_menu_service_date' AND object_id = OBJECT_ID('dbo.cafeteria_menu'))
+    CREATE INDEX IX_cafeteria_menu_service_date
+        ON dbo.cafeteria_menu (service_date);
+GO
@@ -0,0 +1,43 @@
+-- 0005: 쓰기 키 유일성 + 서빙 쿼리의 OUTER APPLY 를 seek 로 만드는 커버링 인덱스
+-- - notice.url_hash: notice_repo.upsert_notice_keys / bulk_upsert_notices 의 MERGE 가 기대는 키.
+--   유일 인덱스가 없으면 동시 수집 때 같은 공지가 두 행이 되고, MERGE 가 매번 테이블을 훑음
+-- - notice_attachment(notice_id, file_order): 첫 첨부 OUTER APPLY TOP 1 ... ORDER BY file_order 를 정렬 없이 한 행 seek
+-- - notice_department(notice_id): 학과 목록 STRING_AGG OUTER APPLY 를 seek 로
+-- - notice(llm_status, deadline): 인덱스 적재(notice_index / search_index / topn_repo)의 활성 공지 범위
+-- 적용 후 `python -m scripts.db_tasks.plan_check` 로 서빙 쿼리에 scan 이 없는지 확인.
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분)
+
+-- 중복 url_hash 가 남아 있으면 유일 인덱스를 만들 수 없음 — 어떤 행을 남길지는 사람이 정하도록 멈춤
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'UX_notice_url_hash' AND object_id = OBJECT_ID('dbo.notice'))
+   AND EXISTS (SELECT url_hash FROM dbo.notice GROUP BY url_hash HAVING COUNT(*) > 1)
+    THROW 50005, N'dbo.notice 에 중복 url_hash 가 있어 UX_notice_url_hash 를 만들 수 없음 (정리 후 다시 실행)', 1;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'UX_notice_url_hash' AND object_id = OBJECT_ID('dbo.notice'))
+    CREATE UNIQUE INDEX UX_notice_url_hash
+        ON dbo.notice (url_hash);
+GO
+
+-- 첫 첨부 (카드 이미지) — 같은 이름으로 벤치(bench/notice_query_bench.py)도 만듦
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_attachment_notice' AND object_id = OBJECT_ID('dbo.notice_attachment'))
+    CREATE INDEX IX_notice_attachment_notice
+        ON dbo.notice_attachment (notice_id, file_order)
+        INCLUDE (file_url, thumbnail_url);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_department_notice' AND object_id = OBJECT_ID('dbo.notice_department'))
+    CREATE INDEX IX_notice_department_notice
+        ON dbo.notice_department (notice_id)
+        INCLUDE (department, department_norm);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_llm_status_deadline' AND object_id = OBJECT_ID('dbo.notice'))
+    CREATE INDEX IX_notice_llm_status_deadline
+        ON dbo.notice (llm_status, deadline)
+        INCLUDE (topic_norm, created_at);
+GO
@@ -0,0 +1,50 @@
+-- 0006: 공지 변경 표시 (ROWVERSION) — 메모리 인덱스의 증분 갱신 기준
+-- serving/notice_index.py, serving/search_index.py 는 id 워터마크 대신 마지막으로 읽은
+-- MIN_ACTIVE_ROWVERSION() 이후 바뀐 공지만 다시 읽음 (serving/notice_changes.py).
+-- 예전 공지의 llm_status 0/2 → 1 재처리, 마감일/주제 수정, 학과/첨부/썸네일/OCR 변경이
+-- 30분 전체 재적재를 기다리지 않고 다음 갱신에 반영됨. 쓰는 쪽 코드는 바꿀 것이 없음 (서버가 올림).
+-- 공지가 없어지거나 비활성이 된 경우는 활성 id 목록과 비교해 뺌.
+-- 여러 번 실행해도 안전하도록 작성 (sqlcmd 기준 GO 로 배치 구분)
+
+IF COL_LENGTH('dbo.notice', 'row_version') IS NULL
+    ALTER TABLE dbo.notice ADD row_version ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.notice_department', 'row_version') IS NULL
+    ALTER TABLE dbo.notice_department ADD row_version ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.notice_attachment', 'row_version') IS NULL
+    ALTER TABLE dbo.notice_attachment ADD row_version ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.notice_ocr_text', 'row_version') IS NULL
+    ALTER TABLE dbo.notice_ocr_text ADD row_version ROWVERSION;
+GO
+
+-- 변경 id 조회(row_version >= ?)를 seek 로
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_row_version' AND object_id = OBJECT_ID('dbo.notice'))
+    CREATE INDEX IX_notice_row_version
+        ON dbo.notice (row_version);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_department_row_version' AND object_id = OBJECT_ID('dbo.notice_department'))
+    CREATE INDEX IX_notice_department_row_version
+        ON dbo.notice_department (row_version)
+        INCLUDE (notice_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_attachment_row_version' AND object_id = OBJECT_ID('dbo.notice_attachment'))
+    CREATE INDEX IX_notice_attachment_row_version
+        ON dbo.notice_attachment (row_version)
+        INCLUDE (notice_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_notice_ocr_text_row_version' AND object_id = OBJECT_ID('dbo.notice_ocr_text'))
+    CREATE INDEX IX_notice_ocr_text_row_version
+        ON dbo.notice_ocr_text (row_version);
+GO
@@ -1,22 +1,23 @@
 # scripts/db_tasks/notice_repo.py
 from __future__ import annotations
-from typing import Optional, Tuple, Iterable
-import pyodbc
+import json
+from datetime import date
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from scripts.utils.db_utils import get_connection
+from scripts.utils.db_utils import maybe_open
+from scripts.utils.key_utils import normalize_search_key
+from scripts.utils.sql_dialect import SQLITE, dialect_of
 from scripts.utils.log_utils import init_runtime_logger
 
-logger = init_runtime_logger()
+if TYPE_CHECKING:
+    import pyodbc
 
-def _maybe_open(conn: Optional[pyodbc.Connection]):
-    if conn is not None:
-        return conn, False
-    return get_connection(), True
+logger = init_runtime_logger()
 
 # 1) 공지사항 테이블에서 url_hash 기준으로 upsert (insert or update)
 def upsert_notice_keys(conn: Optional[pyodbc.Connection], title: str, url: str, url_hash: str) -> Tuple[int, bool]:
     sql = """
-    MERGE dbo.notice AS t
+    MERGE dbo.notice WITH (HOLDLOCK) AS t
     USING (SELECT ? AS url_hash) AS s
     ON t.url_hash = s.url_hash
     WHEN NOT MATCHED THEN
@@ -28,8 +29,10 @@ def upsert_notice_keys(conn: Optional[pyodbc.Connection], title: str, url: str,
         url   = COALESCE(NULLIF(LTRIM(RTRIM(?)), ''), t.url)
     OUTPUT inserted.id, $action;
     """
-    c, close_after = _maybe_open(conn) # 연결 준비
+    c, close_after = maybe_open(conn) # 연결 준비
     try:
+        if dialect_of(c) == SQLITE:
+            return _upsert_notice_keys_sqlite(c, title, url, url_hash)
         cur = c.cursor()
         cur.execute(sql, (url_hash, title, url, url_hash, title, url))  #url_hash: MERGE source / title, url, url_hash: INSERT 값 / title, url: UPDATE 값
         rid, action = cur.fetchone()
@@ -40,7 +43,7 @@ def upsert_notice_keys(conn: Optional[pyodbc.Connection], title: str, url: str,
 
 # 2) 공지(notice)의 LLM 처리 상태(llm_status)를 조회하는 함수
 def get_llm_status(conn: Optional[pyodbc.Connection], notice_id: int) -> Optional[int]:
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
         cur.execute("SELECT llm_status FROM dbo.notice WHERE id = ?;", (notice_id,))
@@ -55,15 +58,16 @@ def apply_llm_result(conn: Optional[pyodbc.Connection], notice_id: int,
                      deadline: Optional[str], new_title: Optional[str] = None) -> None:
     sql = """
     UPDATE dbo.notice
-    SET topic = ?, oneline = ?, deadline = ?,
+    SET topic = ?, topic_norm = ?, oneline = ?, deadline = ?,
         llm_status = 1,
         title = COALESCE(NULLIF(LTRIM(RTRIM(?)), ''), title)
     WHERE id = ?;
     """
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
-        cur.execute(sql, (topic, oneline, deadline, new_title, notice_id))
+        topic_norm = normalize_search_key(topic) if topic else None  # 검색용 정규화 컬럼
+        cur.execute(sql, (topic, topic_norm, oneline, deadline, new_title, notice_id))
         c.commit()
     finally:
         if close_after: c.close()
@@ -71,7 +75,7 @@ def apply_llm_result(conn: Optional[pyodbc.Connection], notice_id: int,
 # 4) 실패/재처리 마킹
 def mark_failed(conn: Optional[pyodbc.Connection], notice_id: int, to_retry_queue: bool=False) -> None:
     st = 3 if to_retry_queue else 2
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
         cur.execute("UPDATE dbo.notice SET llm_status = ? WHERE id = ?;", (st, notice_id))
@@ -81,39 +85,39 @@ def mark_failed(conn: Optional[pyodbc.Connection], notice_id: int, to_retry_queu
 
 # 5) 부서(다대다) — 중복 방지 삽입
 def add_departments(conn: Optional[pyodbc.Connection], notice_id: int, departments: Iterable[str]) -> None:
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
         for d in departments or []:
             dept = (str(d) if d is not None else "").strip()
             if not dept: continue
             cur.execute("""
-                IF NOT EXISTS (
+                INSERT INTO dbo.notice_department (notice_id, department, department_norm)
+                SELECT ?, ?, ?
+                WHERE NOT EXISTS (
                   SELECT 1 FROM dbo.notice_department WHERE notice_id = ? AND department = ?
-                )
-                INSERT INTO dbo.notice_department (notice_id, department)
-                VALUES (?, ?);
-            """, (notice_id, dept, notice_id, dept))
+                );
+            """, (notice_id, dept, normalize_search_key(dept), notice_id, dept))
         c.commit()
     finally:
         if close_after: c.close()
 
 # 6) 첨부(1:N) — 중복 방지 삽입 (URL 기준)
 def add_attachments(conn: Optional[pyodbc.Connection], notice_id: int, image_urls: Iterable[str]) -> None:
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
         for order, url in enumerate(image_urls or []):
             furl = (str(url) if url is not None else "").strip()
             if not furl: continue
             cur.execute("""
-                IF NOT EXISTS (
+                INSERT INTO dbo.notice_attachment (notice_id, file_url, file_order)
+                SELECT ?, ?, ?
+                WHERE NOT EXISTS (
                   SELECT 1 FROM dbo.notice_attachment
                   WHERE notice_id = ? AND file_url = ?
-                )
-                INSERT INTO dbo.notice_attachment (notice_id, file_url, file_order)
-                VALUES (?, ?, ?);
-            """, (notice_id, furl, notice_id, furl, order))
+                );
+            """, (notice_id, furl, order, notice_id, furl))
         c.commit()
     finally:
         if close_after: c.close()
@@ -122,9 +126,13 @@ def add_attachments(conn: Optional[pyodbc.Connection], notice_id: int, image_url
 def upsert_ocr_text(conn: Optional[pyodbc.Connection], notice_id: int, ocr_text: str) -> None:
     text = (ocr_text or "").strip()
     if not text: return
-    c, close_after = _maybe_open(conn)
+    c, close_after = maybe_open(conn)
     try:
         cur = c.cursor()
+        if dialect_of(c) == SQLITE:
+            cur.execute(_OCR_UPSERT_SQLITE, (notice_id, text))
+            c.commit()
+            return
         cur.execute("""
             MERGE dbo.notice_ocr_text AS t
             USING (SELECT ? AS notice_id) AS s
@@ -137,3 +145,242 @@ def upsert_ocr_text(conn: Optional[pyodbc.Connection], notice_id: int, ocr_text:
         c.commit()
     finally:
         if close_after: c.close()
+
+# 8) 여러 공지를 한 번에 — 임시 테이블에 fast_executemany 로 올리고 네 테이블을 집합 연산으로 반영 (한 트랜잭션)
+#    notices: dict 목록 (url_hash, title, url, topic, oneline, deadline, departments, attachments, ocr_text)
+#    반환: 입력 순서대로 (notice_id, 새로 만들었는지). 같은 url_hash 가 여러 번이면 마지막 것을 반영
+_BULK_TEMP_SQL = """
+CREATE TABLE #bulk_notice (
+    seq INT NOT NULL PRIMARY KEY, url_hash VARCHAR(64) NOT NULL UNIQUE,
+    title NVARCHAR(1000) NULL, url NVARCHAR(2000) NULL,
+    topic NVARCHAR(100) NULL, topic_norm NVARCHAR(100) NULL,
+    oneline NVARCHAR(4000) NULL, deadline NVARCHAR(30) NULL
+);
+CREATE TABLE #bulk_department (
+    seq INT NOT NULL, department NVARCHAR(100) NOT NULL, department_norm NVARCHAR(200) NOT NULL,
+    PRIMARY KEY (seq, department)
+);
+CREATE TABLE #bulk_attachment (
+    seq INT NOT NULL, file_url NVARCHAR(2000) NOT NULL, file_order INT NOT NULL
+);
+CREATE TABLE #bulk_ocr (seq INT NOT NULL PRIMARY KEY, ocr_text NVARCHAR(MAX) NOT NULL);
+CREATE TABLE #bulk_ids (seq INT NOT NULL PRIMARY KEY, notice_id INT NOT NULL, action NVARCHAR(10) NOT NULL);
+"""
+
+# upsert_notice_keys + apply_llm_result 를 합친 것 (마감일은 형식이 틀리면 NULL — 한 건 때문에 배치가 깨지지 않도록)
+# HOLDLOCK: 키 범위를 트랜잭션 끝까지 잡아 동시에 도는 수집/upsert_notice_keys 가 같은 url_hash 를 두 번 넣지 못하게
+# (유일 인덱스 UX_notice_url_hash 는 migrations/0005 — 적용 전에도 중복 행이 생기지 않도록)
+_BULK_APPLY_SQL = """
+SET NOCOUNT ON;
+
+MERGE dbo.notice WITH (HOLDLOCK) AS t
+USING #bulk_notice AS s
+ON t.url_hash = s.url_hash
+WHEN NOT MATCHED THEN
+  INSERT (title, url, url_hash, topic, topic_norm, oneline, deadline, llm_status, created_at)
+  VALUES (s.title, s.url, s.url_hash, s.topic, s.topic_norm, s.oneline,
+          TRY_CONVERT(DATE, s.deadline), 1, SYSUTCDATETIME())
+WHEN MATCHED THEN
+  UPDATE SET
+    title      = COALESCE(NULLIF(LTRIM(RTRIM(s.title)), ''), t.title),
+    url        = COALESCE(NULLIF(LTRIM(RTRIM(s.url)), ''), t.url),
+    topic      = s.topic,
+    topic_norm = s.topic_norm,
+    oneline    = s.oneline,
+    deadline   = TRY_CONVERT(DATE, s.deadline),
+    llm_status = 1
+OUTPUT s.seq, inserted.id, $action INTO #bulk_ids (seq, notice_id, action);
+
+INSERT INTO dbo.notice_department (notice_id, department, department_norm)
+SELECT i.notice_id, d.department, d.department_norm
+FROM #bulk_department d
+JOIN #bulk_ids i ON i.seq = d.seq
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.notice_department x
+    WHERE x.notice_id = i.notice_id AND x.department = d.department
+);
+
+INSERT INTO dbo.notice_attachment (notice_id, file_url, file_order)
+SELECT i.notice_id, a.file_url, a.file_order
+FROM #bulk_attachment a
+JOIN #bulk_ids i ON i.seq = a.seq
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.notice_attachment x
+    WHERE x.notice_id = i.notice_id AND x.file_url = a.file_url
+);
+
+MERGE dbo.notice_ocr_text AS t
+USING (SELECT i.notice_id, o.ocr_text FROM #bulk_ocr o JOIN #bulk_ids i ON i.seq = o.seq) AS s
+ON t.notice_id = s.notice_id
+WHEN NOT MATCHED THEN
+  INSERT (notice_id, ocr_text) VALUES (s.notice_id, s.ocr_text)
+WHEN MATCHED THEN
+  UPDATE SET ocr_text = s.ocr_text;
+
+SELECT seq, notice_id, action FROM #bulk_ids;
+"""
+
+_BULK_DROP_SQL = "DROP TABLE #bulk_notice, #bulk_department, #bulk_attachment, #bulk_ocr, #bulk_ids;"
+
+def bulk_upsert_notices(conn: Optional[pyodbc.Connection], notices: Sequence[dict]) -> List[Tuple[int, bool]]:
+    if not notices:
+        return []
+    # 같은 url_hash 는 마지막 것만 (MERGE 는 한 행을 두 번 바꿀 수 없음)
+    last: Dict[str, int] = {}
+    for pos, n in enumerate(notices):
+        last[n["url_hash"]] = pos
+    notice_rows, dept_rows, att_rows, ocr_rows = [], [], [], []
+    for seq, pos in enumerate(sorted(last.values())):
+        n = notices[pos]
+        topic = n.get("topic") or None
+        notice_rows.append((seq, n["url_hash"], n.get("title"), n.get("url"), topic,
+                            normalize_search_key(topic) if topic else None,
+                            n.get("oneline") or None, n.get("deadline") or None))
+        seen = set()
+        for d in n.get("departments") or []:
+            dept = (str(d) if d is not None else "").strip()
+            if dept and dept not in seen:
+                seen.add(dept)
+                dept_rows.append((seq, dept, normalize_search_key(dept)))
+        seen = set()
+        for order, url in enumerate(n.get("attachments") or []):
+            furl = (str(url) if url is not None else "").strip()
+            if furl and furl not in seen:
+                seen.add(furl)
+                att_rows.append((seq, furl, order))
+        text = (n.get("ocr_text") or "").strip()
+        if text:
+            ocr_rows.append((seq, text))
+
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        if dialect_of(c) == SQLITE:
+            ids = _bulk_apply_sqlite(cur, notice_rows, dept_rows, att_rows, ocr_rows)
+            c.commit()
+            return _bulk_result(notices, last, ids, notice_rows, dept_rows, att_rows, ocr_rows)
+        cur.execute(_BULK_TEMP_SQL)
+        cur.fast_executemany = True  # 행마다 왕복하지 않고 배열로 한 번에
+        cur.executemany("INSERT INTO #bulk_notice VALUES (?, ?, ?, ?, ?, ?, ?, ?);", notice_rows)
+        if dept_rows:
+            cur.executemany("INSERT INTO #bulk_department VALUES (?, ?, ?);", dept_rows)
+        if att_rows:
+            cur.executemany("INSERT INTO #bulk_attachment VALUES (?, ?, ?);", att_rows)
+        if ocr_rows:
+            import pyodbc  # 이 분기는 MSSQL 연결에서만
+            cur.setinputsizes([(pyodbc.SQL_INTEGER, 0, 0), (pyodbc.SQL_WVARCHAR, 0, 0)])  # NVARCHAR(MAX)
+            cur.executemany("INSERT INTO #bulk_ocr VALUES (?, ?);", ocr_rows)
+            cur.setinputsizes(None)
+        cur.fast_executemany = False
+        cur.execute(_BULK_APPLY_SQL)
+        ids = {int(seq): (int(nid), action == "INSERT") for seq, nid, action in cur.fetchall()}
+        cur.execute(_BULK_DROP_SQL)
+        c.commit()
+    except Exception:
+        c.rollback()
+        raise
+    finally:
+        if close_after: c.close()
+
+    return _bulk_result(notices, last, ids, notice_rows, dept_rows, att_rows, ocr_rows)
+
+def _bulk_result(notices, last, ids, notice_rows, dept_rows, att_rows, ocr_rows) -> List[Tuple[int, bool]]:
+    by_hash = {notices[pos]["url_hash"]: ids[seq] for seq, pos in enumerate(sorted(last.values()))}
+    logger.info("[NOTICE_REPO] bulk upsert - notices=%d departments=%d attachments=%d ocr=%d inserted=%d",
+                len(notice_rows), len(dept_rows), len(att_rows), len(ocr_rows),
+                sum(1 for _nid, created in ids.values() if created))
+    return [by_hash[n["url_hash"]] for n in notices]
+
+# 9) 여러 URL 해시의 (notice_id, llm_status) 를 한 번에 — 수집 창 전체를 행별 조회 없이 거르기
+#    해시 목록을 JSON 배열 하나로 넘겨 OPENJSON 으로 풀어 조인 (파라미터 개수 제한/행별 왕복 없음)
+def get_llm_statuses(conn: Optional[pyodbc.Connection], url_hashes: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    hashes = sorted({h for h in url_hashes if h})
+    if not hashes:
+        return {}
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        cur.execute(_STATUSES_SQLITE if dialect_of(c) == SQLITE else """
+            SELECT n.url_hash, n.id, n.llm_status
+            FROM OPENJSON(?) WITH (url_hash VARCHAR(64) '$') AS j
+            JOIN dbo.notice n ON n.url_hash = j.url_hash;
+        """, (json.dumps(hashes),))
+        return {h: (int(nid), int(st)) for h, nid, st in cur.fetchall()}
+    finally:
+        if close_after: c.close()
+
+# ---------- SQLite (utils/sqlite_backend — 로컬 벤치마크용, DB_BACKEND=sqlite) ----------
+# MERGE / OUTPUT / OPENJSON / #임시 테이블 대신 ON CONFLICT / RETURNING / json_each.
+# 프로세스 안이라 왕복 비용이 없으므로 일괄 반영도 한 트랜잭션 안에서 행별 문장으로 충분
+
+_OCR_UPSERT_SQLITE = """
+    INSERT INTO dbo.notice_ocr_text (notice_id, ocr_text) VALUES (?, ?)
+    ON CONFLICT (notice_id) DO UPDATE SET ocr_text = excluded.ocr_text;
+"""
+
+_STATUSES_SQLITE = """
+    SELECT n.url_hash, n.id, n.llm_status
+    FROM json_each(?) AS j
+    JOIN dbo.notice n ON n.url_hash = j.value;
+"""
+
+def _upsert_notice_keys_sqlite(c, title: str, url: str, url_hash: str) -> Tuple[int, bool]:
+    cur = c.cursor()
+    cur.execute("""
+        INSERT INTO dbo.notice (title, url, url_hash, llm_status, created_at)
+        VALUES (?, ?, ?, 0, SYSUTCDATETIME())
+        ON CONFLICT (url_hash) DO NOTHING
+        RETURNING id;
+    """, (title, url, url_hash))
+    row = cur.fetchone()
+    created = row is not None
+    if not created:
+        cur.execute("""
+            UPDATE dbo.notice SET
+              title = COALESCE(NULLIF(TRIM(?), ''), title),
+              url   = COALESCE(NULLIF(TRIM(?), ''), url)
+            WHERE url_hash = ?
+            RETURNING id;
+        """, (title, url, url_hash))
+        row = cur.fetchone()
+    c.commit()
+    return int(row[0]), created
+
+def _sqlite_date(v: Optional[str]) -> Optional[str]:
+    # TRY_CONVERT(DATE, ...) 와 같이: 형식이 틀리면 NULL
+    try:
+        return date.fromisoformat(str(v).strip()[:10]).isoformat() if v else None
+    except ValueError:
+        return None
+
+def _bulk_apply_sqlite(cur, notice_rows, dept_rows, att_rows, ocr_rows) -> Dict[int, Tuple[int, bool]]:
+    ids: Dict[int, Tuple[int, bool]] = {}
+    for seq, url_hash, title, url, topic, topic_norm, oneline, deadline in notice_rows:
+        cur.execute("SELECT id FROM dbo.notice WHERE url_hash = ?;", (url_hash,))
+        existed = cur.fetchone() is not None
+        cur.execute("""
+            INSERT INTO dbo.notice (title, url, url_hash, topic, topic_norm, oneline, deadline, llm_status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1, SYSUTCDATETIME())
+            ON CONFLICT (url_hash) DO UPDATE SET
+              title      = COALESCE(NULLIF(TRIM(excluded.title), ''), title),
+              url        = COALESCE(NULLIF(TRIM(excluded.url), ''), url),
+              topic      = excluded.topic,
+              topic_norm = excluded.topic_norm,
+              oneline    = excluded.oneline,
+              deadline   = excluded.deadline,
+              llm_status = 1
+            RETURNING id;
+        """, (title, url, url_hash, topic, topic_norm, oneline, _sqlite_date(deadline)))
+        ids[seq] = (int(cur.fetchone()[0]), not existed)
+    cur.executemany("""
+        INSERT INTO dbo.notice_department (notice_id, department, department_norm)
+        SELECT ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM dbo.notice_department WHERE notice_id = ? AND department = ?);
+    """, [(ids[seq][0], dept, norm, ids[seq][0], dept) for seq, dept, norm in dept_rows])
+    cur.executemany("""
+        INSERT INTO dbo.notice_attachment (notice_id, file_url, file_order)
+        SELECT ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM dbo.notice_attachment WHERE notice_id = ? AND file_url = ?);
+    """, [(ids[seq][0], furl, order, ids[seq][0], furl) for seq, furl, order in att_rows])
+    cur.executemany(_OCR_UPSERT_SQLITE, [(ids[seq][0], text) for seq, text in ocr_rows])
+    return ids
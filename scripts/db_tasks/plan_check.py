@@ -0,0 +1,129 @@
+# scripts/db_tasks/plan_check.py
+# 서빙 쿼리(serving/notice_query.py)의 예상 실행 계획을 SHOWPLAN_XML 로 받아 scan 연산자를 찾음.
+# 공지가 쌓이면서 인덱스 seek 가 조용히 테이블 scan 으로 바뀌는 회귀를 배포 전에 잡기 위한 검사.
+# (쿼리는 실행하지 않음 — 계획만 컴파일. 행 수가 운영과 비슷한 DB 에서 돌려야 의미 있음)
+#
+#   python -m scripts.db_tasks.plan_check              # scan 이 있으면 종료 코드 1
+#   python -m scripts.db_tasks.plan_check --show-plan  # 연산자 목록까지
+from __future__ import annotations
+import argparse
+import sys
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, time
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+import pyodbc
+
+from scripts.serving.notice_query import build_notice_query, _TOPN_QUERY
+from scripts.serving.pagination import PAGE_SIZE, PageCursor
+from scripts.utils.db_utils import get_connection
+from scripts.utils.key_utils import normalize_search_key, like_prefix
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+SCAN_OPS = frozenset({"Table Scan", "Clustered Index Scan", "Index Scan"})
+# 한 행짜리 상태 테이블은 scan 이 정상
+ALLOWED_SCANS = frozenset({"notice_topn_state"})
+
+Probe = Tuple[str, str, tuple]        # (이름, sql, 파라미터)
+Scan = Tuple[str, str, str]           # (연산자, 테이블, 인덱스)
+
+# 1) 웹훅이 실제로 보내는 모양들: 접두 LIKE / 해석된 정확 일치 / 키셋 다음 페이지 / 상위 N건 테이블
+def serving_probes(topic: str = "공모전", department: str = "컴퓨터공학과",
+                   today: Optional[date] = None) -> List[Probe]:
+    today = today or date.today()
+    t_norm, d_norm = normalize_search_key(topic), normalize_search_key(department)
+    probes: List[Probe] = []
+    for sort_option in ("마감순", "최신순", "오래된순"):
+        sql, _ = build_notice_query(sort_option, limit=PAGE_SIZE + 1)
+        probes.append((f"prefix/{sort_option}", sql, (like_prefix(d_norm), like_prefix(t_norm), today)))
+        sql, _ = build_notice_query(sort_option, limit=PAGE_SIZE + 1, n_departments=1, n_topics=1)
+        probes.append((f"exact/{sort_option}", sql, (d_norm, t_norm, today)))
+        after = PageCursor(topic, department, sort_option, 1_000_000,
+                           deadline=today, created_at=datetime.combine(today, time.min))
+        sql, seek = build_notice_query(sort_option, limit=PAGE_SIZE + 1, after=after, n_departments=1, n_topics=1)
+        probes.append((f"keyset/{sort_option}", sql, (d_norm, t_norm, today, *seek)))
+    probes.append(("topn", _TOPN_QUERY.format(topics="?", departments="?"), (t_norm, d_norm, "deadline")))
+    return probes
+
+# 2) 예상 계획 XML — SHOWPLAN_XML 은 배치에 혼자 있어야 하므로 따로 켜고 끔
+def capture_plan(conn: pyodbc.Connection, sql: str, params: tuple) -> str:
+    cur = conn.cursor()
+    try:
+        cur.execute("SET SHOWPLAN_XML ON;")
+        try:
+            cur.execute(sql, params)
+            return "".join(str(row[0]) for row in cur.fetchall())
+        finally:
+            cur.execute("SET SHOWPLAN_XML OFF;")
+    finally:
+        cur.close()
+
+def _name(value: Optional[str]) -> str:
+    return (value or "").strip("[]")
+
+# 3) 계획에서 scan 연산자 찾기 (임시 테이블·허용 목록 제외)
+def find_scans(plan_xml: str, allowed: FrozenSet[str] = ALLOWED_SCANS) -> List[Scan]:
+    root = ET.fromstring(plan_xml)
+    scans: List[Scan] = []
+    for relop in root.iter(f"{_NS}RelOp"):
+        op = relop.get("PhysicalOp", "")
+        if op not in SCAN_OPS:
+            continue
+        obj = relop.find(f"./*/{_NS}Object")
+        table = _name(obj.get("Table")) if obj is not None else ""
+        index = _name(obj.get("Index")) if obj is not None else ""
+        if table.startswith("#") or table in allowed:
+            continue
+        scans.append((op, table, index))
+    return scans
+
+def operators(plan_xml: str) -> List[str]:
+    out = []
+    for relop in ET.fromstring(plan_xml).iter(f"{_NS}RelOp"):
+        obj = relop.find(f"./*/{_NS}Object")
+        where = f" {_name(obj.get('Table'))}.{_name(obj.get('Index'))}" if obj is not None else ""
+        out.append(f"{relop.get('PhysicalOp')}{where}")
+    return out
+
+def check_serving_plans(conn: pyodbc.Connection, probes: Optional[Iterable[Probe]] = None,
+                        allowed: FrozenSet[str] = ALLOWED_SCANS,
+                        show_plan: bool = False) -> List[Tuple[str, List[Scan]]]:
+    """반환: [(probe 이름, 찾은 scan 목록)] — 목록이 비어 있으면 통과"""
+    findings = []
+    for name, sql, params in (serving_probes() if probes is None else probes):
+        plan = capture_plan(conn, sql, params)
+        if show_plan:
+            print(f"-- {name}\n   " + "\n   ".join(operators(plan)))
+        scans = find_scans(plan, allowed)
+        if scans:
+            logger.warning("[PLAN] scan - probe=%s %s", name, scans)
+        findings.append((name, scans))
+    return findings
+
+def print_report(findings: List[Tuple[str, List[Scan]]]) -> None:
+    for name, scans in findings:
+        status = "ok" if not scans else "SCAN " + ", ".join(f"{op} {t}.{i}".rstrip(".") for op, t, i in scans)
+        print(f"{name:<20} {status}")
+
+def main():
+    parser = argparse.ArgumentParser(description="서빙 쿼리 실행 계획에서 scan 검사")
+    parser.add_argument("--topic", default="공모전")
+    parser.add_argument("--department", default="컴퓨터공학과")
+    parser.add_argument("--allow", default=",".join(sorted(ALLOWED_SCANS)), help="scan 을 허용할 테이블 (쉼표)")
+    parser.add_argument("--show-plan", action="store_true")
+    args = parser.parse_args()
+
+    allowed = frozenset(t.strip() for t in args.allow.split(",") if t.strip())
+    conn = get_connection()
+    try:
+        findings = check_serving_plans(conn, serving_probes(args.topic, args.department),
+                                       allowed=allowed, show_plan=args.show_plan)
+    finally:
+        conn.close()
+    print_report(findings)
+    sys.exit(1 if any(scans for _name, scans in findings) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# scripts/db_tasks/thumbnail_repo.py
+# 첨부 이미지 썸네일(dbo.notice_attachment.thumbnail_url, migrations/0003) 만들기.
+# 수집 때 새 공지의 첨부는 insertion.insert_notice_all 이 바로 만들고(build_thumbnails(notice_ids=[id])),
+# 그 전에 들어온 첨부는 아래 백필 명령으로 프로세스 풀에서 한꺼번에 만듦.
+# 카드에는 공지의 첫 첨부만 쓰므로 기본은 첫 첨부만 (--all-attachments 로 전부).
+#
+#   python -m scripts.db_tasks.thumbnail_repo --workers 4
+from __future__ import annotations
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from scripts.utils.db_utils import get_connection, maybe_open
+from scripts.utils.sql_dialect import SQLITE, dialect_of
+from scripts.utils.thumbnail_utils import DEFAULT_FORMATS, THUMB_EDGE, make_thumbnail
+from scripts.utils.log_utils import init_runtime_logger
+
+if TYPE_CHECKING:
+    import pyodbc
+
+logger = init_runtime_logger()
+
+STATUS_PENDING, STATUS_DONE, STATUS_FAILED = 0, 1, 2
+BATCH_SIZE = 200
+
+Attachment = Tuple[int, str]  # (notice_id, file_url)
+
+# 1) 썸네일이 아직 없는 첨부 — 최근 공지부터 (활성 공지 카드가 먼저 가벼워지도록)
+def pending_attachments(conn: Optional[pyodbc.Connection], limit: int = BATCH_SIZE,
+                        notice_ids: Optional[Sequence[int]] = None,
+                        first_only: bool = True) -> List[Attachment]:
+    where = ["x.thumbnail_status = ?"]
+    params: list = [STATUS_PENDING]
+    if first_only:
+        where.append("x.rn = 1")
+    if notice_ids is not None:
+        if not notice_ids:
+            return []
+        where.append(f"x.notice_id IN ({', '.join('?' * len(notice_ids))})")
+        params += [int(i) for i in notice_ids]
+    c, close_after = maybe_open(conn)
+    sqlite = dialect_of(c) == SQLITE  # SQLite 는 TOP 대신 LIMIT
+    sql = f"""
+        SELECT{'' if sqlite else ' TOP (?)'} x.notice_id, x.file_url
+        FROM (
+            SELECT a.notice_id, a.file_url, a.thumbnail_status,
+                   ROW_NUMBER() OVER (PARTITION BY a.notice_id ORDER BY a.file_order ASC) AS rn
+            FROM dbo.notice_attachment a
+        ) x
+        WHERE {' AND '.join(where)}
+        ORDER BY x.notice_id DESC, x.rn ASC{' LIMIT ?' if sqlite else ''};
+    """
+    try:
+        cur = c.cursor()
+        cur.execute(sql, (*params, int(limit)) if sqlite else (int(limit), *params))
+        return [(int(nid), furl) for nid, furl in cur.fetchall()]
+    finally:
+        if close_after: c.close()
+
+# 2) 결과 기록 — thumbnail_url 이 None 이면 실패(2)로 마킹해 다시 고르지 않음 (카드는 원본으로 폴백)
+def record_thumbnails(conn: Optional[pyodbc.Connection],
+                      results: Iterable[Tuple[int, str, Optional[str]]]) -> int:
+    rows = [(thumb, STATUS_DONE if thumb else STATUS_FAILED, nid, furl) for nid, furl, thumb in results]
+    if not rows:
+        return 0
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        cur.executemany("""
+            UPDATE dbo.notice_attachment
+            SET thumbnail_url = ?, thumbnail_status = ?
+            WHERE notice_id = ? AND file_url = ?;
+        """, rows)
+        c.commit()
+        return len(rows)
+    finally:
+        if close_after: c.close()
+
+# 3) 실패한 첨부를 다시 대기(0)로 — 원본이 다시 올라왔거나 일시 장애였을 때
+def reset_failed(conn: Optional[pyodbc.Connection]) -> int:
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        cur.execute("UPDATE dbo.notice_attachment SET thumbnail_status = ? WHERE thumbnail_status = ?;",
+                    (STATUS_PENDING, STATUS_FAILED))
+        n = max(cur.rowcount, 0)
+        c.commit()
+        return n
+    finally:
+        if close_after: c.close()
+
+def _thumbnail_job(job: Tuple[int, str, Tuple[str, ...], int]) -> Tuple[int, str, Optional[str]]:
+    # 프로세스 풀 워커에서 실행 (DB 는 만지지 않음 — 다운로드/축소/업로드만)
+    notice_id, file_url, formats, edge = job
+    try:
+        return notice_id, file_url, make_thumbnail(file_url, formats, edge)
+    except Exception as e:
+        logger.warning("[THUMB] failed - notice_id=%s url=%s error=%s", notice_id, file_url, e)
+        return notice_id, file_url, None
+
+# 4) 썸네일 만들기 — notice_ids 가 있으면 그 공지만, 없으면 남은 첨부 전부 (limit 건까지)
+#    workers > 0 이면 프로세스 풀 (Pillow 축소/인코딩이 CPU 를 씀), 0 이면 현재 프로세스에서 차례로
+def build_thumbnails(conn: Optional[pyodbc.Connection] = None, notice_ids: Optional[Sequence[int]] = None,
+                     workers: int = 0, limit: Optional[int] = None, first_only: bool = True,
+                     formats: Sequence[str] = DEFAULT_FORMATS, edge: int = THUMB_EDGE) -> Tuple[List[int], int]:
+    """반환: (썸네일을 새로 단 공지 id 목록, 실패 건수)"""
+    formats = tuple(formats)
+    c, close_after = maybe_open(conn)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    done: List[int] = []
+    failed = 0
+    try:
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch = pending_attachments(c, min(BATCH_SIZE, remaining or BATCH_SIZE),
+                                        notice_ids=notice_ids, first_only=first_only)
+            if not batch:
+                break
+            jobs = [(nid, furl, formats, edge) for nid, furl in batch]
+            results = list(pool.map(_thumbnail_job, jobs, chunksize=4) if pool else map(_thumbnail_job, jobs))
+            record_thumbnails(c, results)  # 배치마다 기록 → 중단돼도 이어서
+            done += [nid for nid, _furl, thumb in results if thumb]
+            failed += sum(1 for _nid, _furl, thumb in results if not thumb)
+            if remaining is not None:
+                remaining -= len(batch)
+            logger.info("[THUMB] batch - size=%d done=%d failed=%d", len(batch), len(done), failed)
+        return sorted(set(done)), failed
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if close_after: c.close()
+
+# 5) 공지별 첫 첨부의 썸네일 URL (없거나 아직이면 빠짐)
+def first_thumbnails(conn: Optional[pyodbc.Connection], notice_ids: Sequence[int]) -> Dict[int, str]:
+    ids = sorted({int(i) for i in notice_ids})
+    if not ids:
+        return {}
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        out: Dict[int, str] = {}
+        for start in range(0, len(ids), 500):  # 파라미터 개수 제한(2100) 아래로
+            chunk = ids[start:start + 500]
+            cur.execute(f"""
+                SELECT x.notice_id, x.thumbnail_url
+                FROM (
+                    SELECT a.notice_id, a.thumbnail_url,
+                           ROW_NUMBER() OVER (PARTITION BY a.notice_id ORDER BY a.file_order ASC) AS rn
+                    FROM dbo.notice_attachment a
+                    WHERE a.notice_id IN ({', '.join('?' * len(chunk))})
+                ) x
+                WHERE x.rn = 1 AND x.thumbnail_url IS NOT NULL;
+            """, chunk)
+            out.update((int(nid), url) for nid, url in cur.fetchall())
+        return out
+    finally:
+        if close_after: c.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="첨부 이미지 썸네일 백필")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (0 이면 현재 프로세스)")
+    parser.add_argument("--limit", type=int, default=None, help="이번에 처리할 최대 첨부 수")
+    parser.add_argument("--all-attachments", action="store_true", help="첫 첨부(카드 이미지)뿐 아니라 전부")
+    parser.add_argument("--retry-failed", action="store_true", help="실패(2)로 기록된 첨부도 다시 시도")
+    parser.add_argument("--edge", type=int, default=THUMB_EDGE)
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help="앞의 것이 thumbnail_url (예: jpeg,webp)")
+    args = parser.parse_args()
+
+    # 상위 N건 테이블은 썸네일 열을 복사해 두므로 새로 단 공지가 걸친 조합만 다시 채움
+    from scripts.db_tasks.topn_repo import affected_pairs, rebuild_topn
+    from scripts.utils.cache_utils import NOTICE_GENERATION
+
+    conn = get_connection()
+    try:
+        if args.retry_failed:
+            logger.info("[THUMB] reset failed - rows=%d", reset_failed(conn))
+        ids, failed = build_thumbnails(conn, workers=args.workers, limit=args.limit,
+                                       first_only=not args.all_attachments,
+                                       formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+                                       edge=args.edge)
+        logger.info("[THUMB] backfill done - notices=%d failed=%d", len(ids), failed)
+        if ids:
+            rebuild_topn(conn, pairs=affected_pairs(conn, ids))
+            NOTICE_GENERATION.bump()  # 웹훅 결과 캐시 무효화 (메모리 인덱스는 다음 전체 재적재 때 반영)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
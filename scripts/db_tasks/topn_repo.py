@@ -0,0 +1,255 @@
+# scripts/db_tasks/topn_repo.py
+# (topic_norm, department_norm, 정렬) 조합별 상위 N건 서빙 테이블(dbo.notice_topn, migrations/0002·0003) 갱신.
+# 수집이 끝난 뒤 새로 들어온 공지가 걸친 조합만 다시 채우고(rebuild_topn(pairs=...)),
+# 하루 한 번(또는 --full) 전체를 다시 채움. 읽기는 serving/notice_query.fetch_topn_rows.
+#
+# 조합 단위 갱신은 새 공지의 (주제, 학과)만 지우고 다시 채우므로, 이미 들어 있던 공지가
+# 삭제/비활성(llm_status)/주제·학과 변경으로 빠져도 그 행은 남음 (마감 지난 행만 읽을 때 거름).
+# 그래서 notice_topn_state.built_for 는 '마지막 전체 재적재 날짜'만 뜻함 (조합 단위 갱신은 안 건드림):
+# - 수집 실행(ingestion/notice_ingest_pipeline.py)이 full_rebuild_due 면 조합 단위 대신 전체를 다시 채움
+#   (KST 날짜가 바뀐 뒤 첫 실행 = 하루 한 번)
+# - 웹훅은 built_for 가 TOPN_MAX_AGE_DAYS 보다 오래됐으면 이 표를 믿지 않고 기존 쿼리로 폴백
+#   → 남은 행이 보이는 기간은 최대 그만큼
+#
+#   python -m scripts.db_tasks.topn_repo --full
+from __future__ import annotations
+import argparse
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Iterable, Optional, Set, Tuple
+
+from configs.serving_config import get_serving_config
+from scripts.utils.db_utils import get_connection, maybe_open
+from scripts.utils.sql_dialect import SQLITE, dialect_of, sqlite_card_columns
+from scripts.utils.cache_utils import KST
+from scripts.serving.notice_query import ORDER_BY
+from scripts.utils.log_utils import init_runtime_logger
+
+if TYPE_CHECKING:
+    import pyodbc
+
+logger = init_runtime_logger()
+
+Pair = Tuple[str, str]  # (topic_norm, department_norm)
+
+_SCOPE_JOIN = """
+    JOIN #topn_scope s ON s.topic_norm = n.topic_norm AND s.department_norm = d.department_norm"""
+
+# 조합마다 ROW_NUMBER 로 순위를 매겨 상위 N건만, 카드에 필요한 열까지 같이 저장
+_INSERT_SQL = """
+INSERT INTO dbo.notice_topn
+    (topic_norm, department_norm, sort_family, rank_no, notice_id,
+     title, deadline, oneline, topic, created_at, url, file_url, departments, thumbnail_url, pair_total)
+SELECT x.topic_norm, x.department_norm, ?, x.rn, n.id,
+       n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url, a.file_url, dep.departments, a.thumbnail_url, x.pair_total
+FROM (
+    SELECT n.topic_norm, d.department_norm, n.id,
+           ROW_NUMBER() OVER (PARTITION BY n.topic_norm, d.department_norm ORDER BY {order}) AS rn,
+           COUNT(*) OVER (PARTITION BY n.topic_norm, d.department_norm) AS pair_total
+    FROM dbo.notice n
+    JOIN (SELECT DISTINCT notice_id, department_norm FROM dbo.notice_department) d ON d.notice_id = n.id{scope}
+    WHERE n.llm_status = 1
+      AND n.topic_norm IS NOT NULL
+      AND d.department_norm IS NOT NULL
+      AND (n.deadline IS NULL OR n.deadline >= ?)
+) x
+JOIN dbo.notice n ON n.id = x.id
+OUTER APPLY (
+    SELECT STRING_AGG(department, ', ') AS departments
+    FROM dbo.notice_department
+    WHERE notice_id = n.id
+) dep
+OUTER APPLY (
+    SELECT TOP 1 file_url, thumbnail_url
+    FROM dbo.notice_attachment
+    WHERE notice_id = n.id
+    ORDER BY file_order ASC
+) a
+WHERE x.rn <= ?;
+"""
+
+_STATE_SQL = """
+MERGE dbo.notice_topn_state AS t
+USING (SELECT 1 AS id) AS s
+ON t.id = s.id
+WHEN NOT MATCHED THEN
+  INSERT (id, built_for, size, rebuilt_at) VALUES (1, ?, ?, SYSUTCDATETIME())
+WHEN MATCHED THEN
+  UPDATE SET built_for = ?, size = ?, rebuilt_at = SYSUTCDATETIME();
+"""
+
+# SQLite 백엔드(utils/sqlite_backend.py)용 — OUTER APPLY / MERGE / #임시 테이블 대신
+_SCOPE_JOIN_SQLITE = """
+    JOIN temp.topn_scope s ON s.topic_norm = n.topic_norm AND s.department_norm = d.department_norm"""
+
+_INSERT_SQL_SQLITE = """
+INSERT INTO dbo.notice_topn
+    (topic_norm, department_norm, sort_family, rank_no, notice_id,
+     title, deadline, oneline, topic, created_at, url, file_url, departments, thumbnail_url, pair_total)
+SELECT x.topic_norm, x.department_norm, ?, x.rn, n.id,
+       n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url, a.file_url, {departments}, a.thumbnail_url,
+       x.pair_total
+FROM (
+    SELECT n.topic_norm, d.department_norm, n.id,
+           ROW_NUMBER() OVER (PARTITION BY n.topic_norm, d.department_norm ORDER BY {order}) AS rn,
+           COUNT(*) OVER (PARTITION BY n.topic_norm, d.department_norm) AS pair_total
+    FROM dbo.notice n
+    JOIN (SELECT DISTINCT notice_id, department_norm FROM dbo.notice_department) d ON d.notice_id = n.id{scope}
+    WHERE n.llm_status = 1
+      AND n.topic_norm IS NOT NULL
+      AND d.department_norm IS NOT NULL
+      AND (n.deadline IS NULL OR n.deadline >= ?)
+) x
+JOIN dbo.notice n ON n.id = x.id
+{attachment_join}
+WHERE x.rn <= ?;
+"""
+
+_STATE_SQL_SQLITE = """
+INSERT INTO dbo.notice_topn_state (id, built_for, size, rebuilt_at) VALUES (1, ?, ?, SYSUTCDATETIME())
+ON CONFLICT (id) DO UPDATE SET
+  built_for = excluded.built_for, size = excluded.size, rebuilt_at = excluded.rebuilt_at;
+"""
+
+def full_rebuild_due(conn: Optional[pyodbc.Connection], today: Optional[date] = None) -> bool:
+    """오늘(KST) 아직 전체 재적재를 안 했는지 (상태 행이 없어도 True)"""
+    today = today or _today()
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        cur.execute("SELECT built_for FROM dbo.notice_topn_state WHERE id = 1;")
+        row = cur.fetchone()
+        return row is None or row[0] < today
+    finally:
+        if close_after: c.close()
+
+def _today() -> date:
+    return datetime.now(KST).date()  # 웹훅(MessageService.today)과 같은 기준
+
+# 1) 새로 들어온 공지가 걸친 (topic_norm, department_norm) 조합
+def affected_pairs(conn: Optional[pyodbc.Connection], notice_ids: Iterable[int]) -> Set[Pair]:
+    ids = sorted({int(i) for i in notice_ids})
+    if not ids:
+        return set()
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        pairs: Set[Pair] = set()
+        for start in range(0, len(ids), 500):  # 파라미터 개수 제한(2100) 아래로
+            chunk = ids[start:start + 500]
+            cur.execute(f"""
+                SELECT DISTINCT n.topic_norm, d.department_norm
+                FROM dbo.notice n
+                JOIN dbo.notice_department d ON d.notice_id = n.id
+                WHERE n.id IN ({', '.join('?' * len(chunk))})
+                  AND n.topic_norm IS NOT NULL AND d.department_norm IS NOT NULL;
+            """, chunk)
+            pairs.update((t, dn) for t, dn in cur.fetchall())
+        return pairs
+    finally:
+        if close_after: c.close()
+
+# 2) 상위 N건 다시 채우기 — pairs 가 None 이면 전체(built_for 갱신), 아니면 그 조합만 (한 트랜잭션)
+def rebuild_topn(conn: Optional[pyodbc.Connection] = None, pairs: Optional[Iterable[Pair]] = None,
+                 today: Optional[date] = None, size: Optional[int] = None) -> int:
+    today = today or _today()
+    size = int(size or get_serving_config().topn_size)
+    scope = None if pairs is None else sorted(set(pairs))
+    if scope is not None and not scope:
+        return 0
+    c, close_after = maybe_open(conn)
+    try:
+        cur = c.cursor()
+        if dialect_of(c) == SQLITE:
+            inserted = _rebuild_sqlite(cur, scope, today, size)
+        else:
+            inserted = _rebuild_mssql(cur, scope, today, size)
+        c.commit()
+        logger.info("[TOPN] rebuilt - scope=%s rows=%d size=%d",
+                    "all" if scope is None else f"{len(scope)} pairs", inserted, size)
+        return inserted
+    except Exception:
+        c.rollback()
+        raise
+    finally:
+        if close_after: c.close()
+
+def _rebuild_mssql(cur, scope: Optional[list], today: date, size: int) -> int:
+    if scope is None:
+        cur.execute("DELETE FROM dbo.notice_topn;")
+        scope_sql = ""
+    else:
+        cur.execute("""
+            CREATE TABLE #topn_scope (
+                topic_norm NVARCHAR(100) NOT NULL,
+                department_norm NVARCHAR(200) NOT NULL,
+                PRIMARY KEY (topic_norm, department_norm)
+            );
+        """)
+        cur.fast_executemany = True
+        cur.executemany("INSERT INTO #topn_scope (topic_norm, department_norm) VALUES (?, ?);", scope)
+        cur.fast_executemany = False
+        cur.execute("""
+            DELETE t FROM dbo.notice_topn t
+            JOIN #topn_scope s ON s.topic_norm = t.topic_norm AND s.department_norm = t.department_norm;
+        """)
+        scope_sql = _SCOPE_JOIN
+
+    inserted = 0
+    for family, order_by in ORDER_BY.items():
+        order = order_by.replace(" ORDER BY ", "", 1)
+        cur.execute(_INSERT_SQL.format(order=order, scope=scope_sql), (family, today, size))
+        inserted += max(cur.rowcount, 0)
+    if scope is None:
+        cur.execute(_STATE_SQL, (today, size, today, size))
+    else:
+        cur.execute("DROP TABLE #topn_scope;")
+    return inserted
+
+def _rebuild_sqlite(cur, scope: Optional[list], today: date, size: int) -> int:
+    if scope is None:
+        cur.execute("DELETE FROM dbo.notice_topn;")
+        scope_sql = ""
+    else:
+        cur.execute("DROP TABLE IF EXISTS temp.topn_scope;")  # 실패한 이전 호출이 남긴 것 (DDL 은 트랜잭션 밖)
+        cur.execute("""
+            CREATE TEMP TABLE topn_scope (
+                topic_norm TEXT NOT NULL, department_norm TEXT NOT NULL,
+                PRIMARY KEY (topic_norm, department_norm)
+            );
+        """)
+        cur.executemany("INSERT INTO temp.topn_scope (topic_norm, department_norm) VALUES (?, ?);", scope)
+        cur.execute("""
+            DELETE FROM dbo.notice_topn
+            WHERE (topic_norm, department_norm) IN (SELECT topic_norm, department_norm FROM temp.topn_scope);
+        """)
+        scope_sql = _SCOPE_JOIN_SQLITE
+
+    inserted = 0
+    for family, order_by in ORDER_BY.items():
+        order = order_by.replace(" ORDER BY ", "", 1)
+        cur.execute(_INSERT_SQL_SQLITE.format(order=order, scope=scope_sql, **sqlite_card_columns()),
+                    (family, today, size))
+        inserted += max(cur.rowcount, 0)
+    if scope is None:
+        cur.execute(_STATE_SQL_SQLITE, (today, size))
+    else:
+        cur.execute("DROP TABLE temp.topn_scope;")
+    return inserted
+
+def main():
+    parser = argparse.ArgumentParser(description="dbo.notice_topn 다시 채우기")
+    parser.add_argument("--full", action="store_true", help="전체 조합 (기본: --ids 로 준 공지가 걸친 조합만)")
+    parser.add_argument("--ids", type=int, nargs="*", default=[], help="새로 들어온 공지 id")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.full:
+            rebuild_topn(conn)
+        else:
+            rebuild_topn(conn, pairs=affected_pairs(conn, args.ids))
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
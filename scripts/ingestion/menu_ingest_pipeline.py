@@ -1,7 +1,8 @@
 from tqdm import tqdm
-from scripts.db_tasks.menu_repo import insert_menu_rows
+from scripts.db_tasks.menu_repo import replace_menu_range
 from scripts.utils.blob_utils import load_notices_df_from_blob
 from scripts.utils.log_utils import init_runtime_logger
+from scripts.utils.cache_utils import MENU_GENERATION
 
 logger = init_runtime_logger()
 
@@ -21,7 +22,10 @@ def run_ingestion():
 
     df = df.rename(columns=KOR_TO_ENG)[COLS].copy()
     rows = list(df.itertuples(index=False, name=None))
-    inserted = insert_menu_rows(None, rows)
+    # 같은 CSV 를 다시 돌려도 중복 없이: 수집한 날짜 범위를 통째로 교체, 내용이 같으면 건너뜀
+    inserted = replace_menu_range(None, rows)
+    if inserted:
+        MENU_GENERATION.bump()  # 웹 서버의 식단 스냅샷 다시 적재
     print(f"Inserted rows: {inserted}")
         
 
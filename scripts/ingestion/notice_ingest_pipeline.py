@@ -6,13 +6,16 @@ from scripts.utils.ocr_utils import extract_text_from_images, clean_ocr_text
 from scripts.utils.parsing_utils import parse_image_paths
 from scripts.llm_tasks.llm_caller import generate_llm_response
 from scripts.utils.key_utils import normalize_url, sha256_hex
-from scripts.db_tasks.insertion import insert_notice_all
-from scripts.db_tasks.notice_repo import get_llm_status, upsert_notice_keys, mark_failed
+from scripts.db_tasks.insertion import insert_notice_all, insert_notices_bulk
+from scripts.db_tasks.notice_repo import get_llm_statuses, upsert_notice_keys, mark_failed
+from scripts.db_tasks.topn_repo import affected_pairs, full_rebuild_due, rebuild_topn
 from scripts.utils.log_utils import init_runtime_logger, capture_unhandled_exception
-from scripts.utils.db_utils import get_connection
+from scripts.utils.db_utils import get_pool, unit_of_work
+from scripts.utils.cache_utils import NOTICE_GENERATION
 
 logger = init_runtime_logger()
 DAILY_LIMIT = 200
+BULK_SIZE = 100  # LLM 결과를 이만큼 모아 한 트랜잭션으로 적재 (insertion.insert_notices_bulk)
 BACKUP_CSV_PATH = "data/llm_backup_results.csv"
 
 def get_checkpoint_index(path: str = "data/checkpoint_index.txt") -> int:
@@ -32,6 +35,44 @@ def append_to_backup_csv(parsed_data: dict, path: str = BACKUP_CSV_PATH):
     else:
         df_row.to_csv(path, mode="a", index=False, header=False, encoding="utf-8-sig")
 
+def mark_row_failed(notice_id, title: str, url: str) -> None:
+    """실패(2) 마킹. 처음 보는 공지(notice_id 없음)는 키를 먼저 만들어 다음 실행에서 상태가 보이게"""
+    try:
+        with unit_of_work() as uow:
+            if notice_id is None:
+                notice_id, _ = upsert_notice_keys(uow, title, url, sha256_hex(normalize_url(url)))
+            mark_failed(uow, notice_id)
+    except Exception:
+        pass
+
+def flush_pending(pending: list, inserted_ids: list, resume_idx: int) -> None:
+    """
+    모아 둔 (index, notice_id, parsed) 를 한 번에 적재. 배치가 실패하면 한 건씩 다시 시도해
+    문제가 된 공지만 실패(2)로 마킹 (LLM 결과는 이미 백업 CSV 에 있음)
+    적재가 끝난 뒤에만 체크포인트를 resume_idx(아직 적재하지 않은 가장 앞 행)로 옮김
+    → 배치 중간에 프로세스가 죽으면 다음 실행이 그 배치 행부터 다시 처리 (LLM 결과를 잃지 않음)
+    """
+    if not pending:
+        save_checkpoint_index(resume_idx)
+        return
+    try:
+        inserted_ids.extend(insert_notices_bulk([parsed for _, _, parsed in pending]))
+        logger.info("[✔] bulk ingestion 성공 - notices=%s", len(pending))
+    except Exception as e:
+        capture_unhandled_exception(index=None, phase="DB", url=None, exc=e,
+                                    extra={"step": "bulk_insert", "notices": len(pending)})
+        logger.warning("[NOTICE_INGEST] bulk 적재 실패 → 한 건씩 재시도 (notices=%s)", len(pending))
+        for idx, notice_id, parsed in pending:
+            try:
+                inserted_ids.append(insert_notice_all(parsed))
+            except Exception as e:
+                mark_row_failed(notice_id, parsed.get("title", ""), parsed.get("url", ""))
+                capture_unhandled_exception(index=idx, phase="INGEST", url=parsed.get("url"),
+                                            exc=e, extra={"title": parsed.get("title", "")})
+    NOTICE_GENERATION.bump()  # 웹훅 결과 캐시 무효화
+    pending.clear()
+    save_checkpoint_index(resume_idx)
+
 def run_ingestion():
     start_idx = get_checkpoint_index()
     logger.info("[NOTICE_INGEST] 시작 index=%s, daily_limit=%s", start_idx, DAILY_LIMIT)
@@ -45,33 +86,36 @@ def run_ingestion():
     # 읽기는 여유 있게, 실제 LLM 호출은 DAILY_LIMIT로 제어
     df = df.iloc[start_idx : start_idx + (DAILY_LIMIT * 3)]
     logger.info("[INGEST] 후보 행 수=%s", len(df))
+    resume_idx = start_idx + len(df)  # 창을 끝까지 처리하면 다음 실행은 창 다음부터
+
+    # URL 해시를 먼저 모두 계산해 상태를 쿼리 한 번으로 조회 → 완료(1)건과 창 안의 중복 URL 은 행별 작업 전에 제외
+    df = df.assign(url_hash=[sha256_hex(normalize_url(str(u or ""))) for u in df["링크"]])
+    known = get_llm_statuses(None, df["url_hash"])  # url_hash → (notice_id, llm_status)
+    completed = df["url_hash"].map(lambda h: h in known and known[h][1] == 1)
+    duplicated = df["url_hash"].duplicated()
+    df = df[~completed & ~duplicated]
+    logger.info("[INGEST] 완료건 제외=%s 중복 제외=%s → 처리 대상=%s",
+                int(completed.sum()), int((duplicated & ~completed).sum()), len(df))
 
     llm_calls = 0
-    conn = get_connection()
+    inserted_ids = []
+    pending = []  # LLM 까지 끝나고 적재를 기다리는 (index, notice_id, parsed)
 
     for i, row in tqdm(df.iterrows(), total=len(df), desc="Ingestion 진행"):
-            current_idx = start_idx + i
+            current_idx = i  # reset_index 뒤에 자른 창이라 라벨이 곧 전체 기준 위치
+            title = str(row.get("제목", "") or "")
+            url = str(row.get("링크", "") or "")
+            # 1) 이미 있는 공지면 미리 읽은 id (처음 보는 공지는 적재 때 insert_notices_bulk 가 키를 만듦)
+            # 2) 완료(1)건은 위에서 이미 제외
+            notice_id = known.get(row["url_hash"], (None, None))[0]
             try:
-                save_checkpoint_index(current_idx + 1)
-
-                title = str(row.get("제목", "") or "")
                 body = str(row.get("본문내용", "") or "")
-                url = str(row.get("링크", "") or "")
                 image_paths_str = str(row.get("사진", "")).strip()
 
-                # 1) URL 해시 생성 → 먼저 DB에 업서트(LLM 호출 전)
-                url_hash = sha256_hex(normalize_url(url))
-                notice_id, _ = upsert_notice_keys(conn, title, url, url_hash)
-
-                # 2) 상태 확인: 완료(1)이면 LLM 스킵
-                st = get_llm_status(conn, notice_id)
-                if st == 1:
-                    logger.info("[SKIP] 완료건 notice_id=%s url=%s", notice_id, url)
-                    continue
-
                 # 3) 일일 LLM 한도 체크
                 if llm_calls >= DAILY_LIMIT:
                     logger.info("[STOP] 일일 LLM 한도 도달: %s", llm_calls)
+                    resume_idx = current_idx  # 이 행은 다음 실행에서
                     break
 
                 # 4) OCR 준비
@@ -91,18 +135,16 @@ def run_ingestion():
 
                 append_to_backup_csv(parsed)
                 
-                # --- DB 삽입 ---
-                insert_notice_all(parsed, conn=conn)
+                # --- DB 삽입: BULK_SIZE 건씩 모아 한 트랜잭션으로 ---
+                pending.append((current_idx, notice_id, parsed))
                 llm_calls += 1
-                logger.info("[✔] index=%s ingestion 성공 - title=%s", current_idx, parsed.get("title"))
+                logger.info("[✔] index=%s LLM 완료 - title=%s", current_idx, parsed.get("title"))
+                if len(pending) >= BULK_SIZE:
+                    flush_pending(pending, inserted_ids, current_idx + 1)
 
             except Exception as e:
                 # 실패: 상태 마킹(2) 후 로깅
-                try:
-                    if 'notice_id' in locals():
-                        mark_failed(None, notice_id)
-                except Exception:
-                    pass
+                mark_row_failed(notice_id, title, url)
                 capture_unhandled_exception(
                     index=current_idx,
                     phase="INGEST",
@@ -114,6 +156,27 @@ def run_ingestion():
                             current_idx, row.get("제목", ""), str(e))
                 continue
 
+    flush_pending(pending, inserted_ids, resume_idx)
+
+    # 새 공지가 걸친 (주제, 학과) 조합만 상위 N건 테이블 다시 채우고 웹훅 캐시 무효화
+    # 날짜가 바뀐 뒤 첫 실행이면 전체를 다시 채움 (빠진 공지의 남은 행 정리 — db_tasks/topn_repo.py)
+    try:
+        rebuilt = False
+        with unit_of_work() as uow:
+            if full_rebuild_due(uow):
+                rebuild_topn(uow)
+                rebuilt = True
+            elif inserted_ids:
+                rebuild_topn(uow, pairs=affected_pairs(uow, inserted_ids))
+                rebuilt = True
+        if rebuilt:
+            NOTICE_GENERATION.bump()
+    except Exception as e:
+        capture_unhandled_exception(index=None, phase="DB", url=None, exc=e,
+                                    extra={"step": "rebuild_topn", "notices": len(inserted_ids)})
+
+    logger.info("[NOTICE_INGEST] 종료 inserted=%s llm_calls=%s pool=%s", len(inserted_ids), llm_calls, get_pool().stats())
+
 if __name__ == "__main__":
     run_ingestion()
 
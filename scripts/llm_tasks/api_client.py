@@ -1,8 +1,19 @@
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
-from google import genai
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GEMINI_API_KEY")
-CLIENT = genai.Client(api_key=GOOGLE_API_KEY)
-MODEL_ID = "gemini-2.5-flash"
\ No newline at end of file
+MODEL_ID = "gemini-2.5-flash"
+
+@lru_cache(maxsize=1)
+def get_client():
+    # google-genai SDK 로딩과 클라이언트 생성은 첫 LLM 호출 때 (import 시점 비용 없음)
+    from google import genai
+    return genai.Client(api_key=GOOGLE_API_KEY)
+
+def __getattr__(name):
+    # 예전 코드의 `from api_client import CLIENT` 호환
+    if name == "CLIENT":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
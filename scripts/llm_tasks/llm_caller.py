@@ -1,7 +1,6 @@
-from google.genai import types
 import re, json
 from scripts.llm_tasks.prompt_template import TEST_PROMPT_KR
-from scripts.llm_tasks.api_client import CLIENT, MODEL_ID
+from scripts.llm_tasks.api_client import get_client, MODEL_ID
 from scripts.llm_tasks.exceptions import LLMCallError, LLMTimeoutError, LLMParseError
 from scripts.utils.log_utils import init_runtime_logger, capture_unhandled_exception
 
@@ -29,9 +28,13 @@ def generate_llm_response(title: str, body: str, ocr_text: str) -> dict:
         ocr_text=ocr_text or ""
     )
 
+    # SDK 는 첫 호출 때 로딩 (api_client.get_client)
+    from google.genai import types
+    client = get_client()
+
     # 교체
     try:
-        response = CLIENT.models.generate_content(
+        response = client.models.generate_content(
             model=MODEL_ID,
             contents=[prompt],
             config = types.GenerateContentConfig(
@@ -39,7 +42,7 @@ def generate_llm_response(title: str, body: str, ocr_text: str) -> dict:
              ),
         )
     except TypeError:
-        response = CLIENT.models.generate_content(  # 없으면 폴백
+        response = client.models.generate_content(  # 없으면 폴백
             model=MODEL_ID,
             contents=[prompt]
         )
@@ -0,0 +1,172 @@
+"""
+serving/callback.py
+
+카카오 스킬 콜백(useCallback) 처리. 느린 DB 조회가 스킬 제한 시간(5초)을 넘기지 않게 합니다.
+
+흐름:
+- 빠른 경로(캐시/인덱스)가 빗나가고 요청에 userRequest.callbackUrl 이 있으면
+  DB 조회 + 렌더링을 작업자 풀(CallbackDispatcher)로 넘기고 budget 초까지만 기다림
+- budget 안에 끝나면 평소처럼 바로 응답 (대부분의 요청)
+- 못 끝나면 '찾는 중' useCallback 응답을 먼저 돌려주고, 작업이 끝나면 결과를 callbackUrl 로 POST
+  (콜백 URL 은 1회용·1분 유효. 연결 오류/5xx 만 짧게 다시 시도)
+- 대기 응답과 POST 중 정확히 하나만 나가도록 작업 단위(CallbackJob) 락으로 넘김 여부를 정함
+
+사용:
+    job = dispatcher.submit(callback_url, lambda: service.render(q, service.load_page(q)))
+    payload = job.result(budget)          # ASGI: await job.result_async(budget)
+    if payload is None:                   # 넘김 → 나중에 POST
+        payload = callback_payload(WAITING_TEXT)
+"""
+
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from scripts.serving.kakao_response import dumps, text_payload
+from scripts.utils.metrics import Histogram
+from scripts.utils.retry_utils import jitter
+from scripts.utils.log_utils import init_runtime_logger
+
+if TYPE_CHECKING:
+    import requests
+
+logger = init_runtime_logger()
+
+__all__ = ["CALLBACK_SECONDS", "callback_url", "CallbackJob", "CallbackDispatcher"]
+
+ERROR_TEXT = "공지를 불러오지 못했어요. 잠시 후 다시 시도해 주세요!"
+
+CALLBACK_SECONDS = Histogram(
+    "knuchat_callback_seconds", "콜백 작업 제출 ~ 결과 POST 완료까지 걸린 시간(초)", ("result",),
+)
+
+
+def callback_url(data: dict) -> Optional[str]:
+    """콜백이 켜진 블록이면 오픈빌더가 userRequest.callbackUrl 을 실어 보냄."""
+    url = (data.get('userRequest', {}) or {}).get('callbackUrl')
+    return str(url) if url else None
+
+
+class CallbackJob:
+    __slots__ = ("dispatcher", "url", "future", "submitted", "_lock", "_finished", "_handed_off")
+
+    def __init__(self, dispatcher: "CallbackDispatcher", url: str):
+        self.dispatcher = dispatcher
+        self.url = url
+        self.future = None
+        self.submitted = time.perf_counter()
+        self._lock = threading.Lock()
+        self._finished = False
+        self._handed_off = False
+
+    # 작업자 스레드
+    def _run(self, work: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            payload = work()
+        except Exception:
+            logger.exception("[CALLBACK] job failed - url=%s", self.url)
+            payload = text_payload(ERROR_TEXT)
+        with self._lock:
+            self._finished = True
+            deliver = self._handed_off
+        if deliver:
+            self.dispatcher.deliver(self, payload)
+        return payload
+
+    def _take(self) -> Optional[Dict[str, Any]]:
+        # 요청 스레드: 끝났으면 결과, 아니면 넘김 표시 후 None
+        with self._lock:
+            if self._finished:
+                return self.future.result()
+            self._handed_off = True
+        self.dispatcher.handed_off += 1
+        return None
+
+    def result(self, budget: float) -> Optional[Dict[str, Any]]:
+        """budget 초 안에 끝나면 응답 dict, 아니면 None (결과는 나중에 callbackUrl 로)."""
+        try:
+            self.future.result(timeout=max(budget, 0.0))
+        except FutureTimeout:
+            pass
+        return self._take()
+
+    async def result_async(self, budget: float) -> Optional[Dict[str, Any]]:
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self.future)), timeout=max(budget, 0.0))
+        except asyncio.TimeoutError:
+            pass
+        return self._take()
+
+
+class CallbackDispatcher:
+    """
+    workers: 동시에 도는 콜백 작업 수 (DB 풀 크기 정도)
+    post_timeout / post_retries: 결과 POST 타임아웃(초) / 재시도 횟수
+    """
+    def __init__(self, workers: int = 4, post_timeout: float = 5.0, post_retries: int = 2,
+                 session: Optional["requests.Session"] = None):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kakao-callback")
+        self.post_timeout = float(post_timeout)
+        self.post_retries = int(post_retries)
+        self._session = session
+
+        self.submitted = 0
+        self.handed_off = 0
+        self.delivered = 0
+        self.failed = 0
+
+    @property
+    def session(self) -> "requests.Session":
+        # requests 로딩은 첫 POST(또는 serving/warmup.py) 때 — 웹 서버 import 시간을 줄이려고
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def submit(self, url: str, work: Callable[[], Dict[str, Any]]) -> CallbackJob:
+        job = CallbackJob(self, url)
+        self.submitted += 1
+        job.future = self.executor.submit(job._run, work)
+        return job
+
+    def deliver(self, job: CallbackJob, payload: Dict[str, Any]) -> bool:
+        import requests
+        body = dumps(payload)
+        for attempt in range(self.post_retries + 1):
+            try:
+                r = self.session.post(job.url, data=body, timeout=self.post_timeout,
+                                      headers={"Content-Type": "application/json"})
+                if r.status_code < 500:
+                    ok = r.status_code < 300
+                    if not ok:
+                        # 4xx: 만료/이미 쓴 URL → 다시 보내도 소용없음
+                        logger.warning("[CALLBACK] rejected - status=%s body=%s", r.status_code, r.text[:200])
+                    return self._done(job, ok)
+            except requests.RequestException as e:
+                logger.warning("[CALLBACK] post failed - attempt=%d err=%s", attempt + 1, e)
+            if attempt < self.post_retries:
+                time.sleep(jitter(0.2 * (2 ** attempt)))
+        return self._done(job, False)
+
+    def _done(self, job: CallbackJob, ok: bool) -> bool:
+        if ok:
+            self.delivered += 1
+        else:
+            self.failed += 1
+        CALLBACK_SECONDS.observe(time.perf_counter() - job.submitted, "delivered" if ok else "failed")
+        return ok
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "handed_off": self.handed_off,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "pending": self.handed_off - self.delivered - self.failed,
+        }
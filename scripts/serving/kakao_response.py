@@ -0,0 +1,145 @@
+"""
+serving/kakao_response.py
+
+카카오 i 오픈빌더 스킬 응답(JSON) 빌더입니다.
+Flask(app.py)와 ASGI(asgi_app.py) 양쪽이 같은 dict 를 만들도록 여기서만 조립합니다.
+
+- text_payload: simpleText 응답 (texts_payload: 말풍선 여러 개, 최대 3)
+- carousel_payload: itemCard/textCard 캐러셀 응답 (+ 바로가기 quickReplies)
+- text_card / message_quick_reply: textCard 한 장 / 발화 바로가기
+- build_notice_card: 공지 행(notice_query 행 모양) → itemCard
+- more_quick_reply: '더 보기' 바로가기 (커서는 블록 extra 로만 — 사용자 말풍선에는 '더 보기' 만 보임)
+- callback_payload: useCallback 즉시 응답 (최종 응답은 나중에 userRequest.callbackUrl 로 POST)
+- dumps: Flask jsonify 와 같은 바이트(ASCII 이스케이프, 키 정렬, 압축 구분자, 끝 개행)
+"""
+
+from __future__ import annotations
+import json
+from typing import Any, Dict, List, Optional
+
+__all__ = [
+    "DEFAULT_IMAGE", "MORE_TEXT", "MORE_PREFIX",
+    "text_payload", "texts_payload", "carousel_payload", "text_card",
+    "build_notice_card", "more_quick_reply", "message_quick_reply", "callback_payload", "dumps",
+]
+
+DEFAULT_IMAGE = "https://kchatsotrage.blob.core.windows.net/images/default.png"
+MORE_TEXT = "더 보기"  # '더 보기' 바로가기가 보내는 발화 (블록 ID 미설정 시 커서는 서버가 사용자별로 보관)
+MORE_PREFIX = "더보기 "  # 예전 바로가기가 발화에 커서를 붙여 보내던 접두어 (이미 나간 응답 호환용으로만 읽음)
+
+# 오픈빌더 제한
+MAX_OUTPUTS = 3
+SIMPLE_TEXT_MAX = 1000
+CAROUSEL_TEXT_CARD_DESC_MAX = 230
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def text_payload(text: str) -> Dict[str, Any]:
+    return {
+        "version": "2.0",
+        "template": {
+            "outputs": [
+                {
+                    "simpleText": {
+                        "text": text
+                    }
+                }
+            ]
+        }
+    }
+
+
+def texts_payload(texts: List[str], quick_replies: Optional[List[dict]] = None) -> Dict[str, Any]:
+    template: Dict[str, Any] = {
+        "outputs": [{"simpleText": {"text": _clip(t, SIMPLE_TEXT_MAX)}} for t in texts[:MAX_OUTPUTS]]
+    }
+    if quick_replies:
+        template["quickReplies"] = quick_replies
+    return {
+        "version": "2.0",
+        "template": template
+    }
+
+
+def carousel_payload(cards: List[dict], quick_replies: Optional[List[dict]] = None,
+                     card_type: str = "itemCard") -> Dict[str, Any]:
+    template: Dict[str, Any] = {
+        "outputs": [
+            {
+                "carousel": {
+                    "type": card_type,
+                    "items": cards
+                }
+            }
+        ]
+    }
+    if quick_replies:
+        template["quickReplies"] = quick_replies
+    return {
+        "version": "2.0",
+        "template": template
+    }
+
+
+def build_notice_card(row: tuple) -> Dict[str, Any]:
+    # 행: notice_query.fetch_notice_rows 모양. 10번째 열(thumbnail_url, migrations/0003)이 있으면 카드에는 썸네일
+    notice_id, title, deadline, one_line, topic_val, created_at, link_url, file_url, departments = row[:9]
+    thumbnail_url = row[9] if len(row) > 9 else None
+    image_url = file_url if (file_url and str(file_url).startswith("http")) else DEFAULT_IMAGE
+    thumb_url = thumbnail_url if (thumbnail_url and str(thumbnail_url).startswith("http")) else image_url
+    deadline_text = deadline.strftime('%Y-%m-%d') if deadline else '정보 없음'
+    return {
+        "imageTitle": {
+            "title": title[:40],
+            "description": f"마감 {deadline_text}"
+        },
+        "thumbnail": {
+            "imageUrl": thumb_url,       # 썸네일 표시용 (카드 크기로 줄인 것)
+            "link": { "web": image_url } # 이미지 클릭 시 원본 열기
+        },
+        "itemList": [
+            { "title": "요약", "description": (one_line or "요약 없음")[:100] }
+        ],
+        "itemListAlignment": "left",
+        "buttons": [
+            { "action": "webLink", "label": "자세히 보기", "webLinkUrl": link_url }  # 사이트 URL
+        ]
+    }
+
+
+def text_card(title: str, description: str, buttons: Optional[List[dict]] = None) -> Dict[str, Any]:
+    card: Dict[str, Any] = {
+        "title": title[:50],
+        "description": _clip(description, CAROUSEL_TEXT_CARD_DESC_MAX),
+    }
+    if buttons:
+        card["buttons"] = buttons
+    return card
+
+
+def message_quick_reply(label: str, message_text: Optional[str] = None) -> Dict[str, Any]:
+    return {"label": label, "action": "message", "messageText": message_text or label}
+
+
+def more_quick_reply(token: str, block_id: str = "") -> Dict[str, Any]:
+    # 블록 ID가 있으면 extra 로 커서를 넘기고(clientExtra), 없으면 '더 보기' 발화만
+    # (그때 커서는 호출 쪽이 사용자 ID 로 보관 — message_service.MessageService.render)
+    if block_id:
+        return {
+            "label": MORE_TEXT, "action": "block", "messageText": MORE_TEXT,
+            "blockId": block_id, "extra": {"cursor": token}
+        }
+    return message_quick_reply(MORE_TEXT)
+
+
+def callback_payload(text: str) -> Dict[str, Any]:
+    """콜백 블록의 대기 응답. data.text 는 최종 응답 전까지 보이는 문구."""
+    return {"version": "2.0", "useCallback": True, "data": {"text": text}}
+
+
+def dumps(payload: Dict[str, Any]) -> bytes:
+    """Flask 2.2 jsonify(비디버그)와 같은 직렬화."""
+    return (json.dumps(payload, ensure_ascii=True, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
@@ -0,0 +1,270 @@
+"""
+serving/menu_index.py
+
+학식 스킬(/menu)이 쿼리 없이 답할 수 있도록 dbo.cafeteria_menu 의 이번 주(+다음 주)를
+메모리에 올려 두고, 카카오 응답을 날짜별로 미리 만들어 두는 인덱스입니다.
+
+구조:
+- meals[(service_date, restaurant, meal_type)] = [(menu_group, menu), ...]
+- day_replies[(service_date, restaurant|None, meal_type|None)]  = 카카오 응답 dict
+- week_replies[(week_start, restaurant|None, meal_type|None)]   = 카카오 응답 dict
+  (None = 전체 식당 / 전체 끼니)
+→ 응답은 dict 조회 한 번
+
+갱신:
+- 적재 범위: 오늘이 속한 주 월요일 ~ 다음 주 일요일 (토/일에 '내일', 다음 주 식단도 답하도록)
+- 식단 수집(menu_ingest_pipeline)이 MENU_GENERATION 을 올리거나, 주가 바뀌었을 때만 다시 적재
+- 적재(menu_repo.replace_menu_range)가 (식당, 식단, 끼니, 날짜) 를 한 행으로 맞추지만, 0004 이전 행이 남아 있어도 마지막 행(가장 큰 id)만 씀
+"""
+
+from __future__ import annotations
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from scripts.serving.kakao_response import (
+    texts_payload, carousel_payload, text_card, message_quick_reply,
+)
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+__all__ = ["WEEKDAYS", "week_start", "meal_rank", "MenuIndex"]
+
+WEEKDAYS = "월화수목금토일"
+
+_MENU_SQL = """
+SELECT restaurant, menu_group, meal_type, service_date, menu
+FROM dbo.cafeteria_menu
+WHERE service_date BETWEEN ? AND ?
+ORDER BY id
+"""
+
+# 끼니 표시 순서 (사이트 표기가 '조식/중식/석식' 이든 '아침/점심/저녁' 이든)
+_MEAL_ORDER = {"아침": 0, "조식": 0, "점심": 1, "중식": 1, "저녁": 2, "석식": 2}
+
+NO_MENU_TEXT = "등록된 식단 정보가 없어요."
+
+MenuKey = Tuple[date, Optional[str], Optional[str]]
+
+
+def week_start(d: date) -> date:
+    """d 가 속한 주의 월요일."""
+    return d - timedelta(days=d.weekday())
+
+
+def meal_rank(meal_type: str) -> tuple:
+    return (_MEAL_ORDER.get(meal_type, 9), meal_type)
+
+
+def _day_label(d: date) -> str:
+    return f"{d.month}/{d.day}({WEEKDAYS[d.weekday()]})"
+
+
+def _as_date(v) -> date:
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    return date.fromisoformat(str(v)[:10])
+
+
+class _Snapshot:
+    __slots__ = ("week", "restaurants", "meal_types", "meals", "day_replies", "week_replies")
+
+    def __init__(self, week: date, restaurants: List[str], meal_types: List[str],
+                 meals: Dict[Tuple[date, str, str], List[Tuple[str, str]]]):
+        self.week = week
+        self.restaurants = restaurants
+        self.meal_types = meal_types
+        self.meals = meals
+        self.day_replies: Dict[MenuKey, dict] = {}
+        self.week_replies: Dict[MenuKey, dict] = {}
+
+
+class MenuIndex:
+    """
+    사용:
+        index = MenuIndex(pool.connection)
+        index.load()
+        reply = index.day_reply(date(2025, 9, 1), "천지관", None)   # 준비 전이면 None
+    """
+    def __init__(self, connection_factory: Callable, generation_source: Optional[Callable[[], int]] = None,
+                 today_fn: Callable[[], date] = date.today, refresh_interval: float = 60.0):
+        self.connection_factory = connection_factory  # with connection_factory() as conn:
+        self.generation_source = generation_source
+        self.today_fn = today_fn
+        self.refresh_interval = float(refresh_interval)
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._generation = None
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.lookups = 0
+        self.loads = 0
+
+    # ---------- 상태 ----------
+    def is_stale(self, today: Optional[date] = None) -> bool:
+        snap = self._snapshot
+        if snap is None or snap.week != week_start(today or self.today_fn()):
+            return True
+        return self.generation_source is not None and self.generation_source() != self._generation
+
+    @property
+    def restaurants(self) -> List[str]:
+        snap = self._snapshot
+        return snap.restaurants if snap else []
+
+    @property
+    def meal_types(self) -> List[str]:
+        snap = self._snapshot
+        return snap.meal_types if snap else []
+
+    # ---------- 적재 ----------
+    def _fetch(self, start: date, end: date) -> Dict[Tuple[date, str, str, str], str]:
+        latest: Dict[Tuple[date, str, str, str], str] = {}
+        with self.connection_factory() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(_MENU_SQL, start, end)
+                for restaurant, menu_group, meal_type, service_date, menu in cur.fetchall():
+                    if not restaurant or not menu:
+                        continue
+                    key = (_as_date(service_date), sys.intern(restaurant),
+                           sys.intern(meal_type or ""), menu_group or "")
+                    latest[key] = menu
+            finally:
+                cur.close()
+        return latest
+
+    def load(self) -> None:
+        """이번 주 + 다음 주 식단을 읽어 응답까지 미리 만든 뒤 스냅샷 교체."""
+        with self._write_lock:
+            today = self.today_fn()
+            gen = self.generation_source() if self.generation_source else None
+            week = week_start(today)
+            latest = self._fetch(week, week + timedelta(days=13))
+
+            restaurants: Dict[str, None] = {}
+            meal_types: Dict[str, None] = {}
+            meals: Dict[Tuple[date, str, str], List[Tuple[str, str]]] = {}
+            for (d, restaurant, meal_type, menu_group), menu in sorted(latest.items()):
+                restaurants.setdefault(restaurant)
+                meal_types.setdefault(meal_type)
+                meals.setdefault((d, restaurant, meal_type), []).append((menu_group, menu))
+
+            snap = _Snapshot(week, list(restaurants), sorted(meal_types, key=meal_rank), meals)
+            self._prerender(snap)
+            self._snapshot = snap
+            self._generation = gen
+            self.loads += 1
+            logger.info("[MENU_INDEX] loaded - week=%s rows=%d replies=%d",
+                        week, len(latest), len(snap.day_replies) + len(snap.week_replies))
+
+    def ensure_fresh(self) -> None:
+        if self.is_stale():
+            self.load()
+
+    # ---------- 미리 만든 응답 ----------
+    @staticmethod
+    def _lines(snap: _Snapshot, d: date, restaurant: str, meal_type: Optional[str]) -> List[str]:
+        lines = []
+        for mt in snap.meal_types:
+            if meal_type is not None and mt != meal_type:
+                continue
+            for menu_group, menu in snap.meals.get((d, restaurant, mt), ()):
+                label = " ".join(x for x in (mt, menu_group) if x)
+                lines.append(f"[{label}] {menu}" if label else menu)
+        return lines
+
+    def _prerender(self, snap: _Snapshot) -> None:
+        quick = [message_quick_reply(x) for x in ("오늘 학식", "내일 학식", "이번주 학식")]
+        days = [snap.week + timedelta(days=i) for i in range(14)]
+        restaurant_opts: List[Optional[str]] = [None] + snap.restaurants
+        meal_opts: List[Optional[str]] = [None] + snap.meal_types
+
+        for restaurant in restaurant_opts:
+            targets = snap.restaurants if restaurant is None else [restaurant]
+            for meal_type in meal_opts:
+                # 하루: 식당별 말풍선 (최대 3개)
+                for d in days:
+                    texts = []
+                    for r in targets:
+                        lines = self._lines(snap, d, r, meal_type)
+                        if lines:
+                            texts.append(f"🍚 {r} {_day_label(d)}\n" + "\n".join(lines))
+                    if texts:
+                        snap.day_replies[(d, restaurant, meal_type)] = texts_payload(texts, quick)
+
+                # 한 주: 요일별 카드, 잘리면 '이 날 전체 보기' 로 하루 응답
+                for week in (snap.week, snap.week + timedelta(days=7)):
+                    cards = []
+                    for d in (week + timedelta(days=i) for i in range(7)):
+                        blocks = []
+                        for r in targets:
+                            lines = self._lines(snap, d, r, meal_type)
+                            if lines:
+                                blocks.append(f"<{r}>\n" + "\n".join(lines))
+                        if not blocks:
+                            continue
+                        ask = " ".join(x for x in (f"{d.month}/{d.day}", restaurant, meal_type, "학식") if x)
+                        cards.append(text_card(_day_label(d), "\n".join(blocks),
+                                               [message_quick_reply("이 날 전체 보기", ask)]))
+                    if cards:
+                        snap.week_replies[(week, restaurant, meal_type)] = carousel_payload(cards, quick, card_type="textCard")
+
+    # ---------- 조회 ----------
+    def day_reply(self, d: date, restaurant: Optional[str] = None,
+                  meal_type: Optional[str] = None) -> Optional[dict]:
+        """스냅샷이 없거나 오래됐으면 None (호출 쪽에서 load 후 다시). 식단이 없으면 안내 문구."""
+        if self.is_stale():
+            return None
+        snap = self._snapshot
+        self.lookups += 1
+        return snap.day_replies.get((d, restaurant, meal_type)) or texts_payload(
+            [" ".join(x for x in (_day_label(d), restaurant, meal_type, NO_MENU_TEXT) if x)])
+
+    def week_reply(self, week: date, restaurant: Optional[str] = None,
+                   meal_type: Optional[str] = None) -> Optional[dict]:
+        """week: 그 주 월요일."""
+        if self.is_stale():
+            return None
+        snap = self._snapshot
+        self.lookups += 1
+        return snap.week_replies.get((week, restaurant, meal_type)) or texts_payload(
+            [" ".join(x for x in (f"{_day_label(week)} 주간", restaurant, meal_type, NO_MENU_TEXT) if x)])
+
+    # ---------- 백그라운드 갱신 ----------
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.ensure_fresh()
+            except Exception:
+                logger.exception("[MENU_INDEX] load failed (요청 시 다시 시도)")
+            self._stop.wait(self.refresh_interval)
+
+    def start_background_refresh(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="menu-index-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, object]:
+        snap = self._snapshot
+        return {
+            "ready": snap is not None,
+            "week": snap.week.isoformat() if snap else None,
+            "restaurants": snap.restaurants if snap else [],
+            "meal_types": snap.meal_types if snap else [],
+            "day_replies": len(snap.day_replies) if snap else 0,
+            "week_replies": len(snap.week_replies) if snap else 0,
+            "generation": self._generation,
+            "lookups": self.lookups,
+            "loads": self.loads,
+        }
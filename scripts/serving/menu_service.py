@@ -0,0 +1,170 @@
+"""
+serving/menu_service.py
+
+학식 스킬(/menu) 처리 로직. Flask(app.py)와 ASGI(asgi_app.py)가 같은 객체를 씁니다.
+
+"오늘 학식", "내일 천지관 점심", "이번주 백록관", "9/3 크누테리아" 같은 발화(또는 스킬 파라미터
+date / restaurant / meal_type)를 MenuQuery 로 해석하고, serving/menu_index.py 가 미리 만들어 둔
+응답을 그대로 돌려줍니다.
+
+흐름 (message_service 와 같은 모양):
+    parse(data)      → MenuQuery
+    cached_reply(q)  → 스냅샷에서 바로 (I/O 없음, 스냅샷이 오래됐으면 None)
+    load_reply(q)    → 스냅샷 다시 적재 후 응답 (블로킹)
+"""
+
+from __future__ import annotations
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from configs.serving_config import ServingConfig, get_serving_config
+from scripts.utils.cache_utils import MENU_GENERATION
+from scripts.serving.menu_index import WEEKDAYS, MenuIndex, week_start
+from scripts.utils.metrics import NULL_TIMER
+
+__all__ = ["MenuQuery", "MenuService", "create_menu_service"]
+
+_RELATIVE_DAYS = {"그제": -2, "어제": -1, "오늘": 0, "금일": 0, "내일": 1, "낼": 1, "모레": 2}
+_WEEK_WORDS = ("이번주", "금주", "주간", "일주일")
+_NEXT_WEEK_WORDS = ("다음주", "차주")
+_MONTH_DAY = re.compile(r"(\d{1,2})\s*[/.월]\s*(\d{1,2})")
+_WEEKDAY = re.compile(rf"([{WEEKDAYS}])요일")
+
+# 사용자가 쓰는 끼니 표현 → 같은 끼니로 보는 표기들
+_MEAL_SYNONYMS = [
+    ("아침", "조식", "모닝"),
+    ("점심", "중식", "런치"),
+    ("저녁", "석식", "디너"),
+]
+
+
+@dataclass(frozen=True)
+class MenuQuery:
+    start: date                 # 하루 질의면 그 날, 주간 질의면 그 주 월요일
+    week: bool = False
+    restaurant: Optional[str] = None
+    meal_type: Optional[str] = None
+
+
+def _param_text(value: Any) -> str:
+    """오픈빌더 파라미터는 문자열 또는 sys.date 처럼 JSON 문자열({"value": ...})로 옴."""
+    if isinstance(value, dict):
+        return str(value.get("value") or value.get("date") or "")
+    text = str(value or "")
+    if text.startswith("{"):
+        try:
+            return _param_text(json.loads(text))
+        except ValueError:
+            pass
+    return text
+
+
+class MenuService:
+    def __init__(self, index: MenuIndex, today_fn: Callable[[], date]):
+        self.index = index
+        self.today_fn = today_fn
+
+    # ---------- 1) 요청 해석 ----------
+    def _match_restaurant(self, text: str) -> Optional[str]:
+        for name in self.index.restaurants:
+            if name.replace(" ", "") in text:
+                return name
+        return None
+
+    def _match_meal(self, text: str) -> Optional[str]:
+        known = self.index.meal_types
+        for synonyms in _MEAL_SYNONYMS:
+            if any(s in text for s in synonyms):
+                for mt in known:
+                    if mt in synonyms:
+                        return mt
+        for mt in known:
+            if mt and mt in text:
+                return mt
+        return None
+
+    def parse(self, data: dict) -> MenuQuery:
+        params = data.get('action', {}).get('params', {}) or {}
+        utterance = (data.get('userRequest', {}).get('utterance') or '')
+        text = " ".join([utterance] + [_param_text(v) for v in params.values()]).replace(" ", "")
+        today = self.today_fn()
+
+        # 날짜: ISO(sys.date) > M/D > 요일(이번 주) > 오늘/내일 > 주간 > 기본 오늘
+        day: Optional[date] = None
+        iso = re.search(r"(\d{4})-(\d{2})-(\d{2})", text)
+        md = _MONTH_DAY.search(text)
+        wd = _WEEKDAY.search(text)
+        if iso:
+            day = date(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)))
+        elif md:
+            try:
+                day = date(today.year, int(md.group(1)), int(md.group(2)))
+            except ValueError:
+                day = None
+        elif wd:
+            base = week_start(today) + (timedelta(days=7) if any(w in text for w in _NEXT_WEEK_WORDS) else timedelta())
+            day = base + timedelta(days=WEEKDAYS.index(wd.group(1)))
+        else:
+            for word, offset in _RELATIVE_DAYS.items():
+                if word in text:
+                    day = today + timedelta(days=offset)
+                    break
+
+        restaurant = self._match_restaurant(text)
+        meal_type = self._match_meal(text)
+        if day is None and any(w in text for w in _NEXT_WEEK_WORDS):
+            return MenuQuery(week_start(today) + timedelta(days=7), True, restaurant, meal_type)
+        if day is None and any(w in text for w in _WEEK_WORDS):
+            return MenuQuery(week_start(today), True, restaurant, meal_type)
+        return MenuQuery(day or today, False, restaurant, meal_type)
+
+    # ---------- 2) 빠른 경로 ----------
+    def cached_reply(self, q: MenuQuery) -> Optional[Dict[str, Any]]:
+        if q.week:
+            return self.index.week_reply(q.start, q.restaurant, q.meal_type)
+        return self.index.day_reply(q.start, q.restaurant, q.meal_type)
+
+    # ---------- 3) 적재 경로 (블로킹) ----------
+    def load_reply(self, q: MenuQuery) -> Dict[str, Any]:
+        self.index.ensure_fresh()
+        return self.cached_reply(q)
+
+    def handle(self, data: dict, timer=NULL_TIMER) -> Dict[str, Any]:
+        timer.label(topic="menu", sort="-")
+        if self.index.is_stale():
+            # 식당/끼니 이름은 스냅샷에서 오므로 해석 전에 적재
+            with timer.stage("menu_load"):
+                self.index.ensure_fresh()
+        with timer.stage("utterance_parse"):
+            q = self.parse(data)
+        with timer.stage("menu_lookup"):
+            reply = self.cached_reply(q)
+        if reply is not None:
+            timer.label(outcome="snapshot")
+            return reply
+        with timer.stage("menu_load"):
+            reply = self.load_reply(q)
+        timer.label(outcome="load")
+        return reply
+
+    def stats(self) -> Dict[str, Any]:
+        return self.index.stats()
+
+
+def create_menu_service(connection_factory: Callable, today_fn: Callable[[], date],
+                        config: Optional[ServingConfig] = None,
+                        start_background: bool = True) -> MenuService:
+    """connection_factory: with connection_factory() as conn: (보통 /message 와 같은 풀의 pool.connection)"""
+    config = config or get_serving_config()
+    index = MenuIndex(
+        connection_factory,
+        generation_source=MENU_GENERATION.current,
+        today_fn=today_fn,
+        refresh_interval=config.menu_refresh_interval,
+    )
+    if start_background:
+        index.start_background_refresh()
+    return MenuService(index, today_fn)
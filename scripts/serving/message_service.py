@@ -0,0 +1,481 @@
+"""
+serving/message_service.py
+
+/message 스킬 처리 로직. Flask(app.py)와 ASGI(asgi_app.py)가 같은 객체를 씁니다.
+
+흐름:
+    parse(data)        → MessageQuery (또는 바로 돌려줄 응답 dict), 학과/주제는 resolver 로 허용 값 해석
+                         쉼표 없는 발화('해커톤', '토익 지원금')는 SearchQuery
+    search(q)          → 자유 검색 (serving/search_index.py, I/O 없음)
+    cached_page(q)     → 결과 캐시 / 메모리 인덱스 (I/O 없음)
+                         인덱스가 현재 세대를 아직 못 읽었으면 인덱스 결과는 캐시에 넣지 않음
+                         캐시 항목은 카드 중 가장 이른 마감일이 지나는 KST 자정 또는 새 공지 수집 때 만료
+                         (키에 날짜가 없어 오늘 마감 카드가 없는 조합은 자정을 넘겨서도 씀)
+                         자정 직후 인기 조합은 serving/prewarm.py 가 미리 다시 채움
+    load_page(q)       → DB 조회 (블로킹, 비동기 서버는 load_page_async 로 스레드에 넘김)
+                         같은 조건으로 동시에 온 요청은 한 번만 조회하고 결과를 나눠 받음 (utils/singleflight.py)
+                         해석된 조합이면 미리 채운 상위 N건(dbo.notice_topn) PK 조회, 안 되면 기존 쿼리
+    render(q, page)    → 카카오 응답 dict
+                         '더 보기' 커서는 블록 extra 로 넘기거나(KAKAO_MORE_BLOCK_ID), 없으면 사용자 ID 별로
+                         서버에 보관하고 바로가기는 '더 보기' 발화만 보냄 (말풍선에 토큰이 보이지 않도록)
+                         서버 보관은 워커 메모리라 워커가 여럿(WEB_CONCURRENCY > 1)이면 블록 ID 없이는 '더 보기' 없음
+    callback_job(...)  → callbackUrl 이 있으면 load_page + render 를 콜백 작업자로 (serving/callback.py)
+                         budget 안에 못 끝나면 waiting() 응답 후 결과는 callbackUrl 로 POST
+handle(data) 는 위 단계를 동기로 이어 붙인 것.
+각 단계는 timer(utils.metrics.StageTimer)를 받아 구간 시간과 topic/sort/outcome 라벨을 남김
+(serving/observability.py 가 히스토그램으로 모음).
+"""
+
+from __future__ import annotations
+import asyncio
+import os
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from configs.db_config import DB_POOL_CONFIG, DB_BACKEND
+from configs.serving_config import ServingConfig, get_serving_config
+from scripts.utils.db_pool import ConnectionPool, PoolTimeoutError
+from scripts.utils.cache_utils import TTLCache, DemandCounter, NOTICE_GENERATION, KST, deadline_expiry
+from scripts.serving.notice_query import fetch_notice_rows, fetch_topn_rows
+from scripts.utils.metrics import NULL_TIMER
+from scripts.utils.sql_dialect import SQLITE, missing_object_errors
+from scripts.utils.singleflight import SingleFlight
+from scripts.utils.log_utils import init_runtime_logger
+from scripts.serving.notice_index import NoticeIndex
+from scripts.serving.notice_snapshot import SharedNoticeIndex
+from scripts.serving.search_index import SearchIndex
+from scripts.serving.callback import CallbackDispatcher, CallbackJob, callback_url
+from scripts.serving.prewarm import MidnightPrewarmer
+from scripts.serving.resolver import Resolver, default_resolver
+from scripts.serving.pagination import PAGE_SIZE, PageCursor, cursor_after, encode_cursor, decode_cursor, sort_family
+from scripts.serving.kakao_response import (
+    MORE_TEXT, MORE_PREFIX, text_payload, carousel_payload, build_notice_card, more_quick_reply, callback_payload,
+)
+
+logger = init_runtime_logger()
+
+__all__ = ["get_db_connection", "MessageQuery", "SearchQuery", "MessageService", "create_message_service"]
+
+BUSY_TEXT = "지금 요청이 많아 답변이 늦어지고 있어요. 잠시 후 다시 시도해 주세요!"
+WAITING_TEXT = "공지를 찾는 중이에요. 잠시만 기다려 주세요!"
+EXPIRED_TEXT = "이전 검색 정보가 만료되었어요. '주제, 학과' 형식으로 다시 검색해 주세요!"
+FORMAT_TEXT = "방금 하신 말씀을 잘 이해하지 못했어요.\n'주제, 학과' 형식으로 알려주셔야 가장 정확하게 찾아드릴 수 있어요!"
+
+Page = Tuple[List[dict], Optional[str]]  # (cards, 다음 페이지 커서 토큰)
+
+MORE_CURSOR_TTL = 1800.0  # 초, 블록 ID 없이 서버에 보관한 '더 보기' 커서 유효 시간
+
+
+def get_db_connection():
+    if DB_BACKEND == SQLITE:
+        # 로컬 벤치마크/부하 테스트: 수집 파이프라인과 같은 SQLite 파일 (utils/sqlite_backend.py)
+        from scripts.utils import sqlite_backend
+        return sqlite_backend.connect()
+    import pyodbc  # utils/db_utils.get_connection 과 같이 MSSQL 일 때만
+    return pyodbc.connect(
+        f"DRIVER={{ODBC Driver 18 for SQL Server}};"
+        f"SERVER={os.getenv('DB_SERVER')};"
+        f"DATABASE={os.getenv('DB_NAME')};"
+        f"UID={os.getenv('DB_USER')};"
+        f"PWD={os.getenv('DB_PASSWORD')};"
+        f"Encrypt=no;"
+    )
+
+
+@dataclass(frozen=True)
+class MessageQuery:
+    topic: str
+    department: str
+    sort_option: Optional[str]
+    today: date
+    after: Optional[PageCursor] = None
+    cursor_token: Optional[str] = None
+    # 해석기가 찾은 허용 값(정규화 키). 비어 있으면 topic/department 접두 일치로 폴백
+    topic_norms: Tuple[str, ...] = ()
+    department_norms: Tuple[str, ...] = ()
+    user_key: Optional[str] = None  # 카카오 userRequest.user.id ('더 보기' 커서 보관용, 캐시 키에는 안 넣음)
+
+    @property
+    def topic_label(self) -> str:
+        # 메트릭 라벨: 사용자 입력을 그대로 쓰면 라벨 종류가 끝없이 늘어나므로 허용 값만
+        if len(self.topic_norms) == 1:
+            return self.topic_norms[0]
+        return "multi" if self.topic_norms else "unresolved"
+
+    @property
+    def cache_key(self) -> tuple:
+        # '컴공' 과 '컴퓨터공학과' 처럼 같은 학과로 해석되는 입력은 캐시를 같이 씀
+        # 날짜는 넣지 않음: 날이 바뀌면 마감 지난 카드가 빠질 뿐이라 그 전까지는 같은 결과
+        # (만료 시각은 MessageService._cache_page 가 카드 마감일로 계산)
+        return (self.topic_norms or self.topic, self.department_norms or self.department,
+                self.sort_option, self.cursor_token or "")
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    text: str
+    today: date
+
+
+def extract_more_cursor(data: dict) -> Optional[str]:
+    """'더 보기' 블록(clientExtra) 또는 예전 발화 바로가기에서 온 요청이면 커서 토큰, 아니면 None"""
+    extra = data.get('action', {}).get('clientExtra') or {}
+    if extra.get('cursor'):
+        return str(extra['cursor'])
+    utterance = (data.get('userRequest', {}).get('utterance') or '').strip()
+    if utterance.startswith(MORE_PREFIX):
+        return utterance[len(MORE_PREFIX):].strip() or None
+    return None
+
+
+def is_more_utterance(data: dict) -> bool:
+    """블록 ID 없이 보낸 '더 보기' 바로가기 발화인지 (띄어쓰기 무시)"""
+    utterance = (data.get('userRequest', {}).get('utterance') or '').replace(' ', '')
+    return utterance == MORE_TEXT.replace(' ', '')
+
+
+def user_key(data: dict) -> Optional[str]:
+    user_id = (data.get('userRequest', {}).get('user') or {}).get('id')
+    return str(user_id) if user_id else None
+
+
+class MessageService:
+    def __init__(self, pool: ConnectionPool, cache: TTLCache, index: Union[NoticeIndex, SharedNoticeIndex],
+                 config: ServingConfig,
+                 resolver: Optional[Resolver] = None, search_index: Optional[SearchIndex] = None,
+                 callbacks: Optional[CallbackDispatcher] = None):
+        self.pool = pool
+        self.cache = cache
+        self.index = index
+        self.config = config
+        self.resolver = resolver or default_resolver()
+        self.search_index = search_index
+        self.callbacks = callbacks
+        self.topn_enabled = config.topn_enabled
+        # 조합별 조회 횟수 (자정에 다시 채울 대상)
+        self.demand = DemandCounter(max_keys=4 * config.result_cache_size)
+        self.prewarmer: Optional[MidnightPrewarmer] = None
+        # 같은 조건의 DB 조회가 진행 중이면 새로 돌리지 않고 그 결과를 기다림
+        self.flights = SingleFlight() if config.singleflight_enabled else None
+        # 블록 ID 가 없을 때 사용자별 마지막 '더 보기' 커서 (카카오는 마지막 응답의 바로가기만 보여줌)
+        # 프로세스 메모리라 워커가 여럿이면 '더 보기' 요청이 다른 워커로 가 만료 안내가 됨 → 그때는 바로가기를 안 냄
+        self.more_cursors = TTLCache(max_entries=4 * config.result_cache_size, ttl=MORE_CURSOR_TTL,
+                                     expire_at_midnight=False)
+        self.more_enabled = bool(config.kakao_more_block_id) or config.web_workers <= 1
+
+    @staticmethod
+    def today() -> date:
+        return datetime.now(KST).date()  # 캐시 만료(KST 자정)와 같은 기준의 날짜
+
+    # ---------- 1) 요청 해석 ----------
+    def parse(self, data: dict, timer=NULL_TIMER) -> Union[MessageQuery, SearchQuery, Dict[str, Any]]:
+        with timer.stage("utterance_parse"):
+            q = self._parse(data)
+        if isinstance(q, MessageQuery):
+            timer.label(topic=q.topic_label, sort=sort_family(q.sort_option))
+        elif isinstance(q, SearchQuery):
+            timer.label(topic="search", sort="score")
+        else:
+            timer.label(outcome="text")
+        return q
+
+    def _parse(self, data: dict) -> Union[MessageQuery, SearchQuery, Dict[str, Any]]:
+        after = None
+        user = user_key(data)
+        cursor_token = extract_more_cursor(data)
+        if cursor_token is None and is_more_utterance(data):
+            cursor_token = self.more_cursors.get(user) if user else None
+            if cursor_token is None:
+                return text_payload(EXPIRED_TEXT)
+        if cursor_token:
+            # '더 보기': 커서에 담긴 조건 그대로 다음 페이지
+            after = decode_cursor(cursor_token)
+            if after is None:
+                return text_payload(EXPIRED_TEXT)
+            topic, department, sort_option = after.topic, after.department, after.sort_option
+        else:
+            skill_data = data.get('skillData', {})
+            topic = skill_data.get('topic')
+            department = skill_data.get('department')
+            sort_option = skill_data.get('sort')
+
+            if not topic or not department:
+                utterance = (
+                    data.get('userRequest', {}).get('utterance')
+                    or data.get('action', {}).get('params', {}).get('utterance', '')
+                ).strip()
+
+                parts = [s.strip() for s in utterance.split(',')]
+                if len(parts) < 2:
+                    if self.search_index is not None and utterance:
+                        return SearchQuery(utterance, self.today())
+                    return text_payload(FORMAT_TEXT)
+
+                topic = parts[0]
+                department = parts[1]
+                sort_option = parts[2] if len(parts) >= 3 else '마감순'
+
+        # 전처리
+        topic = topic.replace(' ', '').lower()
+        department = department.replace(' ', '').lower()
+        topic_norms = tuple(c.norm for c in self.resolver.topics(topic))
+        department_norms = tuple(c.norm for c in self.resolver.departments(department))
+        return MessageQuery(topic, department, sort_option, self.today(), after, cursor_token,
+                            topic_norms, department_norms, user)
+
+    # ---------- 2) 자유 검색 (I/O 없음) ----------
+    def search(self, q: SearchQuery, timer=NULL_TIMER) -> Dict[str, Any]:
+        """검색어 n-gram BM25 상위 PAGE_SIZE 건. 색인 준비 전이면 형식 안내."""
+        with timer.stage("search_lookup"):
+            rows = self.search_index.search(q.text, q.today, limit=PAGE_SIZE)
+        if rows is None:
+            timer.label(outcome="text")
+            return text_payload(FORMAT_TEXT)
+        timer.label(outcome="search")
+        if not rows:
+            return text_payload(f"'{q.text}' 관련 공지를 찾지 못했어요.\n'주제, 학과' 형식으로도 찾아보세요!")
+        with timer.stage("card_render"):
+            cards = [build_notice_card(row) for row in rows]
+        return carousel_payload(cards)
+
+    # ---------- 3) 빠른 경로 (I/O 없음) ----------
+    def cached_page(self, q: MessageQuery, timer=NULL_TIMER) -> Optional[Page]:
+        self.demand.note(q.cache_key, q)
+        with timer.stage("cache_lookup"):
+            page = self.cache.get(q.cache_key)
+        if page is not None:
+            timer.label(outcome="cache")
+            return page
+        if self.config.notice_index_enabled:
+            # 한 건 더 가져와서 다음 페이지 유무만 판단
+            with timer.stage("index_lookup"):
+                rows = self.index.lookup(q.topic, q.department, q.sort_option, q.today,
+                                         limit=PAGE_SIZE + 1, after=q.after,
+                                         department_norms=q.department_norms, topic_norms=q.topic_norms)
+            if rows is not None:
+                if self._index_current():
+                    page = self._cache_page(q, rows, timer)
+                else:
+                    # 인덱스가 아직 새 세대를 반영하기 전: 이번 응답에만 쓰고 캐시에는 남기지 않음
+                    # (남기면 새 세대 캐시에 예전 카드가 TTL 내내 남음)
+                    page = self._to_page(q, rows, timer)
+                timer.label(outcome="index")
+                return page
+        return None
+
+    def _index_current(self) -> bool:
+        """인덱스가 결과 캐시와 같은 세대를 반영했는지 (파일 스냅샷은 캐시가 그 세대를 따르므로 항상 True)"""
+        source = self.cache.generation_source
+        return source is None or self.index.generation() == source()
+
+    # ---------- 4) DB 경로 (블로킹) ----------
+    def _topn_rows(self, conn, q: MessageQuery, timer=NULL_TIMER) -> Optional[List[tuple]]:
+        if not (self.topn_enabled and q.topic_norms and q.department_norms):
+            return None
+        try:
+            return fetch_topn_rows(conn, q.topic_norms, q.department_norms, q.sort_option, q.today,
+                                   limit=PAGE_SIZE + 1, after=q.after, timer=timer)
+        except missing_object_errors(conn) as e:
+            # 마이그레이션(0002) 전: 이 프로세스에서는 끄고 기존 쿼리로
+            self.topn_enabled = False
+            logger.warning("[TOPN] disabled - %s", e)
+            return None
+
+    def load_page(self, q: MessageQuery, timer=NULL_TIMER, ttl: Optional[float] = None) -> Page:
+        if self.flights is None:
+            return self._load_page(q, timer, ttl)
+        t0 = time.perf_counter()
+        page, shared = self.flights.do(self._flight_key(q), lambda: self._load_page(q, timer, ttl))
+        if shared:
+            self._coalesced(timer, t0)
+        return page
+
+    async def load_page_async(self, q: MessageQuery, timer=NULL_TIMER, executor: Optional[Executor] = None) -> Page:
+        """load_page 의 이벤트 루프용. 합쳐진 요청은 스레드를 잡지 않고 기다림."""
+        if self.flights is None:
+            return await asyncio.get_running_loop().run_in_executor(executor, self._load_page, q, timer)
+        t0 = time.perf_counter()
+        page, shared = await self.flights.do_async(self._flight_key(q), lambda: self._load_page(q, timer), executor)
+        if shared:
+            self._coalesced(timer, t0)
+        return page
+
+    @staticmethod
+    def _flight_key(q: MessageQuery) -> tuple:
+        return q.cache_key + (q.today.isoformat(),)
+
+    @staticmethod
+    def _coalesced(timer, t0: float) -> None:
+        # DB 구간은 실제로 조회한 요청의 timer 에만 남고, 여기는 기다린 시간만
+        timer.add("singleflight_wait", time.perf_counter() - t0)
+        timer.label(outcome="coalesced")
+
+    def _load_page(self, q: MessageQuery, timer=NULL_TIMER, ttl: Optional[float] = None) -> Page:
+        t0 = time.perf_counter()
+        with self.pool.connection() as conn:
+            timer.add("db_acquire", time.perf_counter() - t0)
+            rows = self._topn_rows(conn, q, timer)
+            outcome = "topn"
+            if rows is None:
+                rows = fetch_notice_rows(conn, q.topic, q.department, q.sort_option, q.today,
+                                         limit=PAGE_SIZE + 1, after=q.after,
+                                         department_norms=q.department_norms, topic_norms=q.topic_norms,
+                                         timer=timer)
+                outcome = "db"
+        page = self._cache_page(q, rows, timer, ttl)
+        timer.label(outcome=outcome)
+        return page
+
+    def _cache_page(self, q: MessageQuery, rows: List[tuple], timer=NULL_TIMER,
+                    ttl: Optional[float] = None) -> Page:
+        # 다음 페이지 판단용 한 건까지 포함해 가장 이른 마감일이 지나면 결과가 달라짐
+        page = self._to_page(q, rows, timer)
+        self.cache.set(q.cache_key, page, ttl=ttl, expires_at=deadline_expiry(row[2] for row in rows))
+        return page
+
+    def _to_page(self, q: MessageQuery, rows: List[tuple], timer=NULL_TIMER) -> Page:
+        with timer.stage("card_render"):
+            next_cursor = None
+            if len(rows) > PAGE_SIZE:
+                rows = rows[:PAGE_SIZE]
+                next_cursor = encode_cursor(cursor_after(rows[-1], q.topic, q.department, q.sort_option))
+            return [build_notice_card(row) for row in rows], next_cursor
+
+    # ---------- 5) 응답 ----------
+    def render(self, q: MessageQuery, page: Page) -> Dict[str, Any]:
+        cards, next_cursor = page
+        if not cards:
+            if q.after is not None:
+                return text_payload(f"'{q.topic}, {q.department}' 관련 공지를 모두 보여드렸어요.")
+            return text_payload(f"'{q.topic}, {q.department}' 관련 마감 기한이 지난 정보이거나 공지사항이 존재하지 않아요.")
+        return carousel_payload(cards, self._more_replies(q, next_cursor))
+
+    def _more_replies(self, q: MessageQuery, next_cursor: Optional[str]) -> Optional[List[dict]]:
+        if not next_cursor or not self.more_enabled:
+            return None
+        block_id = self.config.kakao_more_block_id
+        if not block_id:
+            if not q.user_key:
+                return None  # 커서를 보관할 곳이 없음 — 토큰을 발화에 싣지 않음
+            self.more_cursors.set(q.user_key, next_cursor)
+        return [more_quick_reply(next_cursor, block_id)]
+
+    def busy(self, timer=NULL_TIMER) -> Dict[str, Any]:
+        timer.label(outcome="busy")
+        return text_payload(BUSY_TEXT)
+
+    def load_and_render(self, q: MessageQuery, timer=NULL_TIMER) -> Dict[str, Any]:
+        try:
+            page = self.load_page(q, timer)
+        except PoolTimeoutError:
+            return self.busy(timer)
+        return self.render(q, page)
+
+    # ---------- 6) 콜백 (느린 조회) ----------
+    def callback_job(self, data: dict, q: MessageQuery, timer=NULL_TIMER) -> Optional[CallbackJob]:
+        """콜백 모드가 아니면 None (호출 쪽에서 평소처럼 load_and_render)."""
+        url = callback_url(data) if self.callbacks is not None else None
+        if not url:
+            return None
+        return self.callbacks.submit(url, lambda: self.load_and_render(q, timer))
+
+    def callback_budget(self, timer) -> float:
+        started = getattr(timer, "started", None)
+        spent = time.perf_counter() - started if started is not None else 0.0
+        return self.config.callback_budget - spent
+
+    def waiting(self, timer=NULL_TIMER) -> Dict[str, Any]:
+        timer.label(outcome="callback")
+        return callback_payload(WAITING_TEXT)
+
+    def handle(self, data: dict, timer=NULL_TIMER) -> Dict[str, Any]:
+        q = self.parse(data, timer)
+        if isinstance(q, SearchQuery):
+            return self.search(q, timer)
+        if not isinstance(q, MessageQuery):
+            return q
+        page = self.cached_page(q, timer)
+        if page is not None:
+            return self.render(q, page)
+        job = self.callback_job(data, q, timer)
+        if job is None:
+            return self.load_and_render(q, timer)
+        payload = job.result(self.callback_budget(timer))
+        return payload if payload is not None else self.waiting(timer)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "db_pool": self.pool.stats(),
+            "result_cache": self.cache.stats(),
+            "notice_index": self.index.stats(),
+            "search_index": self.search_index.stats() if self.search_index is not None else None,
+            "callbacks": self.callbacks.stats() if self.callbacks is not None else None,
+            "prewarm": self.prewarmer.stats() if self.prewarmer is not None else None,
+            "singleflight": self.flights.stats() if self.flights is not None else None,
+        }
+
+
+def create_message_service(connect: Callable[[], Any] = get_db_connection,
+                           config: Optional[ServingConfig] = None,
+                           start_background: bool = True,
+                           pool_config: Optional[Dict[str, Any]] = None) -> MessageService:
+    """
+    풀/캐시/인덱스를 설정대로 조립.
+    connect 를 바꾸면 다른 DB(벤치마크용 stand-in 등)로 같은 로직을 돌릴 수 있음.
+    pool_config 는 DB_POOL_CONFIG 위에 덮어쓸 값 (부하 테스트 변형 비교용)
+    """
+    config = config or get_serving_config()
+    if not config.kakao_more_block_id and config.web_workers > 1:
+        logger.error("[MORE] disabled - KAKAO_MORE_BLOCK_ID unset with WEB_CONCURRENCY=%d "
+                     "(per-user cursors live in worker memory)", config.web_workers)
+    # 요청마다 새로 접속하지 않도록 따뜻한 커넥션을 빌려 씀
+    pool = ConnectionPool(connect, **{**DB_POOL_CONFIG, **(pool_config or {})})
+    # 활성 공지 메모리 인덱스: 준비되면 DB 왕복 없이 답하고, 아니면 DB 폴백
+    # 스냅샷 경로가 있으면 워커마다 적재하지 않고 적재기가 쓴 파일을 매핑 (모든 워커가 같은 순간에 교체)
+    if config.notice_snapshot_path:
+        index = SharedNoticeIndex(config.notice_snapshot_path, today_fn=MessageService.today)
+        generation_source = index.generation
+    else:
+        index = NoticeIndex(
+            pool.connection,
+            generation_source=NOTICE_GENERATION.current,
+            today_fn=MessageService.today,
+            refresh_interval=config.notice_index_refresh_interval,
+        )
+        generation_source = NOTICE_GENERATION.current
+    # 같은 (topic, department, sort, cursor) 조합은 카드 목록을 재사용
+    # 새 공지가 수집되면(세대 번호 변경) 또는 카드 중 가장 이른 마감일이 지나면 무효화
+    # (일괄 자정 만료는 끔: 오늘 마감 카드가 없는 조합까지 자정에 한꺼번에 DB 로 가지 않도록)
+    cache = TTLCache(
+        max_entries=config.result_cache_size,
+        ttl=config.result_cache_ttl,
+        expire_at_midnight=False,
+        generation_source=generation_source,
+    )
+    if config.notice_index_enabled and start_background:
+        index.start_background_refresh()
+    # 자유 검색 역색인: 같은 세대 번호로 증분 갱신
+    # (같은 프로세스에서 공지를 넣는다면 insertion.add_insert_listener(search_index.on_notice_inserted))
+    search_index = None
+    if config.search_index_enabled:
+        search_index = SearchIndex(
+            pool.connection,
+            generation_source=NOTICE_GENERATION.current,
+            today_fn=MessageService.today,
+            refresh_interval=config.notice_index_refresh_interval,
+        )
+        if start_background:
+            search_index.start_background_refresh()
+    # 콜백 블록에서 온 요청은 느린 조회를 작업자로 넘겨 5초 제한 안에 먼저 응답
+    callbacks = CallbackDispatcher(workers=config.callback_workers) if config.callback_enabled else None
+    service = MessageService(pool, cache, index, config, search_index=search_index, callbacks=callbacks)
+    # 자정 직후 인기 조합을 미리 다시 채워 아침 첫 요청들이 DB 로 몰리지 않게
+    if config.result_cache_prewarm_size > 0:
+        service.prewarmer = MidnightPrewarmer(service, size=config.result_cache_prewarm_size,
+                                              ttl=config.result_cache_prewarm_ttl)
+        if start_background:
+            service.prewarmer.start()
+    return service
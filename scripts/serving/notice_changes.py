@@ -0,0 +1,69 @@
+"""
+serving/notice_changes.py
+
+메모리 인덱스(notice_index / search_index)의 증분 갱신이 '무엇이 바뀌었는지' 묻는 쿼리입니다.
+
+- 변경 표시: notice / notice_department / notice_attachment / notice_ocr_text 의 row_version
+  (T-SQL ROWVERSION, migrations/0006 — SQLite 는 utils/sqlite_backend.py 의 트리거가 같은 규칙으로 올림)
+- current_mark: 지금까지 커밋된 변경의 다음 표시. 다음 갱신은 row_version >= 이 값인 행만 봄
+  (T-SQL 은 MIN_ACTIVE_ROWVERSION() — 아직 커밋 안 된 트랜잭션의 변경도 다음 갱신에서 잡힘)
+  0006 적용 전이면 None (호출 쪽에서 전체 재적재)
+- scope: 적재 쿼리의 WHERE 조건. 표시가 없으면 전체, 있으면 그 뒤 바뀐 공지(자식 테이블 변경 포함)
+- active_ids: 지금 활성인 공지 id (삭제/비활성/마감일 변경으로 빠진 공지를 인덱스에서 지우기 위함)
+"""
+
+from __future__ import annotations
+from datetime import date
+from typing import Optional, Set, Tuple
+
+from scripts.utils.sql_dialect import SQLITE, dialect_of
+
+__all__ = ["current_mark", "scope", "active_ids"]
+
+_MARK_SQL = """
+SELECT CASE WHEN COL_LENGTH('dbo.notice_ocr_text', 'row_version') IS NULL THEN NULL
+            ELSE CAST(MIN_ACTIVE_ROWVERSION() AS BIGINT) END;
+"""
+
+_MARK_SQL_SQLITE = "SELECT v + 1 FROM dbo.notice_change_seq WHERE id = 1;"
+
+_CHANGED_SQL = """SELECT id FROM dbo.notice WHERE row_version >= {mark}
+    UNION SELECT notice_id FROM dbo.notice_department WHERE row_version >= {mark}
+    UNION SELECT notice_id FROM dbo.notice_attachment WHERE row_version >= {mark}
+    UNION SELECT notice_id FROM dbo.notice_ocr_text WHERE row_version >= {mark}"""
+
+# ROWVERSION 은 binary(8) — 파라미터 쪽을 바꿔야 열 인덱스를 탐
+_MARK_PARAM = "CAST(CAST(? AS BIGINT) AS BINARY(8))"
+
+_ACTIVE_SQL = """
+SELECT id FROM dbo.notice
+WHERE llm_status = 1
+  AND (deadline IS NULL OR deadline >= ?)
+"""
+
+
+def current_mark(conn) -> Optional[int]:
+    cur = conn.cursor()
+    try:
+        cur.execute(_MARK_SQL_SQLITE if dialect_of(conn) == SQLITE else _MARK_SQL)
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    return None if row is None or row[0] is None else int(row[0])
+
+
+def scope(column: str, since: Optional[int], dialect: str) -> Tuple[str, tuple]:
+    """(조건, 파라미터). since 가 None 이면 전체 적재"""
+    if since is None:
+        return f"{column} > ?", (0,)
+    mark = "?" if dialect == SQLITE else _MARK_PARAM
+    return f"{column} IN (\n    {_CHANGED_SQL.format(mark=mark)}\n)", (since,) * 4
+
+
+def active_ids(conn, today: date) -> Set[int]:
+    cur = conn.cursor()
+    try:
+        cur.execute(_ACTIVE_SQL, today)
+        return {int(row[0]) for row in cur.fetchall()}
+    finally:
+        cur.close()
@@ -0,0 +1,364 @@
+"""
+serving/notice_index.py
+
+웹훅이 DB 왕복 없이 답할 수 있도록 활성 공지를 프로세스 메모리에 올려 둔 인덱스입니다.
+
+구조:
+- NoticeRecord: __slots__ 레코드 (공지 1건 + 첫 첨부 URL + 학과 목록 문자열)
+- topic_norm → department_norm → _Bucket(마감순 리스트, 작성일순 리스트)
+- 조회는 serving/notice_query.py 와 같은 규칙(해석된 값은 정확 일치, 아니면 정규화 키 접두 일치,
+  deadline >= today)이고
+  같은 모양의 행 튜플을 돌려주므로 카드 렌더링 코드를 그대로 씀
+
+갱신:
+- build(): 활성 공지(llm_status=1, 마감 전) 전체 적재
+- refresh(): 마지막 변경 표시(row_version, serving/notice_changes.py) 이후 바뀐 공지만 다시 읽고
+  활성 id 목록에 없는 공지(삭제/비활성/마감일 변경)는 뺀 뒤 트리를 새로 만들어 원자적으로 교체
+  (읽기 쪽은 락 없이 현재 스냅샷만 참조. 변경 표시가 없는 DB 면 전체 재적재)
+- start_background_refresh(): 세대 번호(cache_utils.NOTICE_GENERATION)가 바뀌면 증분 갱신,
+  날짜가 바뀌거나 full_rebuild_interval 이 지나면 전체 재적재
+- on_publish: 스냅샷을 교체할 때마다 (레코드, 기준 날짜, 세대) 로 호출
+  (여러 워커가 나눠 쓰는 파일 스냅샷 적재기, serving/notice_snapshot.py)
+"""
+
+from __future__ import annotations
+import heapq
+import sys
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from scripts.utils.key_utils import normalize_search_key
+from scripts.utils.sql_dialect import dialect_of
+from scripts.serving.notice_changes import current_mark, scope, active_ids
+from scripts.serving.pagination import PageCursor, sort_family
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+__all__ = ["NoticeRecord", "NoticeIndex"]
+
+_NOTICE_SQL = """
+SELECT n.id, n.title, n.deadline, n.oneline, n.topic, n.topic_norm, n.created_at, n.url
+FROM dbo.notice n
+WHERE n.llm_status = 1
+  AND {scope}
+  AND (n.deadline IS NULL OR n.deadline >= ?)
+"""
+
+_DEPARTMENT_SQL = """
+SELECT d.notice_id, d.department, d.department_norm
+FROM dbo.notice_department d
+JOIN dbo.notice n ON n.id = d.notice_id
+WHERE n.llm_status = 1
+  AND {scope}
+  AND (n.deadline IS NULL OR n.deadline >= ?)
+"""
+
+_ATTACHMENT_SQL = """
+SELECT x.notice_id, x.file_url, x.thumbnail_url
+FROM (
+    SELECT a.notice_id, a.file_url, a.thumbnail_url,
+           ROW_NUMBER() OVER (PARTITION BY a.notice_id ORDER BY a.file_order ASC) AS rn
+    FROM dbo.notice_attachment a
+    WHERE {scope}
+) x
+WHERE x.rn = 1
+"""
+
+
+class NoticeRecord:
+    __slots__ = ("id", "title", "deadline", "oneline", "topic", "topic_norm",
+                 "created_at", "url", "file_url", "departments", "department_norms", "thumbnail_url")
+
+    def __init__(self, id, title, deadline, oneline, topic, topic_norm, created_at, url):
+        self.id = id
+        self.title = title
+        self.deadline = deadline
+        self.oneline = oneline
+        self.topic = sys.intern(topic) if topic else topic
+        self.topic_norm = sys.intern(topic_norm or normalize_search_key(topic or ""))
+        self.created_at = created_at
+        self.url = url
+        self.file_url = None
+        self.departments = None          # "A, B" (STRING_AGG 와 같은 모양)
+        self.department_norms = ()
+        self.thumbnail_url = None        # 첫 첨부의 카드용 썸네일 (migrations/0003, 없으면 원본)
+
+    def as_row(self) -> tuple:
+        """notice_query.fetch_notice_rows 와 같은 행 모양."""
+        return (self.id, self.title, self.deadline, self.oneline, self.topic,
+                self.created_at, self.url, self.file_url, self.departments, self.thumbnail_url)
+
+
+def _deadline_key(r: NoticeRecord):
+    # SQL Server ORDER BY deadline ASC, id ASC 와 동일하게 NULL 이 먼저
+    return (r.deadline is not None, r.deadline or date.min, r.id)
+
+
+def _created_key(r: NoticeRecord):
+    return (r.created_at or datetime.min, r.id)
+
+
+def _cursor_key(after: PageCursor):
+    # 커서를 위 정렬 키와 같은 모양으로
+    if sort_family(after.sort_option) == "deadline":
+        return (after.deadline is not None, after.deadline or date.min, after.id)
+    return (after.created_at or datetime.min, after.id)
+
+
+class _Bucket:
+    __slots__ = ("by_deadline", "by_created")
+
+    def __init__(self, records: List[NoticeRecord]):
+        self.by_deadline = sorted(records, key=_deadline_key)
+        self.by_created = sorted(records, key=_created_key)
+
+
+class _Snapshot:
+    __slots__ = ("tree", "built_for", "size")
+
+    def __init__(self, tree: Dict[str, Dict[str, _Bucket]], built_for: date, size: int):
+        self.tree = tree
+        self.built_for = built_for
+        self.size = size
+
+
+def _as_date(v):
+    if v is None:
+        return None
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    return date.fromisoformat(str(v)[:10])
+
+
+class NoticeIndex:
+    """
+    사용:
+        index = NoticeIndex(pool.connection)
+        index.build()
+        rows = index.lookup("공모전", "컴퓨터", "마감순", today)   # 준비 전이면 None
+    """
+    def __init__(self, connection_factory: Callable, generation_source: Optional[Callable[[], int]] = None,
+                 today_fn: Callable[[], date] = date.today,
+                 refresh_interval: float = 30.0, full_rebuild_interval: float = 1800.0,
+                 on_publish: Optional[Callable[[Iterable[NoticeRecord], date, Optional[int]], None]] = None):
+        self.connection_factory = connection_factory  # with connection_factory() as conn:
+        self.on_publish = on_publish
+        self.generation_source = generation_source
+        self.today_fn = today_fn
+        self.refresh_interval = float(refresh_interval)
+        self.full_rebuild_interval = float(full_rebuild_interval)
+
+        self._records: Dict[int, NoticeRecord] = {}
+        self._snapshot: Optional[_Snapshot] = None
+        self._mark: Optional[int] = None  # 다음 갱신이 볼 변경 표시 (None 이면 전체 재적재)
+        self._generation = None
+        self._last_full = 0.0
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.lookups = 0
+        self.refreshes = 0
+        self.full_builds = 0
+
+    @property
+    def ready(self) -> bool:
+        snap = self._snapshot
+        return snap is not None and snap.built_for == self.today_fn()
+
+    def generation(self) -> Optional[int]:
+        """마지막 적재/갱신 때 읽은 세대 번호 (결과 캐시에 넣어도 되는지 판단용)"""
+        return self._generation
+
+    # ---------- 적재 ----------
+    def _fetch(self, conn, since: Optional[int], today: date) -> Dict[int, NoticeRecord]:
+        """since(변경 표시)가 None 이면 활성 공지 전체, 아니면 그 뒤 바뀐 활성 공지"""
+        fresh: Dict[int, NoticeRecord] = {}
+        depts: Dict[int, List[tuple]] = {}
+        dialect = dialect_of(conn)
+        cur = conn.cursor()
+        try:
+            where, params = scope("n.id", since, dialect)
+            cur.execute(_NOTICE_SQL.format(scope=where), *params, today)
+            for nid, title, deadline, oneline, topic, topic_norm, created_at, url in cur.fetchall():
+                fresh[nid] = NoticeRecord(nid, title, _as_date(deadline), oneline,
+                                          topic, topic_norm, created_at, url)
+            if not fresh:
+                return fresh
+            cur.execute(_DEPARTMENT_SQL.format(scope=where), *params, today)
+            for nid, dept, dept_norm in cur.fetchall():
+                if nid in fresh and dept:
+                    depts.setdefault(nid, []).append(
+                        (sys.intern(dept), sys.intern(dept_norm or normalize_search_key(dept)))
+                    )
+            where, params = scope("a.notice_id", since, dialect)
+            cur.execute(_ATTACHMENT_SQL.format(scope=where), *params)
+            for nid, file_url, thumbnail_url in cur.fetchall():
+                rec = fresh.get(nid)
+                if rec is not None:
+                    rec.file_url = file_url
+                    rec.thumbnail_url = thumbnail_url
+        finally:
+            cur.close()
+
+        for nid, rec in fresh.items():
+            pairs = depts.get(nid)
+            if pairs:
+                rec.departments = ", ".join(p[0] for p in pairs)
+                rec.department_norms = tuple(dict.fromkeys(p[1] for p in pairs))
+        return fresh
+
+    def _publish(self, today: date) -> None:
+        # 살아 있는 레코드로 트리를 새로 만든 뒤 참조만 교체
+        self._records = {nid: r for nid, r in self._records.items()
+                         if r.deadline is None or r.deadline >= today}
+        grouped: Dict[str, Dict[str, List[NoticeRecord]]] = {}
+        for rec in self._records.values():
+            by_dept = grouped.setdefault(rec.topic_norm, {})
+            for dn in rec.department_norms:
+                by_dept.setdefault(dn, []).append(rec)
+        tree = {t: {d: _Bucket(recs) for d, recs in by_dept.items()} for t, by_dept in grouped.items()}
+        self._snapshot = _Snapshot(tree, today, len(self._records))
+        if self.on_publish is not None:
+            self.on_publish(self._records.values(), today, self._generation)
+
+    def build(self) -> None:
+        """전체 재적재."""
+        with self._write_lock:
+            today = self.today_fn()
+            gen = self.generation_source() if self.generation_source else None
+            with self.connection_factory() as conn:
+                mark = current_mark(conn)  # 읽기 전에 — 읽는 동안 바뀐 공지는 다음 갱신이 다시 봄
+                fresh = self._fetch(conn, None, today)
+            self._records = fresh
+            self._mark = mark
+            self._generation = gen
+            self._last_full = time.monotonic()
+            self._publish(today)
+            self.full_builds += 1
+            logger.info("[NOTICE_INDEX] built - notices=%d mark=%s", len(fresh), mark)
+
+    def refresh(self) -> int:
+        """마지막 변경 표시 이후 바뀐 공지만 다시 읽어 합침. 반환: 다시 읽은 공지 수"""
+        if self._mark is None:
+            # 변경 표시가 없는 DB(migrations/0006 전): 무엇이 바뀌었는지 알 수 없으므로 전체 재적재
+            self.build()
+            return self._snapshot.size
+        with self._write_lock:
+            today = self.today_fn()
+            gen = self.generation_source() if self.generation_source else None
+            with self.connection_factory() as conn:
+                mark = current_mark(conn)
+                fresh = self._fetch(conn, self._mark, today)
+                active = active_ids(conn, today)
+            # 지워졌거나 llm_status/마감일이 바뀌어 빠진 공지
+            self._records = {nid: r for nid, r in self._records.items() if nid in active}
+            self._records.update(fresh)
+            self._mark = mark
+            self._generation = gen
+            self._publish(today)
+            self.refreshes += 1
+            return len(fresh)
+
+    # ---------- 백그라운드 갱신 ----------
+    def _tick(self) -> None:
+        snap = self._snapshot
+        today = self.today_fn()
+        if (snap is None or snap.built_for != today
+                or time.monotonic() - self._last_full >= self.full_rebuild_interval):
+            self.build()
+        elif self.generation_source is None or self.generation_source() != self._generation:
+            n = self.refresh()
+            logger.info("[NOTICE_INDEX] refreshed - fetched=%d size=%d", n, self._snapshot.size)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception:
+                logger.exception("[NOTICE_INDEX] refresh failed (DB 폴백으로 계속 서비스)")
+            self._stop.wait(self.refresh_interval)
+
+    def start_background_refresh(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="notice-index-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------- 조회 ----------
+    def lookup(self, topic: str, department: str, sort_option: Optional[str],
+               today: date, limit: int = 5, after: Optional[PageCursor] = None,
+               department_norms: Sequence[str] = (), topic_norms: Sequence[str] = ()) -> Optional[List[tuple]]:
+        """
+        인덱스가 준비되지 않았거나 다른 날짜 기준이면 None (호출 쪽에서 DB 폴백).
+        after 가 있으면 그 정렬 키 다음 행부터 (notice_query 키셋 페이지와 같은 결과).
+        department_norms / topic_norms 가 있으면 해당 버킷만 바로 찾고, 없으면 접두 일치로 훑음.
+        """
+        snap = self._snapshot
+        if snap is None or snap.built_for != today:
+            return None
+        self.lookups += 1
+
+        if topic_norms:
+            by_topic = [snap.tree[t] for t in topic_norms if t in snap.tree]
+        else:
+            t_key = normalize_search_key(topic)
+            by_topic = [by_dept for t_norm, by_dept in snap.tree.items() if t_norm.startswith(t_key)]
+        buckets: List[_Bucket] = []
+        for by_dept in by_topic:
+            if department_norms:
+                buckets.extend(by_dept[d] for d in department_norms if d in by_dept)
+            else:
+                d_key = normalize_search_key(department)
+                buckets.extend(b for d_norm, b in by_dept.items() if d_norm.startswith(d_key))
+
+        family = sort_family(sort_option)
+        if family == "created_desc":
+            key = _created_key
+            streams: Iterable = heapq.merge(*(reversed(b.by_created) for b in buckets),
+                                            key=key, reverse=True)
+        elif family == "created_asc":
+            key = _created_key
+            streams = heapq.merge(*(b.by_created for b in buckets), key=key)
+        else:  # 마감순 (정렬 미지정도 마감순으로)
+            key = _deadline_key
+            streams = heapq.merge(*(b.by_deadline for b in buckets), key=key)
+        after_key = _cursor_key(after) if after is not None else None
+
+        out: List[tuple] = []
+        seen = set()
+        for rec in streams:
+            if rec.id in seen:
+                continue
+            if after_key is not None:
+                k = key(rec)
+                if (k >= after_key) if family == "created_desc" else (k <= after_key):
+                    continue
+            if rec.deadline is not None and rec.deadline < today:
+                continue
+            seen.add(rec.id)
+            out.append(rec.as_row())
+            if len(out) >= limit:
+                break
+        return out
+
+    def stats(self) -> Dict[str, object]:
+        snap = self._snapshot
+        return {
+            "ready": self.ready,
+            "size": snap.size if snap else 0,
+            "topics": len(snap.tree) if snap else 0,
+            "built_for": snap.built_for.isoformat() if snap else None,
+            "change_mark": self._mark,
+            "lookups": self.lookups,
+            "refreshes": self.refreshes,
+            "full_builds": self.full_builds,
+        }
@@ -0,0 +1,256 @@
+"""
+serving/notice_query.py
+
+웹훅(/message)에서 쓰는 공지 조회 쿼리를 한 곳에서 관리합니다.
+
+- topic_norm / department_norm: 쓰기 시점(notice_repo)에 채워 둔 정규화 컬럼
+  (공백 제거 + 소문자). 읽기 시점에 REPLACE(LOWER()) 를 하지 않으므로
+  IX_notice_department_norm(department_norm, notice_id),
+  IX_notice_topic_norm(topic_norm, deadline) 인덱스를 접두(prefix) 탐색으로 탈 수 있음
+- 학과 목록(STRING_AGG)과 첫 첨부는 해당 공지 id로만 OUTER APPLY 하므로
+  notice_department 전체를 GROUP BY 하지 않음
+- 해석기(serving/resolver.py)가 학과/주제를 허용 값으로 바꿔 주면 department_norm IN (...),
+  topic_norm IN (...) 정확 일치로 인덱스를 seek 하고, 해석 못 한 입력만 접두 LIKE 로 찾음
+- limit 을 주면 TOP (n) 으로 필요한 행만 가져오고, after(PageCursor)를 주면
+  (deadline, id) / (created_at, id) 키셋 조건으로 다음 페이지부터 탐색
+- fetch_topn_rows: 수집 후 미리 채워 둔 조합별 상위 N건(dbo.notice_topn, db_tasks/topn_repo.py)을
+  PK 범위 조회 한 번으로 읽음. 잘린 목록 너머가 필요하면 None → 위 쿼리로 폴백
+- SQLite 백엔드(utils/sqlite_backend.py)면 같은 조건을 OUTER APPLY/TOP 없이 (상관 서브쿼리 + LIMIT, 접두 GLOB)
+"""
+
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Sequence
+
+from scripts.utils.key_utils import normalize_search_key
+from scripts.serving.pagination import PageCursor, sort_family
+from scripts.utils.metrics import NULL_TIMER
+from scripts.utils.sql_dialect import MSSQL, SQLITE, dialect_of, prefix_match, prefix_pattern, sqlite_card_columns
+
+__all__ = ["TABLES", "ORDER_BY", "TOPN_MAX_AGE_DAYS", "build_notice_query", "fetch_notice_rows", "fetch_topn_rows"]
+
+TABLES: Dict[str, str] = {
+    "notice": "dbo.notice",
+    "department": "dbo.notice_department",
+    "attachment": "dbo.notice_attachment",
+}
+
+# id 를 2차 정렬 키로 둬야 키셋 페이지가 겹치거나 빠지지 않음
+ORDER_BY = {
+    "deadline": " ORDER BY n.deadline ASC, n.id ASC",
+    "created_desc": " ORDER BY n.created_at DESC, n.id DESC",
+    "created_asc": " ORDER BY n.created_at ASC, n.id ASC",
+}
+
+_SEEK = {
+    # 직전 행의 deadline 이 NULL 이면 남은 NULL 행(id 순) 다음에 날짜 있는 행 전부
+    "deadline_null": "\nAND ((n.deadline IS NULL AND n.id > ?) OR n.deadline IS NOT NULL)",
+    "deadline": "\nAND (n.deadline > ? OR (n.deadline = ? AND n.id > ?))",
+    "created_desc": "\nAND (n.created_at < ? OR (n.created_at = ? AND n.id < ?))",
+    "created_asc": "\nAND (n.created_at > ? OR (n.created_at = ? AND n.id > ?))",
+}
+
+_NOTICE_QUERY = """
+SELECT{top}
+    n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
+    a.file_url,
+    dep.departments,
+    a.thumbnail_url
+FROM {notice} n
+OUTER APPLY (
+    SELECT STRING_AGG(department, ', ') AS departments
+    FROM {department}
+    WHERE notice_id = n.id
+) dep
+OUTER APPLY (
+    SELECT TOP 1 file_url, thumbnail_url
+    FROM {attachment}
+    WHERE notice_id = n.id
+    ORDER BY file_order ASC
+) a
+WHERE n.id IN (
+    SELECT notice_id
+    FROM {department}
+    WHERE {department_match}
+)
+AND {topic_match}
+AND (n.deadline IS NULL OR n.deadline >= ?)"""
+
+# 같은 조건의 SQLite 판 (파라미터 순서 동일, TOP 대신 끝에 LIMIT)
+_NOTICE_QUERY_SQLITE = """
+SELECT
+    n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
+    a.file_url,
+    {departments},
+    a.thumbnail_url
+FROM {notice} n
+{attachment_join}
+WHERE n.id IN (
+    SELECT notice_id
+    FROM {department}
+    WHERE {department_match}
+)
+AND {topic_match}
+AND (n.deadline IS NULL OR n.deadline >= ?)"""
+
+
+def _match(column: str, n_exact: int, dialect: str = MSSQL) -> str:
+    # 정확 일치 값이 있으면 IN (?, ...), 없으면 접두 LIKE ? 하나
+    if n_exact:
+        return f"{column} IN ({', '.join('?' * n_exact)})"
+    return prefix_match(column, dialect)
+
+
+def _seek(after: Optional[PageCursor]) -> tuple[str, tuple]:
+    if after is None:
+        return "", ()
+    family = sort_family(after.sort_option)
+    if family == "deadline":
+        if after.deadline is None:
+            return _SEEK["deadline_null"], (after.id,)
+        return _SEEK["deadline"], (after.deadline, after.deadline, after.id)
+    return _SEEK[family], (after.created_at, after.created_at, after.id)
+
+
+def build_notice_query(sort_option: Optional[str], tables: Dict[str, str] = TABLES,
+                       limit: Optional[int] = None, after: Optional[PageCursor] = None,
+                       n_departments: int = 0, n_topics: int = 0,
+                       dialect: str = MSSQL) -> tuple[str, tuple]:
+    """
+    정렬/페이지 조건에 맞는 조회 SQL.
+    n_departments / n_topics: 정확 일치 값 개수 (0 이면 접두 LIKE)
+    dialect: utils.sql_dialect 의 MSSQL / SQLITE
+    반환: (sql, 키셋 파라미터). 전체 파라미터 순서는
+    (department 값들 또는 패턴, topic 값들 또는 패턴, today, *키셋 파라미터)
+    """
+    seek_sql, seek_params = _seek(after)
+    matches = {
+        "department_match": _match("department_norm", n_departments, dialect),
+        "topic_match": _match("n.topic_norm", n_topics, dialect),
+    }
+    order_by = ORDER_BY[sort_family(sort_option)]
+    if dialect == SQLITE:
+        sql = _NOTICE_QUERY_SQLITE.format(
+            **sqlite_card_columns(tables["department"], tables["attachment"]), **matches, **tables,
+        ) + seek_sql + order_by + (f" LIMIT {int(limit)}" if limit else "")
+        return sql, seek_params
+    top = f" TOP ({int(limit)})" if limit else ""
+    sql = _NOTICE_QUERY.format(top=top, **matches, **tables) + seek_sql + order_by
+    return sql, seek_params
+
+
+def fetch_notice_rows(conn, topic: str, department: str,
+                      sort_option: Optional[str], today: date,
+                      limit: Optional[int] = None, after: Optional[PageCursor] = None,
+                      department_norms: Sequence[str] = (), topic_norms: Sequence[str] = (),
+                      timer=NULL_TIMER) -> List[tuple]:
+    """
+    department_norms / topic_norms 가 있으면 그 값들과 정확 일치, 없으면 topic/department 접두 일치(LIKE 'x%').
+    timer: utils.metrics.StageTimer 를 주면 db_execute / db_fetch 구간 기록
+    반환 행: (id, title, deadline, oneline, topic, created_at, url, file_url, departments, thumbnail_url)
+    """
+    dialect = dialect_of(conn)
+    sql, seek_params = build_notice_query(sort_option, limit=limit, after=after,
+                                          n_departments=len(department_norms), n_topics=len(topic_norms),
+                                          dialect=dialect)
+    dept_params = tuple(department_norms) or (prefix_pattern(normalize_search_key(department), dialect),)
+    topic_params = tuple(topic_norms) or (prefix_pattern(normalize_search_key(topic), dialect),)
+    cursor = conn.cursor()
+    try:
+        with timer.stage("db_execute"):
+            cursor.execute(sql, *dept_params, *topic_params, today, *seek_params)
+        with timer.stage("db_fetch"):
+            return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+# 마지막 전체 재적재(notice_topn_state.built_for)가 이보다 오래되면 상위 N건 표를 안 씀
+# (조합 단위 갱신은 빠진 공지의 행을 지우지 못함 — db_tasks/topn_repo.py)
+TOPN_MAX_AGE_DAYS = 1
+
+_TOPN_QUERY = """
+SELECT s.built_for, t.topic_norm, t.department_norm, t.pair_total,
+       t.notice_id, t.title, t.deadline, t.oneline, t.topic, t.created_at, t.url, t.file_url, t.departments,
+       t.thumbnail_url
+FROM dbo.notice_topn_state s
+LEFT JOIN dbo.notice_topn t
+  ON t.topic_norm IN ({topics})
+ AND t.department_norm IN ({departments})
+ AND t.sort_family = ?
+ORDER BY t.topic_norm, t.department_norm, t.rank_no"""
+
+
+def _row_key(row: tuple, family: str) -> tuple:
+    # ORDER_BY 와 같은 순서 (deadline NULL 먼저, id 2차 키)
+    if family == "deadline":
+        deadline = row[2]
+        return (deadline is not None, deadline or date.min, row[0])
+    return (row[5] or datetime.min, row[0])
+
+
+def _cursor_key(after: PageCursor, family: str) -> tuple:
+    if family == "deadline":
+        return (after.deadline is not None, after.deadline or date.min, after.id)
+    return (after.created_at or datetime.min, after.id)
+
+
+def fetch_topn_rows(conn, topic_norms: Sequence[str], department_norms: Sequence[str],
+                    sort_option: Optional[str], today: date, limit: int,
+                    after: Optional[PageCursor] = None, timer=NULL_TIMER) -> Optional[List[tuple]]:
+    """
+    해석된 주제/학과(정규화 키) 조합들의 미리 채워 둔 상위 N건을 합쳐 limit 건.
+    반환 행은 fetch_notice_rows 와 같은 모양. 다음 경우 None (호출 쪽에서 fetch_notice_rows 로 폴백):
+    - 아직 한 번도 채우지 않음 (notice_topn_state 행 없음)
+    - 마지막 전체 재적재가 TOPN_MAX_AGE_DAYS 보다 오래됨 (지워지지 않은 행이 남아 있을 수 있음)
+    - 잘린 조합(pair_total > 저장 건수)의 마지막 행 너머까지 봐야 limit 건을 채울 수 있음
+      (마감 지난 행을 거르거나 '더 보기'로 깊이 들어간 경우)
+    """
+    family = sort_family(sort_option)
+    sql = _TOPN_QUERY.format(topics=", ".join("?" * len(topic_norms)),
+                             departments=", ".join("?" * len(department_norms)))
+    cursor = conn.cursor()
+    try:
+        with timer.stage("db_execute"):
+            cursor.execute(sql, *topic_norms, *department_norms, family)
+        with timer.stage("db_fetch"):
+            fetched = cursor.fetchall()
+    finally:
+        cursor.close()
+    if not fetched or fetched[0][0] < today - timedelta(days=TOPN_MAX_AGE_DAYS):
+        return None
+
+    # 조합별 목록 → 잘린 목록이면 그 마지막 키까지만 믿을 수 있음
+    pairs: Dict[tuple, List[tuple]] = {}
+    totals: Dict[tuple, int] = {}
+    for built_for, t_norm, d_norm, pair_total, *row in fetched:
+        if t_norm is None:
+            continue  # 상태 행만 있고 해당 조합 없음 = 활성 공지 없음
+        pairs.setdefault((t_norm, d_norm), []).append(tuple(row))
+        totals[(t_norm, d_norm)] = pair_total
+    descending = family == "created_desc"
+    bound = None
+    for pair, rows in pairs.items():
+        if totals[pair] > len(rows):
+            k = _row_key(rows[-1], family)
+            if bound is None or (k > bound if descending else k < bound):
+                bound = k
+
+    merged: Dict[int, tuple] = {}
+    for rows in pairs.values():
+        for row in rows:
+            merged.setdefault(row[0], row)  # 여러 학과에 걸친 공지는 한 번만
+    after_key = _cursor_key(after, family) if after is not None else None
+    out = []
+    for row in sorted(merged.values(), key=lambda r: _row_key(r, family), reverse=descending):
+        k = _row_key(row, family)
+        if bound is not None and (k < bound if descending else k > bound):
+            break
+        if after_key is not None and ((k >= after_key) if descending else (k <= after_key)):
+            continue
+        if row[2] is not None and row[2] < today:
+            continue
+        out.append(row)
+        if len(out) >= limit:
+            return out
+    return out if bound is None else None
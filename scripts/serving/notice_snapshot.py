@@ -0,0 +1,363 @@
+"""
+serving/notice_snapshot.py
+
+gunicorn 워커 여러 개가 하나의 활성 공지 스냅샷을 나눠 쓰는 모드입니다.
+워커마다 NoticeIndex 를 따로 두면 워커 수만큼 메모리를 쓰고 DB 를 따로 읽습니다.
+
+- 적재기(한 프로세스): NoticeIndex 로 DB 를 읽고 스냅샷이 바뀔 때마다(on_publish)
+  write_snapshot 으로 읽기 전용 파일을 새로 써서 os.replace 로 원자적 교체
+- 워커: SharedNoticeIndex 가 파일을 mmap 으로 매핑만 함 (페이지 캐시를 모든 워커가 공유)
+  조회할 때 필요한 행만 풀어 씀. 파일이 바뀌면(inode) 새로 매핑해 참조만 교체
+  → 워커가 늘어도 메모리는 그대로, 수집 후 모든 워커가 check_interval 안에 같은 스냅샷을 봄
+- 조회 결과는 NoticeIndex.lookup 과 같음 (정렬/커서/접두 일치/마감 필터)
+
+파일 구조 (리틀 엔디언):
+    header   _HEADER (magic, version, built_for, generation, count, 구간 오프셋)
+    records  count × _RECORD  (id, 마감일 ordinal(0=없음), 작성 시각 µs, 문자열 7개의 (offset, length))
+    heap     UTF-8 문자열 (length == _NONE 이면 None)
+    orders   int32 레코드 번호 배열 (버킷마다 마감순, 작성일순)
+    dir      JSON {topic_norm: {department_norm: [마감순 시작, 작성일순 시작, 개수]}}
+
+실행:
+    python -m scripts.serving.notice_snapshot --path data/notice_snapshot.bin    # 적재기
+    NOTICE_SNAPSHOT_PATH=data/notice_snapshot.bin WEB_CONCURRENCY=4 gunicorn app:app    # 워커
+"""
+
+from __future__ import annotations
+import argparse
+import heapq
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from scripts.utils.key_utils import normalize_search_key
+from scripts.serving.notice_index import NoticeRecord, _deadline_key, _created_key
+from scripts.serving.pagination import PageCursor, sort_family
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+__all__ = ["write_snapshot", "SharedNoticeIndex"]
+
+MAGIC = b"KNUSNAP1"
+VERSION = 2  # 2: thumbnail_url 추가 (migrations/0003)
+_HEADER = struct.Struct("<8sIiqI7Q")
+_RECORD = struct.Struct("<qiq14I")
+_KEYS = struct.Struct("<qiq")  # 정렬에 필요한 앞부분만
+_NONE = 0xFFFFFFFF
+_NO_TIME = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+_US = timedelta(microseconds=1)
+
+
+def _micros(dt: Optional[datetime]) -> int:
+    if dt is None:
+        return _NO_TIME
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None)  # DB 는 naive datetime, 정렬 순서만 맞으면 됨
+    return (dt - _EPOCH) // _US
+
+
+# ---------- 쓰기 (적재기) ----------
+def write_snapshot(path: str, records: Iterable[NoticeRecord], built_for: date,
+                   generation: Optional[int] = None) -> int:
+    """활성 공지 스냅샷 파일을 새로 써서 원자적으로 교체. 반환: 파일 크기(바이트)"""
+    recs = sorted(records, key=lambda r: r.id)
+    pos = {r.id: i for i, r in enumerate(recs)}
+
+    heap = bytearray()
+    table = bytearray()
+    for r in recs:
+        refs: List[int] = []
+        for value in (r.title, r.oneline, r.topic, r.url, r.file_url, r.departments, r.thumbnail_url):
+            if value is None:
+                refs += (0, _NONE)
+            else:
+                raw = str(value).encode("utf-8")
+                refs += (len(heap), len(raw))
+                heap += raw
+        table += _RECORD.pack(int(r.id), r.deadline.toordinal() if r.deadline else 0,
+                              _micros(r.created_at), *refs)
+
+    grouped: Dict[str, Dict[str, List[NoticeRecord]]] = {}
+    for r in recs:
+        by_dept = grouped.setdefault(r.topic_norm, {})
+        for dn in r.department_norms:
+            by_dept.setdefault(dn, []).append(r)
+    orders = array("i")
+    directory: Dict[str, Dict[str, List[int]]] = {}
+    for t_norm, by_dept in grouped.items():
+        for d_norm, bucket in by_dept.items():
+            d_start = len(orders)
+            orders.extend(pos[r.id] for r in sorted(bucket, key=_deadline_key))
+            c_start = len(orders)
+            orders.extend(pos[r.id] for r in sorted(bucket, key=_created_key))
+            directory.setdefault(t_norm, {})[d_norm] = [d_start, c_start, len(bucket)]
+    if orders.itemsize != 4:
+        raise RuntimeError("array('i') is not 32-bit on this platform")
+    dir_raw = json.dumps(directory, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    records_off = _HEADER.size
+    heap_off = records_off + len(table)
+    orders_off = heap_off + len(heap)
+    orders_off += (-orders_off) % 4  # int32 정렬
+    dir_off = orders_off + len(orders) * 4
+    header = _HEADER.pack(MAGIC, VERSION, built_for.toordinal(), int(generation or 0), len(recs),
+                          records_off, heap_off, len(heap), orders_off, len(orders), dir_off, len(dir_raw))
+
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(table)
+        f.write(heap)
+        f.write(b"\0" * (orders_off - heap_off - len(heap)))
+        f.write(orders.tobytes())
+        f.write(dir_raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)  # 읽는 쪽은 이전 파일(inode)을 매핑한 채로 계속 읽을 수 있음
+    return dir_off + len(dir_raw)
+
+
+# ---------- 읽기 (워커) ----------
+class _Mapped:
+    """매핑된 파일 하나. 교체 후에도 진행 중인 조회가 끝날 때까지 참조로 살아 있음."""
+    __slots__ = ("mm", "ident", "built_for", "generation", "count", "records_off",
+                 "heap_off", "orders", "directory", "nbytes")
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, built_for, generation, count, records_off, heap_off, _heap_len,
+         orders_off, orders_len, dir_off, dir_len) = _HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a notice snapshot (v{VERSION}): {path}")
+        self.ident = (st.st_ino, st.st_mtime_ns, st.st_size)
+        self.built_for = date.fromordinal(built_for)
+        self.generation = generation
+        self.count = count
+        self.records_off = records_off
+        self.heap_off = heap_off
+        self.orders = memoryview(self.mm)[orders_off:orders_off + orders_len * 4].cast("i")
+        self.directory: Dict[str, Dict[str, List[int]]] = json.loads(
+            self.mm[dir_off:dir_off + dir_len].decode("utf-8"))
+        self.nbytes = st.st_size
+
+    def keys(self, i: int) -> Tuple[int, int, int]:
+        """(id, 마감일 ordinal, 작성 시각 µs)"""
+        return _KEYS.unpack_from(self.mm, self.records_off + i * _RECORD.size)
+
+    def _str(self, off: int, length: int) -> Optional[str]:
+        if length == _NONE:
+            return None
+        start = self.heap_off + off
+        return self.mm[start:start + length].decode("utf-8")
+
+    def row(self, i: int) -> tuple:
+        """notice_query.fetch_notice_rows 와 같은 행 모양."""
+        f = _RECORD.unpack_from(self.mm, self.records_off + i * _RECORD.size)
+        nid, deadline, created = f[0], f[1], f[2]
+        title, oneline, topic, url, file_url, departments, thumbnail_url = (
+            self._str(f[k], f[k + 1]) for k in range(3, 17, 2))
+        return (nid, title, date.fromordinal(deadline) if deadline else None, oneline, topic,
+                _EPOCH + created * _US if created != _NO_TIME else None, url, file_url, departments, thumbnail_url)
+
+
+class SharedNoticeIndex:
+    """
+    NoticeIndex 의 읽기 전용 대역 (lookup / ready / stats / build / start_background_refresh / stop).
+    사용:
+        index = SharedNoticeIndex("data/notice_snapshot.bin", today_fn=MessageService.today)
+        index.start_background_refresh()
+        rows = index.lookup("공모전", "컴퓨터", "마감순", today)   # 파일이 없거나 다른 날짜 기준이면 None
+    """
+    def __init__(self, path: str, today_fn: Callable[[], date] = date.today, check_interval: float = 0.2):
+        self.path = path
+        self.today_fn = today_fn
+        self.check_interval = float(check_interval)
+        self._mapped: Optional[_Mapped] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.lookups = 0
+        self.swaps = 0
+
+    @property
+    def ready(self) -> bool:
+        m = self._mapped
+        return m is not None and m.built_for == self.today_fn()
+
+    def generation(self) -> int:
+        """매핑된 스냅샷의 세대 번호 (결과 캐시가 스냅샷과 같은 순간에 무효화되도록)"""
+        m = self._mapped
+        return m.generation if m is not None else -1
+
+    # ---------- 매핑 ----------
+    def build(self) -> None:
+        """파일이 바뀌었으면 새로 매핑 (없으면 그대로)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        m = self._mapped
+        if m is not None and m.ident == (st.st_ino, st.st_mtime_ns, st.st_size):
+            return
+        fresh = _Mapped(self.path)
+        self._mapped = fresh  # 참조만 교체, 이전 매핑은 진행 중인 조회가 끝나면 GC 가 닫음
+        self.swaps += 1
+        logger.info("[NOTICE_SNAPSHOT] mapped - generation=%d notices=%d bytes=%d",
+                    fresh.generation, fresh.count, fresh.nbytes)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.build()
+            except Exception:
+                logger.exception("[NOTICE_SNAPSHOT] map failed (이전 스냅샷/DB 폴백으로 계속 서비스)")
+            self._stop.wait(self.check_interval)
+
+    def start_background_refresh(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="notice-snapshot-map", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------- 조회 ----------
+    def lookup(self, topic: str, department: str, sort_option: Optional[str],
+               today: date, limit: int = 5, after: Optional[PageCursor] = None,
+               department_norms: Sequence[str] = (), topic_norms: Sequence[str] = ()) -> Optional[List[tuple]]:
+        m = self._mapped
+        if m is None or m.built_for != today:
+            return None
+        self.lookups += 1
+
+        tree = m.directory
+        if topic_norms:
+            by_topic = [tree[t] for t in topic_norms if t in tree]
+        else:
+            t_key = normalize_search_key(topic)
+            by_topic = [by_dept for t_norm, by_dept in tree.items() if t_norm.startswith(t_key)]
+        buckets: List[List[int]] = []
+        for by_dept in by_topic:
+            if department_norms:
+                buckets.extend(by_dept[d] for d in department_norms if d in by_dept)
+            else:
+                d_key = normalize_search_key(department)
+                buckets.extend(b for d_norm, b in by_dept.items() if d_norm.startswith(d_key))
+
+        # 정렬 키는 NoticeIndex 의 _deadline_key / _created_key 와 같은 순서
+        # (마감일 없음=0 이 먼저, 작성 시각 없음=_NO_TIME 이 가장 작음)
+        keys = m.keys
+        family = sort_family(sort_option)
+        orders = m.orders
+
+        def created_key(i: int) -> Tuple[int, int]:
+            nid, _deadline, created = keys(i)
+            return created, nid
+
+        def deadline_key(i: int) -> Tuple[int, int]:
+            nid, deadline, _created = keys(i)
+            return deadline, nid
+
+        if family == "created_desc":
+            key = created_key
+            streams: Iterable = heapq.merge(*(reversed(orders[c:c + n]) for _d, c, n in buckets),
+                                            key=key, reverse=True)
+        elif family == "created_asc":
+            key = created_key
+            streams = heapq.merge(*(orders[c:c + n] for _d, c, n in buckets), key=key)
+        else:  # 마감순 (정렬 미지정도 마감순으로)
+            key = deadline_key
+            streams = heapq.merge(*(orders[d:d + n] for d, _c, n in buckets), key=key)
+        after_key = self._cursor_key(after, family) if after is not None else None
+
+        today_ord = today.toordinal()
+        out: List[tuple] = []
+        seen = set()
+        for i in streams:
+            nid, deadline, _created = keys(i)
+            if nid in seen:
+                continue
+            if after_key is not None:
+                k = key(i)
+                if (k >= after_key) if family == "created_desc" else (k <= after_key):
+                    continue
+            if deadline and deadline < today_ord:
+                continue
+            seen.add(nid)
+            out.append(m.row(i))
+            if len(out) >= limit:
+                break
+        return out
+
+    @staticmethod
+    def _cursor_key(after: PageCursor, family: str) -> Tuple[int, int]:
+        if family == "deadline":
+            return (after.deadline.toordinal() if after.deadline else 0, after.id)
+        return (_micros(after.created_at), after.id)
+
+    def stats(self) -> Dict[str, object]:
+        m = self._mapped
+        return {
+            "ready": self.ready,
+            "size": m.count if m else 0,
+            "topics": len(m.directory) if m else 0,
+            "built_for": m.built_for.isoformat() if m else None,
+            "generation": m.generation if m else None,
+            "bytes": m.nbytes if m else 0,
+            "lookups": self.lookups,
+            "swaps": self.swaps,
+        }
+
+
+# ---------- 적재기 ----------
+def main():
+    from configs.db_config import DB_POOL_CONFIG
+    from scripts.serving.message_service import MessageService, get_db_connection
+    from scripts.serving.notice_index import NoticeIndex
+    from scripts.utils.cache_utils import NOTICE_GENERATION
+    from scripts.utils.db_pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="여러 워커가 매핑할 활성 공지 스냅샷 파일 적재기")
+    parser.add_argument("--path", default=os.getenv("NOTICE_SNAPSHOT_PATH") or "data/notice_snapshot.bin")
+    parser.add_argument("--interval", type=float, default=1.0, help="초, 세대 번호(수집) 확인 주기")
+    parser.add_argument("--once", action="store_true", help="한 번 쓰고 종료")
+    args = parser.parse_args()
+
+    def publish(records, today, generation):
+        t0 = time.perf_counter()
+        size = write_snapshot(args.path, records, today, generation)
+        logger.info("[NOTICE_SNAPSHOT] published - generation=%s bytes=%d in %.3fs",
+                    generation, size, time.perf_counter() - t0)
+
+    pool = ConnectionPool(get_db_connection, **{**DB_POOL_CONFIG, "max_size": 1})
+    index = NoticeIndex(pool.connection, generation_source=NOTICE_GENERATION.current,
+                        today_fn=MessageService.today, refresh_interval=args.interval, on_publish=publish)
+    if args.once:
+        index.build()
+        pool.close()
+        return
+    index.start_background_refresh()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        index.stop()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+serving/observability.py
+
+웹훅(/message, /menu) 계측값을 모아 /metrics (Prometheus 텍스트)와 /healthz 로 내보냅니다.
+
+- STAGE_SECONDS{route, stage, topic, sort}: 구간별 소요 시간
+  (json_parse, utterance_parse, cache_lookup, index_lookup, search_lookup, db_acquire, db_execute,
+   db_fetch, card_render, serialize, menu_lookup, menu_load)
+- REQUEST_SECONDS{route, outcome, topic, sort}: 요청 전체 소요 시간
+  outcome: cache / index / topn / db / search / callback / text / busy / invalid_json (/menu 는 snapshot / load)
+- CALLBACK_SECONDS{result}: 콜백 작업 제출 ~ 결과 POST 완료 (serving/callback.py)
+- DB 풀, 결과 캐시, 메모리 인덱스, 식단 스냅샷, 콜백 작업자 stats() 는 gauge 로
+- 요청 로그: 요청마다 JSON 한 줄(rid, route, status, outcome, 구간별 ms)을 큐에 넣고
+  백그라운드 스레드가 logs/requests.jsonl 에 씀. 전체 페이로드는 REQUEST_LOG_SAMPLE_RATE 비율만
+  (요청 스레드는 로그 I/O 를 기다리지 않음, 큐가 차면 버리고 dropped 로 셈)
+
+사용 (app.py):
+    timer = StageTimer()
+    rid = request_id(request.headers)
+    ...
+    record("message", timer, rid, data)
+"""
+
+from __future__ import annotations
+import random
+import time
+import uuid
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from configs.serving_config import get_serving_config
+from scripts.utils.metrics import Histogram, StageTimer, render_gauges
+from scripts.serving.callback import CALLBACK_SECONDS
+from scripts.utils.log_utils import init_runtime_logger, init_request_logger, request_log_dropped
+
+logger = init_runtime_logger()
+
+__all__ = ["STAGE_SECONDS", "REQUEST_SECONDS", "request_id", "record", "render_metrics", "health", "CONTENT_TYPE"]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_SECONDS = Histogram(
+    "knuchat_stage_seconds", "웹훅 처리 구간별 소요 시간(초)", ("route", "stage", "topic", "sort"),
+)
+REQUEST_SECONDS = Histogram(
+    "knuchat_request_seconds", "웹훅 요청 전체 소요 시간(초)", ("route", "outcome", "topic", "sort"),
+)
+
+
+_LOG_CONFIG = get_serving_config()
+REQUEST_LOG = init_request_logger(
+    queue_size=_LOG_CONFIG.request_log_queue_size,
+    to_stdout=_LOG_CONFIG.request_log_stdout,
+) if _LOG_CONFIG.request_log_enabled else None
+
+
+def request_id(headers: Optional[Mapping[str, str]] = None) -> str:
+    """앞단(App Service 프런트 등)이 준 X-Request-ID 가 있으면 그대로, 없으면 새로."""
+    rid = headers.get("X-Request-ID") if headers is not None else None
+    return rid or uuid.uuid4().hex[:16]
+
+
+def _log_request(route: str, timer: StageTimer, rid: Optional[str], data: Any,
+                 status: int, total: float) -> None:
+    labels = timer.labels
+    line: Dict[str, Any] = {
+        "ts": round(time.time(), 3),
+        "rid": rid,
+        "route": route,
+        "status": status,
+        "outcome": labels.get("outcome", "-"),
+        "topic": labels.get("topic", "-"),
+        "sort": labels.get("sort", "-"),
+        "total_ms": round(total * 1000, 3),
+        "stages_ms": {k: round(v * 1000, 3) for k, v in timer.stages.items()},
+    }
+    if data is not None and random.random() < _LOG_CONFIG.request_log_sample_rate:
+        line["payload"] = data  # 직렬화는 리스너 스레드에서 (요청 처리 후 data 는 바뀌지 않음)
+    REQUEST_LOG.info(line)
+
+
+def record(route: str, timer: StageTimer, rid: Optional[str] = None, data: Any = None,
+           status: int = 200) -> None:
+    """히스토그램에 반영하고 요청 로그 한 줄을 큐에 넣음."""
+    total = timer.elapsed()
+    labels = timer.labels
+    topic, sort = labels.get("topic", "-"), labels.get("sort", "-")
+    for stage, seconds in timer.stages.items():
+        STAGE_SECONDS.observe(seconds, route, stage, topic, sort)
+    REQUEST_SECONDS.observe(total, route, labels.get("outcome", "-"), topic, sort)
+    if REQUEST_LOG is not None:
+        _log_request(route, timer, rid, data, status, total)
+
+
+def render_metrics(service, menu=None, warmup=None) -> str:
+    """service: MessageService, menu: MenuService, warmup: serving.warmup.Warmup (없으면 생략)"""
+    lines = STAGE_SECONDS.render() + REQUEST_SECONDS.render() + CALLBACK_SECONDS.render()
+    lines += render_gauges("knuchat_db_pool", "DB 커넥션 풀", service.pool.stats())
+    lines += render_gauges("knuchat_result_cache", "결과 캐시", service.cache.stats())
+    lines += render_gauges("knuchat_notice_index", "공지 메모리 인덱스", service.index.stats())
+    if service.search_index is not None:
+        lines += render_gauges("knuchat_search_index", "자유 검색 역색인", service.search_index.stats())
+    if service.flights is not None:
+        lines += render_gauges("knuchat_singleflight", "동시 DB 조회 합치기", service.flights.stats())
+    if service.prewarmer is not None:
+        lines += render_gauges("knuchat_result_cache_prewarm", "자정 결과 캐시 다시 채우기", service.prewarmer.stats())
+    if service.callbacks is not None:
+        lines += render_gauges("knuchat_callbacks", "카카오 콜백 작업자", service.callbacks.stats())
+    if menu is not None:
+        lines += render_gauges("knuchat_menu_index", "식단 스냅샷", menu.stats())
+    if warmup is not None:
+        lines += render_gauges("knuchat_warmup", "시작 준비", warmup.stats())
+    if REQUEST_LOG is not None:
+        lines += render_gauges("knuchat_request_log", "요청 로그 큐", {"dropped": request_log_dropped(REQUEST_LOG)})
+    return "\n".join(lines) + "\n"
+
+
+def health(service, menu=None, warmup=None) -> Tuple[bool, Dict[str, Any]]:
+    """
+    준비 상태. DB 에 SELECT 1 이 되고 시작 준비(serving/warmup.py)가 끝났으면 ready
+    (메모리 인덱스는 없어도 DB 폴백으로 답할 수 있으므로 참고용).
+    반환: (ready, 본문 dict)
+    """
+    body: Dict[str, Any] = {
+        "notice_index": service.index.ready,
+        "menu_index": (not menu.index.is_stale()) if menu is not None else None,
+        "warm": warmup.ready if warmup is not None else None,
+    }
+    try:
+        with service.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            finally:
+                cur.close()
+        body["db"] = True
+    except Exception as e:
+        logger.warning("[HEALTHZ] DB check failed - %s", e)
+        body["db"] = False
+    body["ready"] = body["db"] and body["warm"] is not False
+    return body["ready"], body
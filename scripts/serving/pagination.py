@@ -0,0 +1,73 @@
+"""
+serving/pagination.py
+
+/message "더 보기" 용 키셋(keyset) 페이지 커서입니다.
+
+- 마감순: (deadline, id) 기준. SQL Server 처럼 deadline NULL 이 먼저
+- 최신순: (created_at, id) 내림차순 / 오래된순: (created_at, id) 오름차순
+- 커서 = 검색 조건 + 마지막으로 보여준 행의 정렬 키 → JSON → base64url (불투명 토큰)
+  다음 페이지는 이 키 다음부터 인덱스 탐색하므로 앞 페이지를 다시 읽지 않음
+"""
+
+from __future__ import annotations
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+__all__ = ["PAGE_SIZE", "PageCursor", "sort_family", "cursor_after", "encode_cursor", "decode_cursor"]
+
+PAGE_SIZE = 5  # 카카오 캐러셀 한 번에 보여줄 카드 수
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    topic: str
+    department: str
+    sort_option: Optional[str]
+    id: int
+    deadline: Optional[date] = None
+    created_at: Optional[datetime] = None
+
+
+def sort_family(sort_option: Optional[str]) -> str:
+    """정렬 옵션 → 키셋 종류 ('deadline' | 'created_desc' | 'created_asc')"""
+    if sort_option == "최신순":
+        return "created_desc"
+    if sort_option == "오래된순":
+        return "created_asc"
+    return "deadline"  # 마감순, 미지정
+
+
+def cursor_after(row: tuple, topic: str, department: str, sort_option: Optional[str]) -> PageCursor:
+    """마지막으로 보여준 행(fetch_notice_rows 모양)으로 다음 페이지 커서 생성."""
+    notice_id, _title, deadline, _oneline, _topic, created_at = row[:6]
+    if isinstance(deadline, datetime):
+        deadline = deadline.date()
+    return PageCursor(topic, department, sort_option, int(notice_id),
+                      deadline=deadline, created_at=created_at)
+
+
+def encode_cursor(c: PageCursor) -> str:
+    payload = {
+        "t": c.topic, "d": c.department, "s": c.sort_option, "i": c.id,
+        "dl": c.deadline.isoformat() if c.deadline else None,
+        "ca": c.created_at.isoformat() if c.created_at else None,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Optional[PageCursor]:
+    """잘못된/변조된 토큰이면 None."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        p = json.loads(raw.decode("utf-8"))
+        return PageCursor(
+            topic=str(p["t"]), department=str(p["d"]), sort_option=p.get("s"), id=int(p["i"]),
+            deadline=date.fromisoformat(p["dl"]) if p.get("dl") else None,
+            created_at=datetime.fromisoformat(p["ca"]) if p.get("ca") else None,
+        )
+    except Exception:
+        return None
@@ -0,0 +1,112 @@
+"""
+serving/prewarm.py
+
+자정 결과 캐시 다시 채우기. 아침 첫 요청들이 한꺼번에 DB 로 몰리지 않게 합니다.
+
+- 결과 캐시 항목은 보여준 카드의 가장 이른 마감일이 지나는 KST 자정에 만료됨 (MessageService._cache_page)
+  → 오늘 마감 카드가 있는 조합(대부분 마감순)만 자정에 빠지고, 나머지는 그대로 씀
+- MidnightPrewarmer 는 KST 자정 직후 하루 동안 가장 많이 찾은 조합 size 개를
+  새 날짜 기준으로 다시 조회해 캐시에 넣음 (ttl: 아침 피크까지 버티도록 길게)
+- 조회 횟수는 MessageService.demand(utils.cache_utils.DemandCounter)가 모으고, 돌 때마다 새로 셈
+
+사용:
+    prewarmer = MidnightPrewarmer(service, size=50, ttl=6 * 3600)
+    prewarmer.start()          # 백그라운드 스레드
+    prewarmer.run_once()       # 바로 한 번 (점검/벤치마크용)
+"""
+
+from __future__ import annotations
+import dataclasses
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from scripts.utils.cache_utils import next_kst_midnight
+from scripts.utils.db_pool import PoolTimeoutError
+from scripts.utils.log_utils import init_runtime_logger
+
+if TYPE_CHECKING:
+    from scripts.serving.message_service import MessageService
+
+logger = init_runtime_logger()
+
+__all__ = ["MidnightPrewarmer"]
+
+
+class MidnightPrewarmer:
+    """
+    size: 다시 채울 조합 수 (0 이면 아무것도 안 함)
+    ttl: 다시 채운 항목의 유효 시간(초). 마감일·세대 번호 만료는 그대로 적용
+    delay: 자정 뒤 기다릴 최대 초 (여러 워커가 동시에 DB 를 두드리지 않도록 0~delay 사이 무작위)
+    """
+    def __init__(self, service: "MessageService", size: int = 50, ttl: float = 6 * 3600, delay: float = 30.0):
+        self.service = service
+        self.size = int(size)
+        self.ttl = float(ttl)
+        self.delay = float(delay)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.runs = 0
+        self.warmed = 0
+        self.failed = 0
+        self.last_run_at = 0.0
+        self.last_seconds = 0.0
+
+    def run_once(self) -> int:
+        """인기 조합을 오늘 날짜로 다시 조회해 캐시에 넣음. 채운 항목 수."""
+        t0 = time.perf_counter()
+        today = self.service.today()
+        warmed = 0
+        for q in self.service.demand.top(self.size, reset=True):
+            if self._stop.is_set():
+                break
+            q = dataclasses.replace(q, today=today)
+            if self.service.cache.get(q.cache_key) is not None:
+                continue  # 오늘 마감 카드가 없어 자정을 넘긴 항목
+            try:
+                self.service.load_page(q, ttl=self.ttl)
+                warmed += 1
+            except PoolTimeoutError:
+                self.failed += 1
+                break  # 풀이 바쁘면 요청에 양보
+            except Exception:
+                self.failed += 1
+                logger.exception("[PREWARM] load failed - topic=%s department=%s", q.topic, q.department)
+        self.runs += 1
+        self.warmed += warmed
+        self.last_run_at = time.time()
+        self.last_seconds = time.perf_counter() - t0
+        logger.info("[PREWARM] done - warmed=%d in %.2fs", warmed, self.last_seconds)
+        return warmed
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            wake = next_kst_midnight() + random.uniform(0, self.delay)
+            if self._stop.wait(max(wake - time.time(), 0.0)):
+                break
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("[PREWARM] run failed")
+
+    def start(self) -> None:
+        if self._thread is not None or self.size <= 0:
+            return
+        self._thread = threading.Thread(target=self._loop, name="result-cache-prewarm", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "tracked_keys": len(self.service.demand),
+            "runs": self.runs,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "last_run_at": self.last_run_at,
+            "last_seconds": round(self.last_seconds, 3),
+        }
@@ -0,0 +1,312 @@
+"""
+serving/resolver.py
+
+사용자가 입력한 학과/주제 문자열('컴공', '컴퓨터', '경영', 'AI학과', '공대' ...)을
+분류 프롬프트(prompt_template.TEST_PROMPT_KR)의 허용 값으로 바꿔 주는 해석기입니다.
+DB/메모리 인덱스는 LIKE 접두 탐색 대신 정규화 컬럼 정확 일치(IN)로 찾을 수 있습니다.
+
+해석 순서 (정규화 키 = 공백 제거 + 소문자):
+1) 별칭 표: 약칭, 접미어('학과', '전공', '과' ...)를 뗀 이름, 단과대학명(→ 소속 학과 전체)
+2) 접두 트라이: 허용 값/별칭 중 입력으로 시작하는 것 전부 (기존 LIKE 'x%' 와 같은 범위)
+3) 오타 색인(대칭 삭제): FUZZY_MIN_LENGTH 글자 이상 입력만, 편집 거리 1(5글자 이상은 2) 이내에서
+   가장 가까운 키가 하나일 때만 (동률이면 추측하지 않음)
+셋 다 실패하면 빈 튜플 → 호출 쪽에서 기존 접두 LIKE 로 폴백
+"""
+
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from scripts.utils.key_utils import normalize_search_key
+from scripts.llm_tasks.prompt_template import TEST_PROMPT_KR
+
+__all__ = ["Canonical", "Resolver", "parse_prompt_vocabulary", "default_resolver", "FUZZY_MIN_LENGTH"]
+
+ALL_DEPARTMENTS = "전체"
+
+# 접미어를 뗀 이름을 별칭으로 ('수학' → 수학과, '화학' → 화학전공)
+_SUFFIXES = ("학전공", "학과", "전공", "학부", "과")
+
+# 이보다 짧은 입력은 오타 교정을 하지 않음: 두세 글자에서 한 글자 차이는 다른 말
+# ('장학' → 약학과, '공대' → 공모전, '수의' → 수강신청 처럼 엉뚱한 카드를 자신 있게 보여주게 됨)
+FUZZY_MIN_LENGTH = 4
+
+# 사람이 자주 쓰는 약칭 → 허용 값(여러 개면 모두). 키는 정규화 전 형태로 적어도 됨
+DEPARTMENT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "컴공": ("컴퓨터공학과",),
+    "컴퓨터": ("컴퓨터공학과",),
+    "전전": ("전기전자공학과",),
+    "전자": ("전자공학과",),
+    "AI학과": ("AI융합학과",),
+    "인공지능": ("AI융합학과",),
+    "기계": ("기계의용메카트로닉스공학과",),
+    "경영": ("경영학전공",),
+    "회계": ("회계학전공",),
+    "경제": ("경제학전공",),
+    "통계": ("정보통계학전공",),
+    "관광": ("관광경영학과",),
+    "무역": ("국제무역학과",),
+    "국문": ("국어국문학전공",),
+    "영문": ("영어영문학전공",),
+    "독문": ("독어독문학전공",),
+    "불문": ("불어불문학전공",),
+    "중문": ("중어중문학전공",),
+    "일문": ("일본학전공",),
+    "정외": ("정치외교학과",),
+    "미컴": ("미디어커뮤니케이션학과",),
+    "신방": ("미디어커뮤니케이션학과",),
+    "문인": ("문화인류학과",),
+    "국교": ("국어교육과",),
+    "영교": ("영어교육과",),
+    "수교": ("수학교육과",),
+    "체교": ("체육교육과",),
+    "화공": ("화학공학전공",),
+    "환공": ("환경공학전공",),
+    "생공": ("생물공학전공",),
+    "식공": ("식품생명공학과",),
+    "산공": ("스마트산업공학과",),
+    "수의": ("수의예과", "수의학과"),
+    "의대생": ("의예과", "의학과"),
+    "데사": ("데이터사이언스학과",),
+    "사보": ("사이버보안융합학과",),
+    "자전": ("자유전공학부",),
+    "자율전공": ("자유전공학부",),
+}
+
+# 단과대학 약칭 → 프롬프트의 단과대학명
+COLLEGE_ALIASES: Dict[str, str] = {
+    "공대": "문화예술·공과대학",
+    "공과대학": "문화예술·공과대학",
+    "예술대": "문화예술·공과대학",
+    "농생대": "농업생명과학대학",
+    "동생대": "동물생명과학대학",
+    "사회대": "사회과학대학",
+    "사과대": "사회과학대학",
+    "산림대": "산림환경과학대학",
+    "의생대": "의생명과학대학",
+    "자연대": "자연과학대학",
+    "자과대": "자연과학대학",
+    "미래융합": "미래융합가상학과",
+}
+
+TOPIC_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "장학금": ("장학",),
+    "채용": ("취업",),
+    "일자리": ("취업",),
+    "학식": ("금주식단",),
+    "식단": ("금주식단",),
+    "메뉴": ("금주식단",),
+    "수강": ("수강신청",),
+    "공모": ("공모전",),
+}
+
+
+class Canonical(NamedTuple):
+    id: int
+    name: str      # 프롬프트 원문 그대로 (DB department/topic 값)
+    norm: str      # department_norm / topic_norm 값
+
+
+def parse_prompt_vocabulary(prompt: str = TEST_PROMPT_KR) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    분류 프롬프트에서 (주제 목록, {단과대학: [학과...]}) 추출.
+    단과대학 없이 한 줄로 적힌 학과('- 자유전공학부')는 자기 이름을 단과대학으로 둠.
+    """
+    topic_block = prompt.split("- topic: 다음 중 하나")[1].splitlines()[1]
+    topics = [t.strip() for t in topic_block.strip().lstrip("-").split(",") if t.strip()]
+
+    colleges: Dict[str, List[str]] = {}
+    section = prompt.split("### 학과 목록")[1].split("-----")[0]
+    for line in section.splitlines():
+        line = line.strip()
+        m = re.match(r"^- ([^:]+):\s*(.+)$", line)
+        if m:
+            colleges.setdefault(m.group(1).strip(), []).extend(
+                d.strip() for d in m.group(2).split(",") if d.strip()
+            )
+        elif line.startswith("- ") and not line.startswith("- ※"):
+            name = line[2:].strip()
+            colleges.setdefault(name, []).append(name)
+    return topics, colleges
+
+
+def _edit_distance(a: str, b: str, bound: int) -> int:
+    """레벤슈타인 거리. bound 를 넘는 게 확실하면 bound + 1 로 조기 종료."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > bound:
+            return bound + 1
+        prev = cur
+    return prev[-1]
+
+
+class _Trie:
+    """접두 탐색용. 노드마다 그 아래 모든 키가 가리키는 값의 합집합을 미리 들고 있음."""
+    __slots__ = ("children", "below")
+
+    def __init__(self):
+        self.children: Dict[str, _Trie] = {}
+        self.below: FrozenSet[int] = frozenset()
+
+    def insert(self, key: str, ids: FrozenSet[int]) -> None:
+        node = self
+        node.below |= ids
+        for ch in key:
+            node = node.children.setdefault(ch, _Trie())
+            node.below |= ids
+
+    def prefixed(self, prefix: str) -> FrozenSet[int]:
+        node = self
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return frozenset()
+        return node.below
+
+
+def _deletes(key: str, depth: int) -> set:
+    """key 에서 글자를 최대 depth 개 지운 문자열 전부 (자기 자신 포함)."""
+    out, frontier = {key}, {key}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        out |= frontier
+    return out
+
+
+class _FuzzyIndex:
+    """
+    대칭 삭제(symmetric delete) 색인. 키마다 글자를 최대 max_distance 개 지운 형태를 미리 넣어 두고,
+    조회 때도 입력에서 지운 형태로 후보를 찾은 뒤 편집 거리로 확인함.
+    (BK-트리는 키 길이가 제각각인 한글 학과명에서 가지치기가 거의 안 돼 ms 단위가 걸림)
+    """
+    __slots__ = ("max_distance", "keys", "by_delete")
+
+    def __init__(self, items: Iterable[Tuple[str, FrozenSet[int]]], max_distance: int = 2):
+        self.max_distance = max_distance
+        self.keys: Dict[str, FrozenSet[int]] = {}
+        for key, ids in items:
+            self.keys[key] = self.keys.get(key, frozenset()) | ids
+        self.by_delete: Dict[str, List[str]] = {}
+        for key in self.keys:
+            for form in _deletes(key, max_distance):
+                self.by_delete.setdefault(form, []).append(key)
+
+    def nearest(self, key: str, bound: int) -> FrozenSet[int]:
+        """
+        거리 bound 이내에서 가장 가까운 키의 값. 없거나, 가장 가까운 키가 여럿인데
+        서로 다른 값을 가리키면(동률) 빈 집합.
+        """
+        bound = min(bound, self.max_distance)
+        candidates = set()
+        for form in _deletes(key, bound):
+            candidates.update(self.by_delete.get(form, ()))
+        best, found, tied = bound + 1, frozenset(), False
+        for cand in candidates:
+            d = _edit_distance(key, cand, bound)
+            if d < best:
+                best, found, tied = d, self.keys[cand], False
+            elif d == best and self.keys[cand] != found:
+                tied = True
+        return found if best <= bound and not tied else frozenset()
+
+
+class _Vocabulary:
+    """허용 값 목록 하나(학과 또는 주제)에 대한 별칭 표 + 접두 트라이 + 오타 색인."""
+
+    def __init__(self, names: Iterable[str], aliases: Dict[str, Iterable[str]],
+                 strip_suffixes: bool = False, cache_size: int = 4096):
+        self.entries: List[Canonical] = []
+        by_norm: Dict[str, int] = {}
+        for name in names:
+            norm = normalize_search_key(name)
+            if norm not in by_norm:
+                by_norm[norm] = len(self.entries)
+                self.entries.append(Canonical(len(self.entries), name, norm))
+        self.by_norm = by_norm
+
+        # 별칭: 1) 접미어 뗀 이름 2) 명시 별칭 (같은 키면 합집합)
+        alias_ids: Dict[str, FrozenSet[int]] = {}
+        if strip_suffixes:
+            for e in self.entries:
+                for suffix in _SUFFIXES:
+                    if e.norm.endswith(suffix) and len(e.norm) > len(suffix) + 1:
+                        stem = e.norm[:-len(suffix)]
+                        alias_ids[stem] = alias_ids.get(stem, frozenset()) | {e.id}
+                        break
+        for alias, targets in aliases.items():
+            ids = frozenset(by_norm[normalize_search_key(t)] for t in targets)
+            key = normalize_search_key(alias)
+            alias_ids[key] = alias_ids.get(key, frozenset()) | ids
+        # 별칭 키가 허용 값 자체와 같으면 허용 값 쪽이 우선
+        self.aliases = {k: v for k, v in alias_ids.items() if k not in by_norm}
+
+        self.trie = _Trie()
+        for e in self.entries:
+            self.trie.insert(e.norm, frozenset({e.id}))
+        for key, ids in self.aliases.items():
+            self.trie.insert(key, ids)
+        self.fuzzy = _FuzzyIndex([(e.norm, frozenset({e.id})) for e in self.entries]
+                              + list(self.aliases.items()))
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, key: str) -> Tuple[Canonical, ...]:
+        if not key:
+            return ()
+        ids = self.aliases.get(key) or self.trie.prefixed(key)
+        if not ids and len(key) >= FUZZY_MIN_LENGTH:
+            ids = self.fuzzy.nearest(key, 1 if len(key) < 5 else 2)
+        return tuple(self.entries[i] for i in sorted(ids))
+
+
+class Resolver:
+    """
+    사용:
+        resolver = default_resolver()
+        resolver.departments("컴공")   # (Canonical(id=.., name='컴퓨터공학과', norm='컴퓨터공학과'),)
+        resolver.departments("IT대학") # IT대학 소속 학과 전체
+        resolver.topics("장학금")      # (Canonical(.., name='장학', ..),)
+    """
+
+    def __init__(self, topics: Iterable[str], colleges: Dict[str, List[str]]):
+        self.colleges = {c: list(dict.fromkeys(members)) for c, members in colleges.items()}
+        names = [d for members in self.colleges.values() for d in members] + [ALL_DEPARTMENTS]
+
+        aliases: Dict[str, Tuple[str, ...]] = dict(DEPARTMENT_ALIASES)
+        for college, members in self.colleges.items():
+            if members == [college]:
+                continue  # '자유전공학부' 처럼 학과 자신
+            forms = {college, college.replace("·", "")}
+            if college.endswith("대학"):
+                forms.add(college[:-1])  # '사범대학' → '사범대'
+            for form in forms:
+                aliases[form] = tuple(members)
+        for short, college in COLLEGE_ALIASES.items():
+            aliases[short] = tuple(self.colleges[college])
+
+        self._departments = _Vocabulary(names, aliases, strip_suffixes=True)
+        self._topics = _Vocabulary(topics, TOPIC_ALIASES)
+
+    def department_names(self) -> List[str]:
+        """허용 학과명 ('전체' 제외, 중복 제거, 프롬프트 순서)."""
+        return [e.name for e in self._departments.entries if e.name != ALL_DEPARTMENTS]
+
+    def topic_names(self) -> List[str]:
+        return [e.name for e in self._topics.entries]
+
+    def departments(self, text: Optional[str]) -> Tuple[Canonical, ...]:
+        return self._departments.resolve(normalize_search_key(text))
+
+    def topics(self, text: Optional[str]) -> Tuple[Canonical, ...]:
+        return self._topics.resolve(normalize_search_key(text))
+
+
+@lru_cache(maxsize=1)
+def default_resolver() -> Resolver:
+    topics, colleges = parse_prompt_vocabulary()
+    return Resolver(topics, colleges)
@@ -0,0 +1,375 @@
+"""
+serving/search_index.py
+
+'해커톤', '토익 지원금' 처럼 주제/학과 형식이 아닌 자유 검색어를 DB LIKE 스캔 없이 찾는
+프로세스 메모리 역색인(inverted index)입니다.
+
+토큰화 (한국어는 띄어쓰기/조사가 제각각이라 형태소 대신 글자 n-gram):
+- 소문자 + 한글/영문/숫자만 남기고 어절로 나눔
+- 어절마다 글자 2-gram, 3-gram (한 글자 어절은 그대로)
+  '토익 지원금' → 토익 / 지원, 원금, 지원금
+
+점수 (BM25F 근사):
+- 필드 가중치 title 3.0 · oneline 1.5 · OCR 1.0 을 곱한 tf 를 합쳐 문서 하나의 tf 로
+- score = Σ idf(t) · tf·(k1+1) / (tf + k1·(1 - b + b·dl/avgdl))
+- 질의 n-gram 의 절반 이상이 들어 있는 문서만 (오타/한 글자 겹침으로 엉뚱한 공지가 걸리지 않도록)
+- 마감 지난 공지 제외, 동점이면 마감 빠른 순
+
+갱신 (serving/notice_index.py 와 같은 방식):
+- build(): 활성 공지(llm_status=1, 마감 전) + notice_ocr_text 전체 적재
+- refresh(): 마지막 변경 표시(serving/notice_changes.py) 이후 바뀐 공지만 다시 읽어 문서 단위로 교체,
+  활성 id 목록에 없는 문서는 삭제
+- on_notice_inserted(): db_tasks.insertion.add_insert_listener 로 등록하면
+  같은 프로세스에서 insert_notice_all 이 쓴 공지를 바로 반영
+- 다른 프로세스(수집 파이프라인)가 쓴 공지는 NOTICE_GENERATION 이 바뀌면 refresh
+"""
+
+from __future__ import annotations
+import heapq
+import math
+import re
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from scripts.utils.log_utils import init_runtime_logger
+from scripts.utils.sql_dialect import SQLITE, dialect_of, sqlite_card_columns
+from scripts.serving.notice_changes import current_mark, scope, active_ids
+
+logger = init_runtime_logger()
+
+__all__ = ["tokenize", "SearchIndex"]
+
+OCR_MAX_CHARS = 2000     # OCR 원문은 길고 잡음이 많아 앞부분만 색인
+FIELD_WEIGHTS = (3.0, 1.5, 1.0)  # title, oneline, ocr_text
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_COVERAGE = 0.5
+
+_SEARCH_SQL = """
+SELECT
+    n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
+    a.file_url,
+    dep.departments,
+    a.thumbnail_url,
+    o.ocr_text
+FROM dbo.notice n
+LEFT JOIN dbo.notice_ocr_text o ON o.notice_id = n.id
+OUTER APPLY (
+    SELECT STRING_AGG(department, ', ') AS departments
+    FROM dbo.notice_department
+    WHERE notice_id = n.id
+) dep
+OUTER APPLY (
+    SELECT TOP 1 file_url, thumbnail_url
+    FROM dbo.notice_attachment
+    WHERE notice_id = n.id
+    ORDER BY file_order ASC
+) a
+WHERE n.llm_status = 1
+  AND {scope}
+  AND (n.deadline IS NULL OR n.deadline >= ?)
+"""
+
+# SQLite 백엔드(utils/sqlite_backend.py)용 — OUTER APPLY 대신 상관 서브쿼리, 열 순서 동일
+_SEARCH_SQL_SQLITE = """
+SELECT
+    n.id, n.title, n.deadline, n.oneline, n.topic, n.created_at, n.url,
+    a.file_url,
+    {departments},
+    a.thumbnail_url,
+    o.ocr_text
+FROM dbo.notice n
+LEFT JOIN dbo.notice_ocr_text o ON o.notice_id = n.id
+{attachment_join}
+WHERE n.llm_status = 1
+  AND {{scope}}
+  AND (n.deadline IS NULL OR n.deadline >= ?)
+""".format(**sqlite_card_columns())
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """글자 2-gram + 3-gram (중복 포함, 순서대로)."""
+    out: List[str] = []
+    for word in _WORD.findall((text or "").lower()):
+        if len(word) == 1:
+            out.append(word)
+            continue
+        out.extend(word[i:i + 2] for i in range(len(word) - 1))
+        out.extend(word[i:i + 3] for i in range(len(word) - 2))
+    return out
+
+
+def _as_date(v):
+    if v is None:
+        return None
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    return date.fromisoformat(str(v)[:10])
+
+
+class _Doc:
+    __slots__ = ("row", "deadline", "length", "terms")
+
+    def __init__(self, row: tuple, deadline: Optional[date], length: float, terms: Dict[str, float]):
+        self.row = row              # notice_query.fetch_notice_rows 와 같은 행 모양 (카드 렌더링용)
+        self.deadline = deadline
+        self.length = length        # 가중 문서 길이
+        self.terms = terms          # n-gram → 가중 tf (삭제/교체 시 postings 정리용)
+
+
+def _make_doc(row: tuple, ocr_text: Optional[str]) -> _Doc:
+    title, oneline = row[1], row[3]
+    terms: Dict[str, float] = {}
+    length = 0.0
+    for text, weight in zip((title, oneline, (ocr_text or "")[:OCR_MAX_CHARS]), FIELD_WEIGHTS):
+        grams = tokenize(text)
+        length += weight * len(grams)
+        for g in grams:
+            terms[g] = terms.get(g, 0.0) + weight
+    deadline = _as_date(row[2])
+    return _Doc((row[0], row[1], deadline) + tuple(row[3:10]), deadline, length, terms)
+
+
+class _Corpus:
+    """문서 + postings. 변경은 SearchIndex._lock 안에서만."""
+    __slots__ = ("docs", "postings", "total_length")
+
+    def __init__(self):
+        self.docs: Dict[int, _Doc] = {}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.total_length = 0.0
+
+    def remove(self, notice_id: int) -> None:
+        doc = self.docs.pop(notice_id, None)
+        if doc is None:
+            return
+        self.total_length -= doc.length
+        for g in doc.terms:
+            plist = self.postings.get(g)
+            if plist is not None:
+                plist.pop(notice_id, None)
+                if not plist:
+                    del self.postings[g]
+
+    def add(self, doc: _Doc) -> None:
+        nid = doc.row[0]
+        self.remove(nid)
+        self.docs[nid] = doc
+        self.total_length += doc.length
+        for g, tf in doc.terms.items():
+            self.postings.setdefault(g, {})[nid] = tf
+
+    def prune(self, today: date) -> None:
+        for nid in [nid for nid, d in self.docs.items() if d.deadline is not None and d.deadline < today]:
+            self.remove(nid)
+
+
+class SearchIndex:
+    """
+    사용:
+        index = SearchIndex(pool.connection)
+        index.build()
+        rows = index.search("토익 지원금", today, limit=5)   # 준비 전이면 None
+    """
+    def __init__(self, connection_factory: Callable, generation_source: Optional[Callable[[], int]] = None,
+                 today_fn: Callable[[], date] = date.today,
+                 refresh_interval: float = 30.0, full_rebuild_interval: float = 1800.0):
+        self.connection_factory = connection_factory  # with connection_factory() as conn:
+        self.generation_source = generation_source
+        self.today_fn = today_fn
+        self.refresh_interval = float(refresh_interval)
+        self.full_rebuild_interval = float(full_rebuild_interval)
+
+        self._corpus = _Corpus()
+        self._built_for: Optional[date] = None
+        self._mark: Optional[int] = None  # 다음 갱신이 볼 변경 표시 (None 이면 전체 재적재)
+        self._generation = None
+        self._last_full = 0.0
+        self._lock = threading.Lock()         # 문서/postings 변경과 검색
+        self._write_lock = threading.Lock()   # build/refresh 직렬화 (DB 읽는 동안 검색은 계속)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.searches = 0
+        self.refreshes = 0
+        self.full_builds = 0
+        self.inserted = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._built_for is not None and self._built_for == self.today_fn()
+
+    # ---------- 적재 ----------
+    def _fetch(self, conn, since: Optional[int], today: date) -> List[_Doc]:
+        """since(변경 표시)가 None 이면 활성 공지 전체, 아니면 그 뒤 바뀐 활성 공지"""
+        dialect = dialect_of(conn)
+        where, params = scope("n.id", since, dialect)
+        sql = _SEARCH_SQL_SQLITE if dialect == SQLITE else _SEARCH_SQL
+        cur = conn.cursor()
+        try:
+            cur.execute(sql.format(scope=where), *params, today)
+            return [_make_doc(row[:10], row[10]) for row in cur.fetchall()]
+        finally:
+            cur.close()
+
+    def build(self) -> None:
+        """전체 재적재. 새 구조를 다 만든 뒤 참조만 교체."""
+        with self._write_lock:
+            today = self.today_fn()
+            gen = self.generation_source() if self.generation_source else None
+            with self.connection_factory() as conn:
+                mark = current_mark(conn)
+                docs = self._fetch(conn, None, today)
+            corpus = _Corpus()
+            for doc in docs:
+                corpus.add(doc)
+            with self._lock:
+                self._corpus = corpus
+                self._built_for = today
+            self._mark = mark
+            self._generation = gen
+            self._last_full = time.monotonic()
+            self.full_builds += 1
+            logger.info("[SEARCH_INDEX] built - notices=%d terms=%d mark=%s",
+                        len(docs), len(corpus.postings), mark)
+
+    def refresh(self) -> int:
+        """마지막 변경 표시 이후 바뀐 공지만 다시 읽어 교체. 반환: 읽은 공지 수"""
+        if self._mark is None:
+            # 변경 표시가 없는 DB(migrations/0006 전): 전체 재적재 (notice_index 와 같음)
+            self.build()
+            return len(self._corpus.docs)
+        with self._write_lock:
+            today = self.today_fn()
+            gen = self.generation_source() if self.generation_source else None
+            with self.connection_factory() as conn:
+                mark = current_mark(conn)
+                docs = self._fetch(conn, self._mark, today)
+                active = active_ids(conn, today)
+            with self._lock:
+                # 지워졌거나 llm_status/마감일이 바뀌어 빠진 공지
+                for nid in [nid for nid in self._corpus.docs if nid not in active]:
+                    self._corpus.remove(nid)
+                for doc in docs:
+                    self._corpus.add(doc)
+                self._corpus.prune(today)
+            self._mark = mark
+            self._generation = gen
+            self.refreshes += 1
+            return len(docs)
+
+    def on_notice_inserted(self, notice_id: int, parsed: dict) -> None:
+        """
+        insertion.insert_notice_all 리스너. parsed 는 clean_row 결과
+        (title, deadline, topic, oneline, department 리스트, url, image_paths, ocr_text)
+        + insert_notice_all 이 만든 thumbnail_url. 첫 첨부/작성일은 다음 refresh 때 DB 값으로 바뀜.
+        """
+        if self._built_for is None:
+            return  # 아직 build 전이면 build 가 DB 에서 함께 읽음
+        deadline = _as_date(parsed.get("deadline") or None)
+        if deadline is not None and deadline < self.today_fn():
+            return
+        depts = parsed.get("department") or []
+        # parsing_utils.parse_image_paths 와 같은 ';' 구분 (서빙 프로세스에 pandas 를 올리지 않도록 직접)
+        images = [p.strip() for p in str(parsed.get("image_paths") or "").split(";") if p.strip()]
+        row = (notice_id, parsed.get("title") or "", deadline, parsed.get("oneline") or None,
+               parsed.get("topic") or None, datetime.now(), parsed.get("url") or "",
+               images[0] if images else None, ", ".join(depts) if depts else None,
+               parsed.get("thumbnail_url"))
+        doc = _make_doc(row, parsed.get("ocr_text"))
+        with self._lock:
+            self._corpus.add(doc)
+        self.inserted += 1
+
+    # ---------- 백그라운드 갱신 ----------
+    def _tick(self) -> None:
+        if (not self.ready
+                or time.monotonic() - self._last_full >= self.full_rebuild_interval):
+            self.build()
+        elif self.generation_source is None or self.generation_source() != self._generation:
+            n = self.refresh()
+            logger.info("[SEARCH_INDEX] refreshed - fetched=%d size=%d", n, len(self._corpus.docs))
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception:
+                logger.exception("[SEARCH_INDEX] refresh failed (검색은 기존 색인으로 계속)")
+            self._stop.wait(self.refresh_interval)
+
+    def start_background_refresh(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="search-index-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------- 검색 ----------
+    def search(self, text: str, today: date, limit: int = 5,
+               exclude: Sequence[int] = ()) -> Optional[List[tuple]]:
+        """
+        인덱스가 준비되지 않았거나 다른 날짜 기준이면 None.
+        반환: 점수 높은 순 행 (notice_query.fetch_notice_rows 와 같은 모양), 없으면 []
+        """
+        if not self.ready or self._built_for != today:
+            return None
+        self.searches += 1
+        query = list(dict.fromkeys(tokenize(text)))
+        if not query:
+            return []
+        need = math.ceil(len(query) * MIN_COVERAGE)
+        skip = set(exclude)
+
+        scores: Dict[int, float] = {}
+        hits: Dict[int, int] = {}
+        with self._lock:
+            corpus = self._corpus
+            n_docs = len(corpus.docs)
+            if not n_docs:
+                return []
+            avgdl = corpus.total_length / n_docs or 1.0
+            for g in query:
+                plist = corpus.postings.get(g)
+                if not plist:
+                    continue
+                df = len(plist)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for nid, tf in plist.items():
+                    doc = corpus.docs[nid]
+                    norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc.length / avgdl)
+                    scores[nid] = scores.get(nid, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+                    hits[nid] = hits.get(nid, 0) + 1
+            ranked: List[Tuple[float, tuple, int]] = []
+            for nid, score in scores.items():
+                if hits[nid] < need or nid in skip:
+                    continue
+                doc = corpus.docs[nid]
+                if doc.deadline is not None and doc.deadline < today:
+                    continue
+                tie = (doc.deadline is None, doc.deadline or date.max, nid)
+                ranked.append((score, tie, nid))
+            top = heapq.nsmallest(limit, ranked, key=lambda x: (-x[0], x[1]))
+            return [corpus.docs[nid].row for _, _, nid in top]
+
+    def stats(self) -> Dict[str, object]:
+        corpus = self._corpus
+        return {
+            "ready": self.ready,
+            "size": len(corpus.docs),
+            "terms": len(corpus.postings),
+            "built_for": self._built_for.isoformat() if self._built_for else None,
+            "change_mark": self._mark,
+            "searches": self.searches,
+            "refreshes": self.refreshes,
+            "full_builds": self.full_builds,
+            "inserted": self.inserted,
+        }
@@ -0,0 +1,125 @@
+"""
+serving/warmup.py
+
+웹 서버 시작 직후 준비 작업. App Service 콜드 스타트 비용을 첫 사용자 대신 미리 냅니다.
+
+순서 (단계마다 걸린 시간을 stats() 에 남김, 실패해도 다음 단계로 — 요청은 DB 폴백으로 답할 수 있음):
+1) db_pool:      커넥션 n 개를 미리 열어 둠 (ConnectionPool.prefill)
+2) notice_index / search_index / menu_index: 메모리 인덱스 첫 적재
+   (백그라운드 갱신 스레드가 이미 돌고 있으면 중복 적재하지 않고 준비될 때까지 기다림)
+3) lazy_clients: 첫 요청 때 로딩하도록 미룬 모듈 (콜백 HTTP 세션)
+4) result_cache: 자주 찾는 조합(queries)을 파싱 → 조회 → 렌더링까지 한 번씩 돌려 캐시 채움
+끝나면 ready 가 True → /healthz 가 200 (그 전에는 503, App Service 헬스 체크/워밍업 경로가 트래픽을 붙이지 않음)
+
+사용:
+    WARMUP = Warmup(SERVICE, MENU, connections=2, queries=["장학, 전체"])
+    WARMUP.start()       # 백그라운드 스레드 (서버는 바로 포트를 엶)
+    WARMUP.run()         # 동기 (스크립트/벤치마크용)
+"""
+
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from scripts.serving.message_service import MessageQuery
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+__all__ = ["Warmup"]
+
+
+class Warmup:
+    """
+    service: MessageService, menu: MenuService (없으면 생략)
+    connections: 미리 열 커넥션 수 (풀 상한 안에서)
+    queries: 캐시를 채울 발화 ('주제, 학과[, 정렬]')
+    background: 인덱스 백그라운드 갱신이 켜져 있으면 True (직접 적재하지 않고 기다림)
+    index_timeout: 인덱스 준비를 기다릴 최대 초
+    """
+    def __init__(self, service, menu=None, connections: int = 2, queries: Iterable[str] = (),
+                 background: bool = True, index_timeout: float = 60.0):
+        self.service = service
+        self.menu = menu
+        self.connections = int(connections)
+        self.queries = [q for q in queries if q.strip()]
+        self.background = background
+        self.index_timeout = float(index_timeout)
+
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.steps: Dict[str, float] = {}
+        self.failed: List[str] = []
+        self.started_at = 0.0
+        self.seconds = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    # ---------- 단계 ----------
+    def _step(self, name: str, fn: Callable[[], Any]) -> None:
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            self.failed.append(name)
+            logger.exception("[WARMUP] %s failed (계속 진행)", name)
+        self.steps[name] = round(time.perf_counter() - t0, 4)
+
+    def _index(self, index) -> None:
+        if not self.background:
+            index.build()
+            return
+        deadline = time.monotonic() + self.index_timeout
+        while not index.ready:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"index not ready within {self.index_timeout:.0f}s")
+            time.sleep(0.1)
+
+    def _lazy_clients(self) -> None:
+        if self.service.callbacks is not None:
+            self.service.callbacks.session  # requests 로딩 + 세션 생성
+
+    def _prime(self) -> None:
+        for utterance in self.queries:
+            data = {"userRequest": {"utterance": utterance}, "action": {"params": {}}}
+            q = self.service.parse(data)
+            if isinstance(q, MessageQuery) and self.service.cached_page(q) is None:
+                self.service.render(q, self.service.load_page(q))
+
+    def run(self) -> bool:
+        self.started_at = time.time()
+        t0 = time.perf_counter()
+        service = self.service
+        self._step("db_pool", lambda: service.pool.prefill(self.connections))
+        if service.config.notice_index_enabled:
+            self._step("notice_index", lambda: self._index(service.index))
+        if service.search_index is not None:
+            self._step("search_index", lambda: self._index(service.search_index))
+        if self.menu is not None:
+            self._step("menu_index", self.menu.index.ensure_fresh)
+        self._step("lazy_clients", self._lazy_clients)
+        self._step("result_cache", self._prime)
+        self.seconds = time.perf_counter() - t0
+        self._ready.set()
+        logger.info("[WARMUP] done in %.2fs - steps=%s failed=%s", self.seconds, self.steps, self.failed)
+        return not self.failed
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.seconds, 3),
+            "failed": len(self.failed),
+            **{f"step_{k}_seconds": v for k, v in self.steps.items()},
+        }
@@ -0,0 +1,246 @@
+"""
+utils/cache_utils.py
+
+웹훅 응답 결과를 프로세스 안에서 재사용하기 위한 캐시 유틸입니다.
+
+기능:
+- TTLCache: 항목 수 상한(LRU) + TTL + KST 자정 만료를 갖는 스레드 안전 캐시
+  set(..., expires_at=) 로 항목마다 계산한 만료 시각(예: 카드 마감일)을 줄 수 있음
+- next_kst_midnight: 다음 KST 자정 시각(epoch seconds)
+- deadline_expiry: 마감일 목록 중 가장 이른 날이 지나는 KST 자정 (웹훅의 deadline >= today 필터 기준)
+- DemandCounter: 키별 조회 횟수 (자정에 다시 채울 인기 조합 고르기용)
+- GenerationMarker: 수집 파이프라인이 새 공지/식단을 커밋할 때 올리는 세대 번호(파일)
+
+수집(run_ingestion)과 웹 서버는 서로 다른 프로세스이므로, 세대 번호를
+파일로 공유하고 캐시는 세대가 바뀌면 통째로 비웁니다.
+"""
+
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+__all__ = ["KST", "next_kst_midnight", "deadline_expiry", "TTLCache", "DemandCounter", "GenerationMarker", "NOTICE_GENERATION", "MENU_GENERATION"]
+
+KST = ZoneInfo("Asia/Seoul")
+
+DEFAULT_GENERATION_PATH = "data/notice_generation.txt"
+DEFAULT_MENU_GENERATION_PATH = "data/menu_generation.txt"
+
+
+def next_kst_midnight(now: Optional[float] = None) -> float:
+    """now(epoch seconds) 기준 다음 KST 자정의 epoch seconds."""
+    dt = datetime.fromtimestamp(time.time() if now is None else now, tz=KST)
+    midnight = (dt + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp()
+
+
+def deadline_expiry(deadlines: Iterable[Any]) -> Optional[float]:
+    """
+    가장 이른 마감일 다음 날 KST 0시의 epoch seconds (마감일이 없으면 None).
+    웹훅은 deadline >= today 인 공지만 보여주므로, 그 시각부터 해당 카드가 빠짐.
+    """
+    earliest: Optional[date] = None
+    for d in deadlines:
+        if d is None:
+            continue
+        if isinstance(d, datetime):
+            d = d.date()
+        if earliest is None or d < earliest:
+            earliest = d
+    if earliest is None:
+        return None
+    return datetime.combine(earliest + timedelta(days=1), dtime.min, tzinfo=KST).timestamp()
+
+
+class GenerationMarker:
+    """
+    파일 하나에 정수 세대 번호를 저장.
+    - bump(): 세대 +1 (원자적 교체). 수집 쪽에서 커밋 후 호출
+    - current(): 현재 세대. check_interval(초) 동안은 마지막 값을 재사용해 파일 I/O를 줄임
+    """
+    def __init__(self, path: str = DEFAULT_GENERATION_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = float(check_interval)
+        self._lock = threading.Lock()
+        self._cached = 0
+        self._checked_at = 0.0
+
+    def _read(self) -> int:
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def current(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at and (now - self._checked_at) < self.check_interval:
+                return self._cached
+            self._cached = self._read()
+            self._checked_at = now
+            return self._cached
+
+    def bump(self) -> int:
+        with self._lock:
+            gen = self._read() + 1
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(str(gen))
+            os.replace(tmp, self.path)
+            self._cached = gen
+            self._checked_at = time.monotonic()
+            return gen
+
+
+NOTICE_GENERATION = GenerationMarker(os.getenv("NOTICE_GENERATION_PATH", DEFAULT_GENERATION_PATH))
+# 식단은 주 단위로 새로 적재되므로 공지와 따로 둠 (공지 수집이 식단 스냅샷을 버리지 않도록)
+MENU_GENERATION = GenerationMarker(os.getenv("MENU_GENERATION_PATH", DEFAULT_MENU_GENERATION_PATH))
+
+
+class TTLCache:
+    """
+    LRU + TTL 캐시.
+    - max_entries: 최대 항목 수(넘으면 가장 오래 안 쓴 항목부터 제거)
+    - ttl: 항목 유효 시간(초). 단, 다음 KST 자정을 넘기지 않음
+    - expire_at_midnight: False 면 자정 상한 없이 set(..., expires_at=) 로 준 시각을 따름
+    - generation_source: 세대 번호 함수. 값이 바뀌면 캐시 전체 무효화
+    사용:
+        cache = TTLCache(max_entries=512, ttl=300, generation_source=NOTICE_GENERATION.current)
+        hit = cache.get(key)
+        if hit is None:
+            cache.set(key, value)
+    """
+    def __init__(self,
+                 max_entries: int = 512,
+                 ttl: float = 300.0,
+                 expire_at_midnight: bool = True,
+                 generation_source: Optional[Callable[[], int]] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = int(max_entries)
+        self.ttl = float(ttl)
+        self.expire_at_midnight = expire_at_midnight
+        self.generation_source = generation_source
+
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = generation_source() if generation_source else 0
+
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _sync_generation(self) -> None:
+        # 락 안에서 호출
+        if self.generation_source is None:
+            return
+        gen = self.generation_source()
+        if gen != self._generation:
+            self._generation = gen
+            if self._data:
+                self._data.clear()
+            self._invalidations += 1
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            self._sync_generation()
+            item = self._data.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+            expires_at, value = item
+            if now >= expires_at:
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            expires_at: Optional[float] = None) -> None:
+        """expires_at(epoch seconds)을 주면 ttl 과 둘 중 이른 시각에 만료."""
+        now = time.time()
+        until = now + (self.ttl if ttl is None else float(ttl))
+        if expires_at is not None:
+            until = min(until, float(expires_at))
+        if self.expire_at_midnight:
+            until = min(until, next_kst_midnight(now))
+        with self._lock:
+            self._sync_generation()
+            self._data[key] = (until, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "generation": self._generation,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "expirations": self._expirations,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+class DemandCounter:
+    """
+    키별 조회 횟수. note() 는 요청마다 부르므로 가볍게 유지하고,
+    키 종류가 max_keys 를 넘으면 횟수 하위 절반을 버림.
+    사용:
+        demand.note(q.cache_key, q)
+        for q in demand.top(50, reset=True): ...
+    """
+    def __init__(self, max_keys: int = 4096):
+        self.max_keys = max(int(max_keys), 2)
+        self._counts: Dict[Hashable, list] = {}  # key → [횟수, 다시 계산할 때 쓸 값]
+        self._lock = threading.Lock()
+
+    def note(self, key: Hashable, item: Any) -> None:
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                if len(self._counts) >= self.max_keys:
+                    keep = sorted(self._counts.items(), key=lambda kv: kv[1][0], reverse=True)
+                    self._counts = dict(keep[:self.max_keys // 2])
+                self._counts[key] = [1, item]
+            else:
+                entry[0] += 1
+                entry[1] = item
+
+    def top(self, n: int, reset: bool = False) -> List[Any]:
+        """횟수 많은 순 상위 n 개의 값. reset=True 면 집계를 새로 시작 (하루 단위)."""
+        with self._lock:
+            ranked = sorted(self._counts.values(), key=lambda e: e[0], reverse=True)
+            if reset:
+                self._counts = {}
+        return [item for _, item in ranked[:max(n, 0)]]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._counts)
@@ -0,0 +1,266 @@
+"""
+utils/db_pool.py
+
+요청마다 DB에 새로 접속하던 코드(app.py 웹훅 등)를 위한 스레드 안전 커넥션 풀입니다.
+
+기능:
+- ConnectionPool.connection(): with 문으로 커넥션을 빌리고 자동 반납
+- 헬스 체크: 일정 시간 이상 놀던 커넥션은 빌려주기 전에 `SELECT 1`로 확인
+- 재활용: max_age를 넘긴 커넥션은 폐기 후 새로 연결
+- 상한: max_size를 넘으면 timeout 동안 대기, 그래도 없으면 PoolTimeoutError
+- prefill(n): 시작할 때 커넥션을 미리 열어 둠 (첫 사용자가 연결 비용을 내지 않도록)
+- stats(): 대출 횟수, 미스(새 연결) 횟수, 대기 시간 등 통계
+
+pyodbc 전용 코드는 없고, 연결을 만드는 factory만 주입받습니다.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Any, Dict, Optional
+
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+__all__ = ["ConnectionPool", "PoolTimeoutError"]
+
+
+class PoolTimeoutError(Exception):
+    """풀 상한에 도달해 timeout 안에 커넥션을 얻지 못함"""
+    pass
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    간단한 LIFO 커넥션 풀.
+    - factory: 새 DB 연결을 만드는 함수 (예: get_connection)
+    - max_size: 동시에 존재할 수 있는 최대 커넥션 수(대출 중 + 대기 중)
+    - max_age: 커넥션 최대 수명(초). 넘으면 반납/대출 시 폐기
+    - timeout: 상한 도달 시 커넥션을 기다리는 최대 시간(초)
+    - ping_after: 이 시간(초) 이상 놀던 커넥션은 대출 전 헬스 체크
+    사용:
+        pool = ConnectionPool(get_connection, max_size=5)
+        with pool.connection() as conn:
+            cur = conn.cursor()
+    """
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int = 5,
+                 max_age: float = 1800.0,
+                 timeout: float = 3.0,
+                 ping_after: float = 30.0,
+                 health_check_sql: str = "SELECT 1"):
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        self.factory = factory
+        self.max_size = int(max_size)
+        self.max_age = float(max_age)
+        self.timeout = float(timeout)
+        self.ping_after = float(ping_after)
+        self.health_check_sql = health_check_sql
+
+        self._idle: deque[_PooledConnection] = deque()
+        self._total = 0  # 대출 중 + 대기 중 커넥션 수 (연결 중인 슬롯 포함)
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+
+        self._checkouts = 0
+        self._misses = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._recycled = 0
+        self._health_failures = 0
+        self._discarded = 0
+        self._prefilled = 0
+
+    # ---------- 내부 유틸 ----------
+    def _expired(self, pc: _PooledConnection, now: float) -> bool:
+        return self.max_age > 0 and (now - pc.created_at) >= self.max_age
+
+    def _close_quietly(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            logger.exception("[DB_POOL] connection close failed")
+
+    def _is_healthy(self, pc: _PooledConnection, now: float) -> bool:
+        if (now - pc.last_used) < self.ping_after:
+            return True
+        cur = None
+        try:
+            cur = pc.conn.cursor()
+            cur.execute(self.health_check_sql)
+            cur.fetchone()
+            return True
+        except Exception:
+            return False
+        finally:
+            if cur is not None:
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    # ---------- 대출/반납 ----------
+    def acquire(self) -> _PooledConnection:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                if self._idle:
+                    pc = self._idle.pop()  # LIFO: 가장 최근에 쓴(따뜻한) 커넥션부터
+                    break
+                if self._total < self.max_size:
+                    self._total += 1  # 슬롯 예약 후 락 밖에서 연결
+                    pc = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"no connection available within {self.timeout:.1f}s (max_size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._checkouts += 1
+            if waited:
+                elapsed = time.monotonic() - start
+                self._waits += 1
+                self._wait_time_total += elapsed
+                self._wait_time_max = max(self._wait_time_max, elapsed)
+
+        if pc is not None:
+            now = time.monotonic()
+            if self._expired(pc, now):
+                with self._cond:
+                    self._recycled += 1
+                self._close_quietly(pc.conn)
+                pc = None
+            elif not self._is_healthy(pc, now):
+                with self._cond:
+                    self._health_failures += 1
+                logger.warning("[DB_POOL] health check failed, reconnecting")
+                self._close_quietly(pc.conn)
+                pc = None
+
+        if pc is None:
+            # 미스: 새 커넥션 생성 (슬롯은 이미 예약된 상태)
+            try:
+                pc = _PooledConnection(self.factory())
+            except Exception:
+                self._release_slot()
+                raise
+            with self._cond:
+                self._misses += 1
+        return pc
+
+    def release(self, pc: _PooledConnection, broken: bool = False) -> None:
+        now = time.monotonic()
+        if broken or self._closed or self._expired(pc, now):
+            with self._cond:
+                if broken:
+                    self._discarded += 1
+                elif not self._closed:
+                    self._recycled += 1
+            self._close_quietly(pc.conn)
+            self._release_slot()
+            return
+        pc.last_used = now
+        with self._cond:
+            self._idle.append(pc)
+            self._cond.notify()
+
+    def prefill(self, n: int) -> int:
+        """대기 커넥션이 n 개가 되도록 새로 연결(상한 안에서). 반환: 새로 연 수"""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) >= n or self._total >= self.max_size:
+                    return opened
+                self._total += 1  # acquire 와 같이 슬롯 예약 후 락 밖에서 연결
+            try:
+                pc = _PooledConnection(self.factory())
+            except Exception:
+                self._release_slot()
+                raise
+            with self._cond:
+                self._prefilled += 1
+                self._idle.appendleft(pc)  # 요청이 쓰던 따뜻한 커넥션보다 뒤에
+                self._cond.notify()
+            opened += 1
+
+    @contextmanager
+    def connection(self):
+        """
+        with 블록 동안 커넥션을 빌려줌.
+        블록에서 예외가 나면 rollback을 시도하고, rollback도 실패하면 커넥션을 폐기.
+        """
+        pc = self.acquire()
+        broken = False
+        try:
+            yield pc.conn
+        except Exception:
+            try:
+                pc.conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(pc, broken=broken)
+
+    def close(self) -> None:
+        """대기 중인 커넥션을 모두 닫음. 대출 중인 커넥션은 반납 시 닫힘."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for pc in idle:
+            self._close_quietly(pc.conn)
+
+    # ---------- 통계 ----------
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "max_size": self.max_size,
+                "size": self._total,
+                "idle": idle,
+                "in_use": self._total - idle,
+                "checkouts": self._checkouts,
+                "misses": self._misses,
+                "prefilled": self._prefilled,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_total": round(self._wait_time_total, 6),
+                "wait_time_max": round(self._wait_time_max, 6),
+                "wait_time_avg": round(self._wait_time_total / self._waits, 6) if self._waits else 0.0,
+                "recycled": self._recycled,
+                "health_failures": self._health_failures,
+                "discarded": self._discarded,
+            }
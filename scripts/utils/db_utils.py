@@ -4,15 +4,23 @@ utils/db_utils.py
 이 모듈은 데이터베이스 연결 및 공통 삽입 로직을 정의한 유틸리티입니다.
 
 기능:
-- get_connection: DB 연결 객체 생성
+- get_connection: DB 연결 객체 생성 (DB_BACKEND=sqlite 면 utils/sqlite_backend 의 로컬 파일)
+- get_pool: 프로세스 전체가 같이 쓰는 커넥션 풀 (utils/db_pool.ConnectionPool)
+- unit_of_work: 여러 repo 호출을 한 커넥션·한 커서·한 번의 커밋으로 묶는 작업 단위
+- maybe_open: repo 함수들이 직접 부르는 (연결, close 여부) — 넘겨받은 연결 → 진행 중인 작업 단위 → 풀 순서로 고름 (close() 는 반납)
 - insert_and_return_id: 데이터 삽입 후 생성된 PK(ID) 반환
 - insert_data: 일반적인 INSERT 쿼리 실행
 
 다양한 스크립트에서 공통적으로 사용하는 DB 연동 코드를 재사용 가능하게 정리했습니다.
 """
 
-from configs.db_config import DB_CONFIG
-import pyodbc
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from configs.db_config import DB_CONFIG, DB_POOL_CONFIG, DB_BACKEND
+from scripts.utils.db_pool import ConnectionPool
+from scripts.utils.sql_dialect import SQLITE, dialect_of
 from scripts.utils.log_utils import (
     init_runtime_logger,
     capture_unhandled_exception,
@@ -25,8 +33,12 @@ def get_connection():
     DB 연결 객체 반환
     
     Returns: 
-        pyodbc.Connection: DB 연결 객체
+        pyodbc.Connection: DB 연결 객체 (DB_BACKEND=sqlite 면 같은 모양의 sqlite_backend.SqliteConnection)
     """
+    if DB_BACKEND == SQLITE:
+        from scripts.utils import sqlite_backend
+        return sqlite_backend.connect()
+
     conn_str = (
         f"DRIVER={{ODBC Driver 18 for SQL Server}};"
         f"SERVER={DB_CONFIG['host']}, {DB_CONFIG['port']};"
@@ -38,9 +50,183 @@ def get_connection():
     logger.debug("[DB] connecting to %s:%s / db=%s",
                  DB_CONFIG.get('host'), DB_CONFIG.get('port'), DB_CONFIG.get('database'))
     
+    import pyodbc  # SQLite 백엔드만 쓰는 환경은 ODBC 드라이버 없이도 import 되도록 여기서
     return pyodbc.connect(conn_str)
 
-def insert_and_return_id(table_name, columns, values):
+# ---------- 커넥션 풀 / 작업 단위 ----------
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+_LOCAL = threading.local()  # 스레드별 진행 중인 작업 단위 스택
+
+def get_pool() -> ConnectionPool:
+    """
+    프로세스 전체가 같이 쓰는 커넥션 풀 (처음 부를 때 생성, 설정은 DB_POOL_CONFIG)
+    수집/배치 스크립트용. 웹훅은 serving/message_service 가 자기 풀을 따로 가짐
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ConnectionPool(get_connection, **DB_POOL_CONFIG)
+    return _POOL
+
+def _stack() -> list:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+def current_unit_of_work() -> Optional["UnitOfWork"]:
+    """같은 스레드에서 진행 중인 작업 단위 (없으면 None)"""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+class _SharedCursor:
+    """작업 단위 안에서 돌려쓰는 커서. close() 는 무시 (작업 단위가 끝날 때 닫음)"""
+    __slots__ = ("_cur",)
+
+    def __init__(self, cur):
+        object.__setattr__(self, "_cur", cur)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cur, name, value)  # fast_executemany 등
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def close(self):
+        pass
+
+class UnitOfWork:
+    """
+    풀에서 빌린 커넥션 하나로 여러 repo 호출을 묶는 작업 단위.
+    - repo 함수의 conn 자리에 그대로 넘기거나, conn=None 으로 불러도 같은 스레드의 with 블록 안이면 합류
+    - cursor(): 커서 하나를 돌려씀 (다음 호출 전에 fetch 를 끝내야 함 — repo 함수들은 모두 그렇게 씀)
+    - commit(): 미룸. 블록이 정상으로 끝날 때 한 번만 커밋하고, 예외면 전부 롤백
+    - checkpoint(): 블록 중간에 실제로 커밋 (긴 배치를 나눠 커밋할 때)
+
+    사용:
+        with unit_of_work() as uow:
+            notice_id, _ = upsert_notice_keys(uow, title, url, url_hash)
+            add_departments(None, notice_id, depts)   # 같은 작업 단위
+    """
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        self.pool = pool or get_pool()
+        self._pc = None
+        self._cursor: Optional[_SharedCursor] = None
+        self.deferred_commits = 0  # repo 함수가 부른 commit() 중 미룬 횟수
+
+    @property
+    def connection(self):
+        if self._pc is None:
+            raise RuntimeError("unit of work is not active")
+        return self._pc.conn
+
+    def __enter__(self) -> "UnitOfWork":
+        self._pc = self.pool.acquire()
+        _stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        pc, self._pc = self._pc, None
+        cursor, self._cursor = self._cursor, None
+        broken = False
+        try:
+            if cursor is not None:
+                cursor._cur.close()
+            if exc_type is None:
+                pc.conn.commit()
+            else:
+                pc.conn.rollback()
+        except Exception:
+            broken = True  # 커밋/롤백이 실패한 커넥션은 풀에 돌려놓지 않음
+            if exc_type is None:
+                raise
+            logger.exception("[DB] unit of work rollback failed")
+        finally:
+            self.pool.release(pc, broken=broken)
+        return False
+
+    def cursor(self) -> _SharedCursor:
+        if self._cursor is None:
+            self._cursor = _SharedCursor(self.connection.cursor())
+        return self._cursor
+
+    def commit(self) -> None:
+        self.deferred_commits += 1
+
+    def checkpoint(self) -> None:
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        self.connection.rollback()
+
+    def close(self) -> None:
+        pass  # 반납은 with 블록이 끝날 때
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+@contextmanager
+def unit_of_work(pool: Optional[ConnectionPool] = None):
+    """
+    작업 단위 시작. 이미 진행 중이면 거기에 합류 (커밋/롤백은 바깥 블록이 결정)
+    """
+    current = current_unit_of_work()
+    if current is not None:
+        yield current
+        return
+    with UnitOfWork(pool) as uow:
+        yield uow
+
+class _Lease:
+    """작업 단위 밖에서 repo 함수 하나가 쓰는 풀 커넥션. close() 는 닫지 않고 풀에 반납"""
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        self._pc = pool.acquire()
+        self._broken = False
+
+    def rollback(self) -> None:
+        try:
+            self._pc.conn.rollback()
+        except Exception:
+            self._broken = True
+            raise
+
+    def close(self) -> None:
+        pc, self._pc = self._pc, None
+        if pc is None:
+            return
+        try:
+            pc.conn.rollback()  # 커밋하지 않은 변경은 버림 (새 연결을 닫던 때와 같이, 다음 사용자에게 넘기지 않도록)
+        except Exception:
+            self._broken = True
+        self._pool.release(pc, broken=self._broken)
+
+    def __getattr__(self, name):
+        return getattr(self._pc.conn, name)
+
+def maybe_open(conn=None):
+    """
+    repo 함수의 (연결, 다 쓰고 close() 할지)
+    - conn 을 넘겼으면 그것 (pyodbc.Connection 또는 UnitOfWork)
+    - 같은 스레드에 진행 중인 작업 단위가 있으면 거기에 합류
+    - 아니면 프로세스 풀에서 빌림 (close() 가 반납)
+    """
+    if conn is not None:
+        return conn, False
+    uow = current_unit_of_work()
+    if uow is not None:
+        return uow, False
+    return _Lease(get_pool()), True
+
+def insert_and_return_id(table_name, columns, values, conn=None):
     """
     데이터 삽입 후, 생성된 PK(ID) 반환 함수
  
@@ -48,6 +234,7 @@ def insert_and_return_id(table_name, columns, values):
         table_name (str): 테이블 이름
         columns (list): 삽입할 컬럼 이름 리스트
         valus (list): 컬럼에 대응하는 값 리스트
+        conn: 연결 또는 UnitOfWork (없으면 진행 중인 작업 단위 → 풀, maybe_open 참고)
 
     설명:
         - conn: DB에 접속한 연결 객체
@@ -56,17 +243,19 @@ def insert_and_return_id(table_name, columns, values):
 
     placeholders = ", ".join(["?"] * len(values))
     columns_str = ", ".join(columns)
-    sql = f"""
+
+    conn, close_after = maybe_open(conn)
+    cursor = None
+    if dialect_of(conn) == SQLITE:
+        sql = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders}) RETURNING id"
+    else:
+        sql = f"""
     INSERT INTO {table_name} ({columns_str})
     OUTPUT INSERTED.id
     VALUES ({placeholders})
     """
 
-    conn = None
-    cursor = None
-
     try:
-        conn = get_connection()
         cursor = conn.cursor()
 
         logger.debug("[DB] SQL: %s | values(len=%d)", sql, len(values))
@@ -84,7 +273,7 @@ def insert_and_return_id(table_name, columns, values):
             exc=e,
             extra={"table": table_name, "columns": columns},
         )
-        if conn:
+        if close_after:  # 작업 단위 안이면 롤백은 작업 단위가 (예외가 블록 밖으로 나가며)
             try:
                 conn.rollback()
             except Exception:
@@ -96,13 +285,13 @@ def insert_and_return_id(table_name, columns, values):
                 cursor.close()
             except Exception:
                 logger.exception("[DB] cursor close failed")
-        if conn:
+        if close_after:
             try:
                 conn.close()
             except Exception:
                 logger.exception("[DB] connection close failed")
 
-def insert_data(table_name, columns, values):
+def insert_data(table_name, columns, values, conn=None):
     """
     데이터 삽입 함수
     
@@ -110,6 +299,7 @@ def insert_data(table_name, columns, values):
         table_name (str): 테이블 이름
         columns (list): 삽입할 컬럼 이름 리스트
         valus (list): 컬럼에 대응하는 값 리스트
+        conn: 연결 또는 UnitOfWork (없으면 진행 중인 작업 단위 → 풀, maybe_open 참고)
     
     
     설명:
@@ -124,11 +314,10 @@ def insert_data(table_name, columns, values):
     # 최종 insert 쿼리 문자열 생성
     sql = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
 
-    conn = None
+    conn, close_after = maybe_open(conn) # DB 연결 (작업 단위 안이면 그 연결, 아니면 풀에서)
     cursor = None
 
     try:
-        conn = get_connection() #DB 연결 객체 생성
         cursor = conn.cursor() # 커서(cursor) 객체 생성 (SQL 실행 담당)
 
         logger.debug("[DB] SQL: %s | values(len=%d)", sql, len(values))
@@ -148,7 +337,7 @@ def insert_data(table_name, columns, values):
             exc=e,
             extra={"table": table_name, "columns": columns},
         )
-        if conn:
+        if close_after:  # 작업 단위 안이면 롤백은 작업 단위가 (예외가 블록 밖으로 나가며)
             try:
                 conn.rollback()
             except Exception:
@@ -160,7 +349,7 @@ def insert_data(table_name, columns, values):
                 cursor.close()
             except Exception:
                 logger.exception("[DB] cursor close failed")
-        if conn:
+        if close_after:
             try:
                 conn.close()
             except Exception:
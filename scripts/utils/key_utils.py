@@ -9,4 +9,13 @@ def normalize_url(u: str) -> str:
     return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
 
 def sha256_hex(s: str) -> str:
-    return hashlib.sha256((s or "").encode("utf-8")).hexdigest()
\ No newline at end of file
+    return hashlib.sha256((s or "").encode("utf-8")).hexdigest()
+
+def normalize_search_key(s: str) -> str:
+    """검색용 정규화: 공백 제거 + 소문자 (topic_norm / department_norm 컬럼과 같은 규칙)."""
+    return (s or "").replace(" ", "").lower()
+
+def like_prefix(s: str) -> str:
+    """LIKE 'x%' 접두 검색 패턴. 사용자 입력의 와일드카드(%, _, [)는 이스케이프."""
+    escaped = (s or "").replace("[", "[[]").replace("%", "[%]").replace("_", "[_]")
+    return escaped + "%"
@@ -1,6 +1,6 @@
-import os, json, time, logging, traceback
+import os, sys, json, time, queue, atexit, logging, traceback
 from dataclasses import dataclass, asdict
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from typing import Optional, Dict, Any
 
 # ====== 공용 설정 ======
@@ -8,6 +8,7 @@ DEFAULT_LOG_DIR = "logs"
 DEFAULT_ERR_JSONL = "failures.jsonl"
 DEFAULT_FAILED_IDX = "failed_indices.txt"
 DEFAULT_RUNTIME_LOG = "runtime.log"
+DEFAULT_REQUEST_LOG = "requests.jsonl"
 
 PHASE = {
     "OCR": "OCR",
@@ -58,6 +59,75 @@ def init_runtime_logger(log_dir: str = DEFAULT_LOG_DIR,
     logger.addHandler(handler)
     return logger
 
+class _DroppingQueueHandler(QueueHandler):
+    """
+    요청 스레드 쪽 핸들러. 큐에 넣기만 하고(포맷/파일 쓰기는 리스너 스레드),
+    큐가 가득 차면 기다리지 않고 버린 뒤 개수만 셈.
+    """
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record  # 기본 구현은 여기서 format() → 요청 스레드에서 JSON 직렬화가 일어남
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _JsonLineFormatter(logging.Formatter):
+    """logger.info(dict) 로 넘긴 레코드를 한 줄 JSON 으로 (리스너 스레드에서 실행)."""
+    def format(self, record: logging.LogRecord) -> str:
+        msg = record.msg
+        if isinstance(msg, dict):
+            return json.dumps(msg, ensure_ascii=False, separators=(",", ":"), default=str)
+        return json.dumps({"ts": round(record.created, 3), "message": record.getMessage()}, ensure_ascii=False)
+
+
+def init_request_logger(log_dir: str = DEFAULT_LOG_DIR,
+                        filename: str = DEFAULT_REQUEST_LOG,
+                        queue_size: int = 10000,
+                        to_stdout: bool = False,
+                        max_bytes=20_000_000,
+                        backup_count=5) -> logging.Logger:
+    """
+    웹훅 요청 로그(JSON Lines) 셋업. 호출 스레드는 큐에 넣기만 하고,
+    백그라운드 리스너 스레드가 직렬화 + 회전 파일(및 선택적으로 stdout) 쓰기를 맡음.
+    사용: logger.info({"rid": ..., "route": ..., "total_ms": ...})
+    """
+    logger = logging.getLogger("app.request")
+    if logger.handlers:
+        return logger  # 중복 셋업 방지
+    os.makedirs(log_dir, exist_ok=True)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False  # 루트 핸들러(동기 stdout 등)로 새지 않도록
+
+    formatter = _JsonLineFormatter()
+    handlers = [RotatingFileHandler(
+        os.path.join(log_dir, filename),
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8"
+    )]
+    if to_stdout:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for h in handlers:
+        h.setFormatter(formatter)
+
+    q: queue.Queue = queue.Queue(maxsize=queue_size)
+    logger.addHandler(_DroppingQueueHandler(q))
+    listener = QueueListener(q, *handlers, respect_handler_level=False)
+    listener.start()
+    atexit.register(listener.stop)  # 종료 시 남은 줄 flush
+    return logger
+
+def request_log_dropped(logger: logging.Logger) -> int:
+    """큐가 가득 차 버린 요청 로그 수 (/metrics 용)."""
+    return sum(getattr(h, "dropped", 0) for h in logger.handlers)
+
 def log_error_record(err: ErrorRecord,
                      log_dir: str = DEFAULT_LOG_DIR,
                      filename: str = DEFAULT_ERR_JSONL):
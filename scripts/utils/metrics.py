@@ -0,0 +1,149 @@
+"""
+utils/metrics.py
+
+웹훅 구간별 지연을 재는 작은 계측 유틸입니다. (prometheus_client 없이 Prometheus 텍스트 포맷 출력)
+
+기능:
+- Histogram: 라벨별 누적 버킷 히스토그램 (스레드 안전). render() 는 Prometheus 텍스트 줄
+- StageTimer: 요청 하나 동안 구간(stage)별 소요 시간을 모으는 객체
+  with timer.stage("db_execute"): ...
+- NULL_TIMER: 계측하지 않을 때 넘기는 빈 타이머
+- render_gauges: {이름: 값} 통계 dict(풀/캐시 stats())를 gauge 줄로
+
+p50/p95/p99 는 Prometheus 쪽에서 histogram_quantile() 로 구합니다.
+"""
+
+from __future__ import annotations
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+__all__ = ["DEFAULT_BUCKETS", "Histogram", "StageTimer", "NULL_TIMER", "render_gauges"]
+
+# 초 단위. 메모리 인덱스 적중(수십 µs) ~ 느린 DB 왕복(수 초)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _le(bound: float) -> str:
+    return 'le="+Inf"' if bound == math.inf else f'le="{bound!r}"'
+
+
+class Histogram:
+    """
+    사용:
+        h = Histogram("knuchat_stage_seconds", "구간별 소요 시간", ("stage",))
+        h.observe(0.003, "db_execute")
+        lines = h.render()
+    """
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 라벨 값 → [버킷별 개수..., 합계, 개수]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[i] += 1
+                    break
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for key in sorted(series):
+            s = series[key]
+            cumulative = 0
+            for i, b in enumerate(self.buckets):
+                cumulative += s[i]
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, _le(b))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, _le(math.inf))} {s[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {s[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {s[-1]}")
+        return lines
+
+
+class StageTimer:
+    """요청 하나의 구간별 소요 시간(초)과 라벨."""
+    __slots__ = ("stages", "labels", "started")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.labels: Dict[str, str] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def label(self, **labels: str) -> None:
+        self.labels.update(labels)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def add(self, name: str, seconds: float) -> None:
+        pass
+
+    def label(self, **labels: str) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def render_gauges(prefix: str, documentation: str, values: Mapping[str, object],
+                  labels: Optional[Mapping[str, str]] = None) -> List[str]:
+    """stats() dict 에서 숫자/불리언 값만 '{prefix}_{key}' gauge 로."""
+    names, vals = tuple((labels or {}).keys()), tuple((labels or {}).values())
+    lines: List[str] = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, (int, float)):
+            continue
+        metric = f"{prefix}_{key}"
+        lines.append(f"# HELP {metric} {documentation} ({key})")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{_labels(names, vals)} {value}")
+    return lines
@@ -1,10 +1,8 @@
 import re
+from functools import lru_cache
 from typing import List
 from dotenv import load_dotenv
 import os
-from azure.ai.vision.imageanalysis import ImageAnalysisClient
-from azure.ai.vision.imageanalysis.models import VisualFeatures
-from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError
 
 from scripts.utils.log_utils import (
@@ -22,11 +20,19 @@ from scripts.utils.retry_utils import (
 from scripts.utils.image_guard import ensure_ocr_safe_bytes
 
 load_dotenv()
-key = os.getenv("VISION_KEY")
-endpoint = os.getenv("VISION_ENDPOINT")
-computervision_client = ImageAnalysisClient(endpoint=endpoint,credential=AzureKeyCredential(key))
 logger = init_runtime_logger()
 
+@lru_cache(maxsize=1)
+def get_vision_client():
+    """
+    Image Analysis 클라이언트는 첫 OCR 호출 때 만듦.
+    (import 만 하는 모듈/웹 서버가 SDK 로딩·클라이언트 생성 비용을 내지 않도록)
+    """
+    from azure.ai.vision.imageanalysis import ImageAnalysisClient
+    from azure.core.credentials import AzureKeyCredential
+    return ImageAnalysisClient(endpoint=os.getenv("VISION_ENDPOINT"),
+                               credential=AzureKeyCredential(os.getenv("VISION_KEY")))
+
 # 무료(F0): 2초당 1건 수준이 안전 → rate=0.5, burst=1 권장
 GLOBAL_BUCKET = TokenBucket(rate_per_sec=0.5, capacity=1)
 
@@ -35,8 +41,9 @@ def _analyze_read_bytes(image_bytes: bytes):
     Image Analysis v4는 READ가 **동기**로 동작함.
     비동기 폴링 불필요. 실패 시 HttpResponseError 발생.
     """
+    from azure.ai.vision.imageanalysis.models import VisualFeatures
     GLOBAL_BUCKET.acquire()  # 전역 QPS 제한
-    return computervision_client.analyze(
+    return get_vision_client().analyze(
         image_data=image_bytes,
         visual_features=[VisualFeatures.READ]
     )
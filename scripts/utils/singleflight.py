@@ -0,0 +1,87 @@
+"""
+utils/singleflight.py
+
+같은 키로 동시에 들어온 작업을 하나로 합치는 single-flight 유틸입니다.
+
+쉬는 시간에 여러 학생이 거의 같은 순간 같은 조건('장학, 전체')을 물으면
+요청마다 커넥션을 잡고 같은 무거운 쿼리를 돌리게 됩니다.
+먼저 온 요청(leader)만 실제로 실행하고, 실행 중에 같은 키로 온 요청(follower)은
+그 결과(또는 예외)를 같이 받습니다. 끝난 뒤에 온 요청은 새로 실행합니다(결과 보관은 캐시의 몫).
+
+사용:
+    flights = SingleFlight()
+    value, shared = flights.do(key, lambda: load(key))                         # 스레드
+    value, shared = await flights.do_async(key, lambda: load(key), executor)   # 이벤트 루프
+"""
+
+from __future__ import annotations
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+__all__ = ["SingleFlight"]
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0    # 실제로 실행한 횟수
+        self.coalesced = 0  # 다른 요청의 실행 결과를 받아 간 횟수
+
+    def _begin(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = Future()
+            self._calls[key] = fut
+            self.leaders += 1
+            return fut, True
+
+    def _run(self, key: Hashable, fut: Future, fn: Callable[[], Any]) -> None:
+        try:
+            value = fn()
+        except BaseException as e:
+            self._finish(key)
+            fut.set_exception(e)
+        else:
+            self._finish(key)
+            fut.set_result(value)
+
+    def _finish(self, key: Hashable) -> None:
+        # 결과를 넣기 전에 빼야, 결과를 받은 뒤 다시 온 요청이 끝난 실행에 붙지 않음
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """(결과, 다른 요청과 나눠 받았는지). fn 의 예외는 같이 기다린 요청 모두에 전달."""
+        fut, leader = self._begin(key)
+        if leader:
+            self._run(key, fut, fn)
+        return fut.result(timeout=timeout), not leader
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any],
+                       executor: Optional[Executor] = None) -> Tuple[Any, bool]:
+        """leader 는 fn 을 executor 로 넘기고, follower 는 스레드를 잡지 않고 루프에서 기다림."""
+        fut, leader = self._begin(key)
+        if leader:
+            try:
+                asyncio.get_running_loop().run_in_executor(executor, self._run, key, fut, fn)
+            except BaseException as e:  # executor 가 이미 닫힘 등
+                self._finish(key)
+                fut.set_exception(e)
+        # 기다리던 요청이 취소돼도 다른 요청이 받을 결과는 취소되지 않도록
+        return await asyncio.shield(asyncio.wrap_future(fut)), not leader
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            inflight = len(self._calls)
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "inflight": inflight,
+        }
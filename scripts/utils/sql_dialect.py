@@ -0,0 +1,73 @@
+"""
+utils/sql_dialect.py
+
+repo/서빙 코드가 연결마다 SQL 방언을 고르기 위한 작은 도우미입니다.
+
+- MSSQL: 운영 (Azure SQL, pyodbc). 기존 T-SQL 문자열 그대로
+- SQLITE: 로컬 벤치마크/부하 테스트 (utils/sqlite_backend.py, DB_BACKEND=sqlite)
+  dbo.* 이름과 ? 자리 표시자, ROW_NUMBER, SYSUTCDATETIME() 은 그대로 통하고,
+  MERGE / OUTPUT / OUTER APPLY / TOP / 임시 테이블(#)을 쓰는 곳만 각 모듈이 SQLite 문을 따로 둠
+
+기능:
+- dialect_of: 연결(UnitOfWork / 풀 대출 포함)의 방언
+- prefix_match / prefix_pattern: 접두 검색 조건과 그 파라미터 (LIKE 'x%' ↔ GLOB 'x*')
+- sqlite_card_columns: OUTER APPLY(학과 STRING_AGG, 첫 첨부 TOP 1) 대신 쓰는 상관 서브쿼리
+- missing_object_errors: 마이그레이션 전(테이블/열 없음)에 나는 예외 종류
+  pyodbc 는 MSSQL 연결일 때만 불러옴 (DB_BACKEND=sqlite 는 libodbc 없이도 import 되도록)
+"""
+
+from __future__ import annotations
+from typing import Dict, Tuple
+
+from scripts.utils.key_utils import like_prefix
+
+__all__ = ["MSSQL", "SQLITE", "dialect_of", "prefix_match", "prefix_pattern", "sqlite_card_columns",
+           "missing_object_errors"]
+
+MSSQL = "mssql"
+SQLITE = "sqlite"
+
+
+def dialect_of(conn) -> str:
+    """연결 객체가 dialect 속성을 가지면 그 값 (sqlite_backend), 없으면 MSSQL (pyodbc, 벤치 stand-in)"""
+    return getattr(conn, "dialect", MSSQL)
+
+
+def prefix_match(column: str, dialect: str = MSSQL) -> str:
+    # SQLite 의 LIKE 는 대소문자를 무시해 인덱스를 못 타므로 GLOB (정규화 키는 이미 소문자)
+    return f"{column} GLOB ?" if dialect == SQLITE else f"{column} LIKE ?"
+
+
+def prefix_pattern(s: str, dialect: str = MSSQL) -> str:
+    """prefix_match 의 파라미터. 사용자 입력의 와일드카드는 이스케이프 (GLOB: *, ?, [)"""
+    if dialect != SQLITE:
+        return like_prefix(s)
+    escaped = (s or "").replace("[", "[[]").replace("*", "[*]").replace("?", "[?]")
+    return escaped + "*"
+
+
+def sqlite_card_columns(department: str = "dbo.notice_department",
+                        attachment: str = "dbo.notice_attachment", notice: str = "n") -> Dict[str, str]:
+    """
+    카드용 열(학과 목록, 첫 첨부) — SQLite 에는 OUTER APPLY 가 없어 공지 한 건당 서브쿼리로
+    (notice_id 인덱스 seek 한 번씩이라 T-SQL 쪽 계획과 같은 모양)
+    - departments: SELECT 목록에 그대로 ('... AS departments')
+    - attachment_join: FROM 뒤에 (별칭 a — a.file_url, a.thumbnail_url)
+    """
+    return {
+        "departments": f"(SELECT group_concat(department, ', ') FROM {department} "
+                       f"WHERE notice_id = {notice}.id) AS departments",
+        "attachment_join": f"LEFT JOIN {attachment} a ON a.id = (\n"
+                           f"    SELECT id FROM {attachment}\n"
+                           f"    WHERE notice_id = {notice}.id\n"
+                           f"    ORDER BY file_order ASC LIMIT 1\n)",
+    }
+
+
+def missing_object_errors(conn) -> Tuple[type, ...]:
+    """except 절에 그대로 (예: except missing_object_errors(conn) as e:)"""
+    if dialect_of(conn) == SQLITE:
+        import sqlite3
+        return (sqlite3.OperationalError,)
+    import pyodbc
+    return (pyodbc.ProgrammingError,)
@@ -0,0 +1,295 @@
+"""
+utils/sqlite_backend.py
+
+Azure SQL 없이 수집 파이프라인과 웹훅을 한 대에서 끝까지 돌리기 위한 SQLite 백엔드입니다.
+(configs/db_config.py 의 DB_BACKEND=sqlite 로 선택, 파일 위치는 SQLITE_CONFIG)
+
+- 파일을 `dbo` 라는 이름으로 ATTACH 하므로 repo/서빙 쿼리의 dbo.notice 같은 이름이 그대로 통함
+- pyodbc 와 같은 모양의 연결/커서: execute(sql, *params), fast_executemany 속성, setinputsizes 는 무시
+- 스키마는 migrations/0000~0006 을 합친 것 (처음 연결할 때 없으면 생성)
+  0006 의 ROWVERSION 은 dbo.notice_change_seq 카운터를 올리는 트리거로 (CHANGE_SQL)
+- DATE / DATETIME2 열은 date / datetime 으로 돌려줌 (pyodbc 와 같은 타입 → 카드/키셋 코드 그대로)
+- SYSUTCDATETIME() 을 SQLite 함수로 등록 (T-SQL 과 같은 이름)
+방언이 다른 문장(MERGE, OUTPUT, OUTER APPLY, TOP, #임시 테이블)은 utils/sql_dialect.py 참고.
+
+사용:
+    conn = connect("bench.sqlite3")
+    service = create_message_service(lambda: connect("bench.sqlite3"))
+"""
+
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from configs.db_config import SQLITE_CONFIG
+from scripts.utils.sql_dialect import SQLITE
+from scripts.utils.log_utils import init_runtime_logger
+
+logger = init_runtime_logger()
+
+__all__ = ["SCHEMA_SQL", "CHANGE_SQL", "SqliteConnection", "connect"]
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS dbo.notice (
+    id          INTEGER PRIMARY KEY,
+    title       TEXT,
+    url         TEXT,
+    url_hash    TEXT NOT NULL,
+    topic       TEXT,
+    topic_norm  TEXT,
+    oneline     TEXT,
+    deadline    DATE,
+    llm_status  INTEGER NOT NULL DEFAULT 0,
+    created_at  DATETIME2 NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    row_version INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS dbo.UX_notice_url_hash ON notice (url_hash);
+CREATE INDEX IF NOT EXISTS dbo.IX_notice_topic_norm ON notice (topic_norm, deadline, created_at);
+CREATE INDEX IF NOT EXISTS dbo.IX_notice_llm_status_deadline ON notice (llm_status, deadline);
+
+CREATE TABLE IF NOT EXISTS dbo.notice_department (
+    id               INTEGER PRIMARY KEY,
+    notice_id        INTEGER NOT NULL REFERENCES notice (id),
+    department       TEXT NOT NULL,
+    department_norm  TEXT,
+    row_version      INTEGER
+);
+CREATE INDEX IF NOT EXISTS dbo.IX_notice_department_norm ON notice_department (department_norm, notice_id);
+CREATE INDEX IF NOT EXISTS dbo.IX_notice_department_notice ON notice_department (notice_id, department);
+
+CREATE TABLE IF NOT EXISTS dbo.notice_attachment (
+    id                INTEGER PRIMARY KEY,
+    notice_id         INTEGER NOT NULL REFERENCES notice (id),
+    file_url          TEXT NOT NULL,
+    file_order        INTEGER NOT NULL,
+    thumbnail_url     TEXT,
+    thumbnail_status  INTEGER NOT NULL DEFAULT 0,
+    row_version       INTEGER
+);
+CREATE INDEX IF NOT EXISTS dbo.IX_notice_attachment_notice ON notice_attachment (notice_id, file_order);
+CREATE INDEX IF NOT EXISTS dbo.IX_notice_attachment_thumbnail_status
+    ON notice_attachment (thumbnail_status, notice_id, file_order);
+
+CREATE TABLE IF NOT EXISTS dbo.notice_ocr_text (
+    notice_id  INTEGER PRIMARY KEY REFERENCES notice (id),
+    ocr_text   TEXT NOT NULL,
+    row_version INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS dbo.notice_topn (
+    topic_norm       TEXT NOT NULL,
+    department_norm  TEXT NOT NULL,
+    sort_family      TEXT NOT NULL,
+    rank_no          INTEGER NOT NULL,
+    notice_id        INTEGER NOT NULL,
+    title            TEXT,
+    deadline         DATE,
+    oneline          TEXT,
+    topic            TEXT,
+    created_at       DATETIME2,
+    url              TEXT,
+    file_url         TEXT,
+    departments      TEXT,
+    thumbnail_url    TEXT,
+    pair_total       INTEGER NOT NULL,
+    PRIMARY KEY (topic_norm, department_norm, sort_family, rank_no)
+);
+
+CREATE TABLE IF NOT EXISTS dbo.notice_topn_state (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    built_for   DATE NOT NULL,
+    size        INTEGER NOT NULL,
+    rebuilt_at  DATETIME2 NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dbo.cafeteria_menu (
+    id            INTEGER PRIMARY KEY,
+    restaurant    TEXT NOT NULL,
+    menu_group    TEXT NOT NULL,
+    meal_type     TEXT NOT NULL,
+    service_date  DATE NOT NULL,
+    menu          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dbo.IX_cafeteria_menu_service_date ON cafeteria_menu (service_date);
+
+CREATE TABLE IF NOT EXISTS dbo.cafeteria_menu_load (
+    range_start   DATE NOT NULL,
+    range_end     DATE NOT NULL,
+    content_hash  TEXT NOT NULL,
+    row_count     INTEGER NOT NULL,
+    loaded_at     DATETIME2 NOT NULL,
+    PRIMARY KEY (range_start, range_end)
+);
+"""
+
+
+# 0006 의 ROWVERSION 흉내: 쓸 때마다 카운터를 올리고 그 값을 행에 기록
+# (쓰기는 한 번에 하나라 커밋 순서와 카운터 순서가 같음 — notice_changes.current_mark 는 v + 1)
+_VERSIONED = (("notice", "id"), ("notice_department", "id"),
+              ("notice_attachment", "id"), ("notice_ocr_text", "notice_id"))
+
+CHANGE_SQL = """
+CREATE TABLE IF NOT EXISTS dbo.notice_change_seq (
+    id  INTEGER PRIMARY KEY CHECK (id = 1),
+    v   INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO dbo.notice_change_seq (id, v) VALUES (1, 0);
+""" + "".join(f"""
+CREATE INDEX IF NOT EXISTS dbo.IX_{table}_row_version ON {table} (row_version);
+CREATE TRIGGER IF NOT EXISTS dbo.TR_{table}_insert_version AFTER INSERT ON {table}
+BEGIN
+    UPDATE notice_change_seq SET v = v + 1 WHERE id = 1;
+    UPDATE {table} SET row_version = (SELECT v FROM notice_change_seq WHERE id = 1) WHERE {key} = NEW.{key};
+END;
+CREATE TRIGGER IF NOT EXISTS dbo.TR_{table}_update_version AFTER UPDATE ON {table}
+BEGIN
+    UPDATE notice_change_seq SET v = v + 1 WHERE id = 1;
+    UPDATE {table} SET row_version = (SELECT v FROM notice_change_seq WHERE id = 1) WHERE {key} = NEW.{key};
+END;
+""" for table, key in _VERSIONED)
+
+
+def _add_row_version(raw: sqlite3.Connection) -> None:
+    # 0006 전에 만든 파일: CREATE TABLE IF NOT EXISTS 는 열을 더하지 않으므로
+    for table, _key in _VERSIONED:
+        cols = {row[1] for row in raw.execute(f"PRAGMA dbo.table_info({table})")}
+        if "row_version" not in cols:
+            raw.execute(f"ALTER TABLE dbo.{table} ADD COLUMN row_version INTEGER")
+
+
+# ---------- 타입 변환 (pyodbc 가 돌려주는 것과 같은 파이썬 타입) ----------
+def _adapt_datetime(v: datetime) -> str:
+    return v.isoformat(" ")
+
+
+def _convert_date(b: bytes) -> Optional[date]:
+    try:
+        return date.fromisoformat(b.decode()[:10])
+    except ValueError:
+        return None  # T-SQL 이면 쓰기에서 막혔을 값 (apply_llm_result 의 잘못된 마감일 등)
+
+
+def _convert_datetime(b: bytes) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(b.decode())
+    except ValueError:
+        return None
+
+
+def _sysutcdatetime() -> str:
+    return _adapt_datetime(datetime.now(timezone.utc).replace(tzinfo=None))
+
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("DATETIME2", _convert_datetime)
+
+
+class _SqliteCursor:
+    """pyodbc.Cursor 모양: execute(sql, *params) / executemany / fetch* / rowcount"""
+    fast_executemany = False  # pyodbc 전용 — 받아만 둠 (SQLite 는 원래 프로세스 안이라 왕복이 없음)
+
+    def __init__(self, cur: sqlite3.Cursor):
+        self._cur = cur
+
+    def execute(self, sql: str, *params):
+        if len(params) == 1 and isinstance(params[0], (tuple, list)):
+            params = tuple(params[0])
+        self._cur.execute(sql, params)
+        return self
+
+    def executemany(self, sql: str, seq_of_params):
+        self._cur.executemany(sql, [tuple(p) for p in seq_of_params])
+        return self
+
+    def setinputsizes(self, sizes) -> None:
+        pass
+
+    def nextset(self) -> bool:
+        return False
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size: int = 1):
+        return self._cur.fetchmany(size)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    @property
+    def rowcount(self) -> int:
+        return self._cur.rowcount
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    def close(self) -> None:
+        self._cur.close()
+
+
+class SqliteConnection:
+    """pyodbc.Connection 모양. dialect 속성으로 repo/서빙 코드가 SQLite 문을 고름 (utils/sql_dialect.dialect_of)"""
+    dialect = SQLITE
+
+    def __init__(self, raw: sqlite3.Connection, path: str):
+        self.raw = raw
+        self.path = path
+
+    def cursor(self) -> _SqliteCursor:
+        return _SqliteCursor(self.raw.cursor())
+
+    def execute(self, sql: str, *params) -> _SqliteCursor:
+        return self.cursor().execute(sql, *params)
+
+    def commit(self) -> None:
+        self.raw.commit()
+
+    def rollback(self) -> None:
+        self.raw.rollback()
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+_SCHEMA_READY = set()  # 이 프로세스에서 스키마를 확인한 파일
+_SCHEMA_LOCK = threading.Lock()
+
+
+def connect(path: Optional[str] = None, timeout: Optional[float] = None) -> SqliteConnection:
+    """
+    SQLite 연결 (utils/db_utils.get_connection, serving/message_service.get_db_connection 이 DB_BACKEND=sqlite 일 때 부름)
+    path 가 ':memory:' 이면 연결마다 따로인 빈 DB (단위 확인용)
+    """
+    path = path or SQLITE_CONFIG['path']
+    timeout = SQLITE_CONFIG['timeout'] if timeout is None else timeout
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # 웹훅 풀은 빌려준 스레드와 반납받는 스레드가 다를 수 있음 (한 번에 한 스레드만 쓰는 것은 풀이 보장)
+    raw = sqlite3.connect(":memory:", timeout=timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                          check_same_thread=False)
+    raw.execute("ATTACH DATABASE ? AS dbo", (path,))
+    raw.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+    if path != ":memory:":
+        raw.execute("PRAGMA dbo.journal_mode = WAL")  # 웹훅 읽기가 수집 쓰기를 기다리지 않도록
+        raw.execute("PRAGMA dbo.synchronous = NORMAL")
+    raw.execute("PRAGMA foreign_keys = ON")
+    raw.create_function("SYSUTCDATETIME", 0, _sysutcdatetime)
+    key = os.path.abspath(path) if path != ":memory:" else None
+    if key is None or key not in _SCHEMA_READY:
+        with _SCHEMA_LOCK:
+            raw.executescript(SCHEMA_SQL)
+            _add_row_version(raw)
+            raw.executescript(CHANGE_SQL)
+            if key is not None:
+                _SCHEMA_READY.add(key)
+                logger.debug("[SQLITE] schema ready - %s", key)
+    return SqliteConnection(raw, path)
@@ -0,0 +1,88 @@
+import io, os
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+from urllib.parse import unquote, urlsplit
+from PIL import Image, ImageOps
+
+from scripts.utils.image_guard import download, to_rgb, shrink_long_edge, MAX_DIM
+from scripts.utils.key_utils import sha256_hex
+
+THUMB_EDGE = 800                 # 카카오 카드 썸네일 권장 폭(800x400 / 800x800) 기준 긴 변
+SUFFIX     = ".thumb"            # 원본 옆 이름: posters/a.png → posters/a.thumb.jpg
+CONTAINER  = "images"            # 우리 Blob 이 아닌 원본(외부 호스트)의 썸네일을 둘 컨테이너
+CACHE_CONTROL = "public, max-age=31536000, immutable"  # 원본이 바뀌면 URL(첨부)도 바뀜
+
+# 포맷 이름 → (Pillow 포맷, 확장자, content_type, save 옵션). 앞에 둔 포맷의 URL 을 DB 에 기록
+FORMATS = {
+    "jpeg": ("JPEG", ".jpg", "image/jpeg",
+             {"quality": 82, "optimize": True, "progressive": True, "subsampling": "4:2:0"}),
+    "webp": ("WEBP", ".webp", "image/webp", {"quality": 80, "method": 4}),
+}
+DEFAULT_FORMATS = ("jpeg", "webp")   # 카카오 카드에는 JPEG, WebP 는 웹 클라이언트용으로 같이 둠
+
+@lru_cache(maxsize=1)
+def get_blob_service_client():
+    # 크롤러(crawl/today_crawl_seo.py)와 같은 연결 문자열. import 시점이 아니라 처음 올릴 때 초기화
+    conn_str = os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
+    if not conn_str:
+        raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING is not set")
+    from azure.storage.blob import BlobServiceClient
+    return BlobServiceClient.from_connection_string(conn_str)
+
+def thumbnail_blob_path(file_url: str, fmt: str) -> Tuple[str, str]:
+    """
+    원본 URL → (컨테이너, 썸네일 blob 이름)
+    - 우리 Blob(*.blob.core.windows.net/<container>/<name>): 같은 컨테이너, 같은 경로에 SUFFIX 를 붙인 이름
+    - 그 외 호스트: CONTAINER 의 thumbs/<URL 해시>
+    """
+    ext = FORMATS[fmt][1]
+    parts = urlsplit(file_url)
+    path = unquote(parts.path).lstrip("/")
+    if parts.netloc.endswith(".blob.core.windows.net") and "/" in path:
+        container, name = path.split("/", 1)
+        stem = os.path.splitext(name)[0]
+        return container, f"{stem}{SUFFIX}{ext}"
+    return CONTAINER, f"thumbs/{sha256_hex(file_url)[:32]}{SUFFIX}{ext}"
+
+def render_thumbnails(data: bytes, formats: Sequence[str] = DEFAULT_FORMATS,
+                      edge: int = THUMB_EDGE) -> Dict[str, bytes]:
+    """
+    이미지 바이트 → {포맷: 썸네일 바이트}
+    - 긴 변 edge 이하로 축소 (작은 이미지는 키우지 않음), EXIF 회전 반영, 투명 배경은 흰색
+    - 손상/미지원 포맷이면 예외 (호출 쪽에서 실패로 기록)
+    """
+    with Image.open(io.BytesIO(data)) as im:
+        if max(im.size) > MAX_DIM * 2:
+            raise ValueError(f"image too large: {im.size}")
+        im.draft("RGB", (edge, edge))   # JPEG 는 디코딩 단계에서 1/2~1/8 로 줄여 읽음 (수 MB 포스터가 빠름)
+        im.load()
+        im = ImageOps.exif_transpose(im)
+        im = to_rgb(shrink_long_edge(im, edge))
+        out = {}
+        for fmt in formats:
+            pil_format, _ext, _ctype, options = FORMATS[fmt]
+            bio = io.BytesIO()
+            im.save(bio, format=pil_format, **options)
+            out[fmt] = bio.getvalue()
+        return out
+
+def upload_thumbnail(file_url: str, fmt: str, data: bytes) -> str:
+    from azure.storage.blob import ContentSettings
+    container, name = thumbnail_blob_path(file_url, fmt)
+    blob = get_blob_service_client().get_blob_client(container=container, blob=name)
+    blob.upload_blob(data, overwrite=True,
+                     content_settings=ContentSettings(content_type=FORMATS[fmt][2], cache_control=CACHE_CONTROL))
+    return blob.url
+
+def make_thumbnail(file_url: str, formats: Sequence[str] = DEFAULT_FORMATS,
+                   edge: int = THUMB_EDGE) -> str:
+    """
+    첨부 URL → 썸네일 URL (formats[0] 의 것)
+    원본을 내려받아 포맷별로 줄여 원본 옆에 올림. PDF/이미지가 아니면 ValueError
+    """
+    data, ctype = download(file_url)
+    if (ctype or "").startswith("application/pdf") or file_url.lower().endswith(".pdf"):
+        raise ValueError("not an image (pdf)")
+    variants = render_thumbnails(data, formats, edge)
+    urls = [upload_thumbnail(file_url, fmt, variants[fmt]) for fmt in formats]
+    return urls[0]
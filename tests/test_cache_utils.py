@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from scripts.utils import cache_utils
+from scripts.utils.cache_utils import KST, TTLCache, deadline_expiry, next_kst_midnight
+
+
+def _kst(*args) -> float:
+    return datetime(*args, tzinfo=KST).timestamp()
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock(_kst(2025, 3, 10, 23, 59, 0))
+    monkeypatch.setattr(cache_utils.time, "time", c)
+    return c
+
+
+# ---------- KST 자정 ----------
+def test_next_kst_midnight_uses_kst_not_utc():
+    # UTC 로는 아직 3/10 이지만 KST 로는 3/11 00:30
+    now = datetime(2025, 3, 10, 15, 30, tzinfo=timezone.utc).timestamp()
+    assert next_kst_midnight(now) == _kst(2025, 3, 12)
+
+
+def test_next_kst_midnight_at_midnight_is_the_next_day():
+    assert next_kst_midnight(_kst(2025, 3, 11)) == _kst(2025, 3, 12)
+    assert next_kst_midnight(_kst(2025, 3, 10, 23, 59, 59)) == _kst(2025, 3, 11)
+
+
+def test_deadline_expiry_is_midnight_after_the_earliest_deadline():
+    deadlines = [None, date(2025, 3, 12), datetime(2025, 3, 10, 18, 0), date(2025, 3, 31)]
+    assert deadline_expiry(deadlines) == _kst(2025, 3, 11)
+
+
+def test_deadline_expiry_without_deadlines():
+    assert deadline_expiry([]) is None
+    assert deadline_expiry([None, None]) is None
+
+
+def test_card_due_today_expires_at_kst_midnight(clock):
+    cache = TTLCache(ttl=3600, expire_at_midnight=False)
+    cache.set("k", "page", expires_at=deadline_expiry([date(2025, 3, 10)]))
+    clock.now = _kst(2025, 3, 10, 23, 59, 59)
+    assert cache.get("k") == "page"
+    clock.now = _kst(2025, 3, 11)
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_card_without_deadline_survives_midnight(clock):
+    cache = TTLCache(ttl=3600, expire_at_midnight=False)
+    cache.set("k", "page", expires_at=deadline_expiry([None, date(2025, 3, 20)]))
+    clock.now = _kst(2025, 3, 11, 0, 30)
+    assert cache.get("k") == "page"
+
+
+def test_expire_at_midnight_caps_ttl(clock):
+    cache = TTLCache(ttl=3600)
+    cache.set("k", "page")
+    clock.now = _kst(2025, 3, 11)
+    assert cache.get("k") is None
+
+
+# ---------- TTL / 세대 ----------
+def test_ttl_expiry(clock):
+    cache = TTLCache(ttl=10, expire_at_midnight=False)
+    cache.set("k", 1)
+    cache.set("short", 2, ttl=1)
+    clock.now += 5
+    assert cache.get("k") == 1
+    assert cache.get("short") is None
+    clock.now += 5
+    assert cache.get("k") is None
+
+
+def test_generation_change_clears_everything():
+    gen = [1]
+    cache = TTLCache(ttl=300, expire_at_midnight=False, generation_source=lambda: gen[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    gen[0] = 2
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+    cache.set("a", 3)
+    assert cache.get("a") == 3
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2, ttl=300, expire_at_midnight=False)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+import pytest
+
+from scripts.db_tasks.menu_repo import replace_menu_range
+from scripts.utils import sqlite_backend
+
+MONDAY = date(2025, 3, 10)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite_backend.connect(":memory:")
+    yield c
+    c.close()
+
+
+def _week(menu="백반"):
+    return [("학생식당", "한식", meal, (MONDAY + timedelta(days=d)).isoformat(), f"{menu} {d}")
+            for d in range(5) for meal in ("중식", "석식")]
+
+
+def _rows(conn):
+    return conn.execute("""
+        SELECT restaurant, menu_group, meal_type, service_date, menu
+        FROM dbo.cafeteria_menu ORDER BY service_date, meal_type;
+    """).fetchall()
+
+
+def test_same_week_twice_writes_once(conn):
+    assert replace_menu_range(conn, _week()) == 10
+    before = _rows(conn)
+    assert replace_menu_range(conn, _week()) == 0
+    assert _rows(conn) == before
+    assert replace_menu_range(conn, _week(), force=True) == 10
+    assert len(_rows(conn)) == 10
+
+
+def test_changed_week_replaces_rows(conn):
+    replace_menu_range(conn, _week())
+    assert replace_menu_range(conn, _week("덮밥")) == 10
+    rows = _rows(conn)
+    assert len(rows) == 10
+    assert all(menu.startswith("덮밥") for *_key, menu in rows)
+
+
+def test_other_weeks_are_kept(conn):
+    replace_menu_range(conn, _week())
+    next_week = [(r, g, m, (date.fromisoformat(d) + timedelta(days=7)).isoformat(), menu)
+                 for r, g, m, d, menu in _week("국수")]
+    replace_menu_range(conn, next_week)
+    assert len(_rows(conn)) == 20
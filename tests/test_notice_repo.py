@@ -0,0 +1,52 @@
+import pytest
+
+from scripts.db_tasks.notice_repo import bulk_upsert_notices, get_llm_statuses
+from scripts.utils import sqlite_backend
+
+
+@pytest.fixture
+def conn():
+    c = sqlite_backend.connect(":memory:")
+    yield c
+    c.close()
+
+
+def _notice(n, **kw):
+    return {"url_hash": f"h{n}", "title": f"공지 {n}", "url": f"https://example.com/{n}",
+            "topic": "장학", "oneline": f"요약 {n}", "deadline": "2025-03-31",
+            "departments": ["경영학과"], "attachments": [f"https://example.com/{n}.png"],
+            "ocr_text": f"본문 {n}", **kw}
+
+
+def _counts(conn):
+    return tuple(conn.execute(f"SELECT COUNT(*) FROM dbo.{t};").fetchone()[0]
+                 for t in ("notice", "notice_department", "notice_attachment", "notice_ocr_text"))
+
+
+def test_rerun_is_idempotent(conn):
+    notices = [_notice(1), _notice(2)]
+    first = bulk_upsert_notices(conn, notices)
+    assert [created for _nid, created in first] == [True, True]
+    counts = _counts(conn)
+
+    second = bulk_upsert_notices(conn, notices)
+    assert second == [(nid, False) for nid, _created in first]
+    assert _counts(conn) == counts == (2, 2, 2, 2)
+
+
+def test_duplicate_url_hash_keeps_last(conn):
+    result = bulk_upsert_notices(conn, [_notice(1, oneline="처음"), _notice(2), _notice(1, oneline="나중")])
+    assert result[0] == result[2]
+    assert conn.execute("SELECT oneline FROM dbo.notice WHERE url_hash = 'h1';").fetchone()[0] == "나중"
+    assert _counts(conn)[0] == 2
+
+
+def test_get_llm_statuses(conn):
+    (nid, _created), = bulk_upsert_notices(conn, [_notice(1)])
+    conn.execute("INSERT INTO dbo.notice (title, url, url_hash, llm_status, created_at) "
+                 "VALUES ('실패', 'https://example.com/9', 'h9', 2, SYSUTCDATETIME());")
+    conn.commit()
+    failed = conn.execute("SELECT id FROM dbo.notice WHERE url_hash = 'h9';").fetchone()[0]
+
+    assert get_llm_statuses(conn, ["h1", "h9", "h404", ""]) == {"h1": (nid, 1), "h9": (failed, 2)}
+    assert get_llm_statuses(conn, []) == {}
@@ -0,0 +1,80 @@
+import contextlib
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from scripts.serving.notice_index import NoticeIndex
+from scripts.serving.notice_snapshot import SharedNoticeIndex, write_snapshot
+from scripts.serving.pagination import PAGE_SIZE, cursor_after, decode_cursor, encode_cursor
+from scripts.utils import sqlite_backend
+
+TODAY = date(2025, 3, 10)
+
+
+@pytest.fixture
+def indexes(tmp_path):
+    conn = sqlite_backend.connect(":memory:")
+    base = datetime(2025, 3, 1, 12, 0, 0)
+    # 마감일 동률/NULL/지난 마감, 작성일 동률, 여러 학과에 걸친 공지, 첨부/썸네일 유무가 섞이도록
+    deadlines = [None, TODAY, TODAY, TODAY + timedelta(days=3), None, TODAY - timedelta(days=1)]
+    departments = [["컴퓨터공학과"], ["경영학과"], ["컴퓨터공학과", "경영학과"]]
+    for i in range(1, 41):
+        topic = "공모전" if i % 4 else "장학"
+        conn.execute("""
+            INSERT INTO dbo.notice (id, title, url, url_hash, topic, topic_norm, oneline, deadline, llm_status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+        """, i, f"공지 {i}", f"https://example.com/{i}", f"h{i}", topic, topic, f"요약 {i}",
+                     deadlines[i % len(deadlines)], base + timedelta(hours=i // 3))
+        for dept in departments[i % len(departments)]:
+            conn.execute("""
+                INSERT INTO dbo.notice_department (notice_id, department, department_norm)
+                VALUES (?, ?, ?)
+            """, i, dept, dept)
+        if i % 3:
+            conn.execute("""
+                INSERT INTO dbo.notice_attachment (notice_id, file_url, file_order, thumbnail_url)
+                VALUES (?, ?, 0, ?)
+            """, i, f"https://example.com/{i}.png", f"https://example.com/{i}.thumb.jpg" if i % 2 else None)
+    conn.commit()
+
+    path = str(tmp_path / "notice_snapshot.bin")
+    local = NoticeIndex(lambda: contextlib.nullcontext(conn), today_fn=lambda: TODAY,
+                        on_publish=lambda records, today, gen: write_snapshot(path, records, today, gen))
+    local.build()
+    shared = SharedNoticeIndex(path, today_fn=lambda: TODAY)
+    shared.build()
+    yield local, shared
+    conn.close()
+
+
+def _pages(index, topic, department, sort_option, **norms):
+    pages, after = [], None
+    while True:
+        rows = index.lookup(topic, department, sort_option, TODAY, limit=PAGE_SIZE + 1, after=after, **norms)
+        page = rows[:PAGE_SIZE]
+        pages.append(page)
+        if len(rows) <= PAGE_SIZE:
+            return pages
+        after = decode_cursor(encode_cursor(cursor_after(page[-1], topic, department, sort_option)))
+
+
+@pytest.mark.parametrize("sort_option", ["마감순", "최신순", "오래된순"])
+@pytest.mark.parametrize("topic, department, norms", [
+    ("공모전", "컴퓨터공학과", {"topic_norms": ("공모전",), "department_norms": ("컴퓨터공학과",)}),
+    ("공모전", "컴퓨터, 경영", {"topic_norms": ("공모전",), "department_norms": ("컴퓨터공학과", "경영학과")}),
+    ("공모", "경영", {}),   # 해석 실패 → 접두 일치
+    ("장학", "", {}),
+    ("없는주제", "경영", {}),
+])
+def test_snapshot_lookup_matches_notice_index(indexes, sort_option, topic, department, norms):
+    local, shared = indexes
+    expected = _pages(local, topic, department, sort_option, **norms)
+    assert _pages(shared, topic, department, sort_option, **norms) == expected
+    ids = [row[0] for page in expected for row in page]
+    assert len(ids) == len(set(ids))
+
+
+def test_snapshot_is_not_used_on_another_day(indexes):
+    _local, shared = indexes
+    assert shared.ready
+    assert shared.lookup("공모전", "경영", "마감순", TODAY + timedelta(days=1)) is None
@@ -0,0 +1,116 @@
+import base64
+import dataclasses
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from configs.serving_config import get_serving_config
+from scripts.serving.kakao_response import MORE_TEXT, more_quick_reply
+from scripts.serving.message_service import MessageQuery, MessageService
+from scripts.serving.notice_query import fetch_notice_rows
+from scripts.serving.pagination import PAGE_SIZE, PageCursor, cursor_after, decode_cursor, encode_cursor
+from scripts.utils import sqlite_backend
+from scripts.utils.cache_utils import TTLCache
+
+TODAY = date(2025, 3, 10)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    PageCursor("공모전", "컴퓨터공학과", "마감순", 42, deadline=date(2025, 3, 31)),
+    PageCursor("공모전", "컴퓨터공학과", "마감순", 7, deadline=None),
+    PageCursor("장학", "전체", "최신순", 9, created_at=datetime(2025, 3, 1, 9, 30, 15, 120000)),
+    PageCursor("취업", "경영", None, 1),
+])
+def test_cursor_round_trip(cursor):
+    token = encode_cursor(cursor)
+    assert "=" not in token
+    assert decode_cursor(token) == cursor
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not-a-cursor",
+    "!!!",
+    _b64(b"\xff\xfe"),                                                 # UTF-8 아님
+    _b64(b"[1, 2, 3]"),                                                # dict 아님
+    _b64(json.dumps({"t": "a", "d": "b", "s": None}).encode()),         # id 없음
+    _b64(json.dumps({"t": "a", "d": "b", "i": "x"}).encode()),          # id 가 숫자 아님
+    _b64(json.dumps({"t": "a", "d": "b", "i": 1, "dl": "2025-13-40"}).encode()),
+    _b64(json.dumps({"t": "a", "d": "b", "i": 1, "ca": "어제"}).encode()),
+])
+def test_tampered_cursor_is_rejected(token):
+    assert decode_cursor(token) is None
+
+
+def test_truncated_token_is_rejected():
+    token = encode_cursor(PageCursor("공모전", "컴퓨터공학과", "마감순", 42, deadline=date(2025, 3, 31)))
+    assert decode_cursor(token[:-6]) is None
+
+
+def test_more_quick_reply_keeps_cursor_out_of_the_utterance():
+    token = encode_cursor(PageCursor("공모전", "컴퓨터공학과", "마감순", 42))
+    reply = more_quick_reply(token)
+    assert reply["action"] == "message"
+    assert reply["messageText"] == MORE_TEXT
+    assert token not in json.dumps(reply, ensure_ascii=False)
+
+    block = more_quick_reply(token, block_id="blk")
+    assert block["messageText"] == MORE_TEXT
+    assert block["extra"] == {"cursor": token}
+
+
+# ---------- 키셋 경계 (SQLite 백엔드로 실제 쿼리) ----------
+@pytest.fixture
+def conn():
+    c = sqlite_backend.connect(":memory:")
+    base = datetime(2025, 3, 1, 12, 0, 0)
+    # 마감일 동률/NULL/지난 마감, 작성일 동률이 섞이도록
+    deadlines = [None, TODAY, TODAY, TODAY + timedelta(days=3), None, TODAY - timedelta(days=1)]
+    for i in range(1, 24):
+        c.execute("""
+            INSERT INTO dbo.notice (id, title, url, url_hash, topic, topic_norm, oneline, deadline, llm_status, created_at)
+            VALUES (?, ?, ?, ?, '공모전', '공모전', '', ?, 1, ?)
+        """, i, f"공지 {i}", f"https://example.com/{i}", f"h{i}",
+                  deadlines[i % len(deadlines)], base + timedelta(hours=i // 3))
+        c.execute("""
+            INSERT INTO dbo.notice_department (notice_id, department, department_norm)
+            VALUES (?, '컴퓨터공학과', '컴퓨터공학과')
+        """, i)
+    c.commit()
+    yield c
+    c.close()
+
+
+@pytest.mark.parametrize("sort_option", ["마감순", "최신순", "오래된순"])
+def test_keyset_pages_cover_every_row_once(conn, sort_option):
+    expected = [r[0] for r in fetch_notice_rows(conn, "공모전", "컴퓨터", sort_option, TODAY)]
+    assert len(expected) == 19  # 마감 지난 4건 제외
+
+    seen, after = [], None
+    while True:
+        rows = fetch_notice_rows(conn, "공모전", "컴퓨터", sort_option, TODAY,
+                                 limit=PAGE_SIZE + 1, after=after)
+        page = rows[:PAGE_SIZE]
+        seen.extend(r[0] for r in page)
+        if len(rows) <= PAGE_SIZE:
+            break
+        # 웹훅과 같이 토큰을 거쳐 다음 페이지
+        after = decode_cursor(encode_cursor(cursor_after(page[-1], "공모전", "컴퓨터", sort_option)))
+    assert seen == expected
+
+
+@pytest.mark.parametrize("block_id, workers, offered", [("", 1, True), ("", 4, False), ("blk", 4, True)])
+def test_more_reply_needs_block_id_with_several_workers(block_id, workers, offered):
+    # 블록 ID 없이 보관한 커서는 워커 메모리에만 있음 → 워커가 여럿이면 바로가기를 내지 않음
+    config = dataclasses.replace(get_serving_config(), kakao_more_block_id=block_id, web_workers=workers)
+    service = MessageService(None, TTLCache(), None, config)
+    q = MessageQuery("장학", "전체", None, TODAY, user_key="u1")
+    token = encode_cursor(PageCursor("장학", "전체", None, 1))
+    replies = service._more_replies(q, token)
+    assert (replies is not None) == offered
+    assert (service.more_cursors.get("u1") is not None) == (offered and not block_id)
@@ -0,0 +1,70 @@
+import pytest
+
+from scripts.serving.resolver import FUZZY_MIN_LENGTH, default_resolver
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return default_resolver()
+
+
+def names(canonicals):
+    return [c.name for c in canonicals]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("컴공", ["컴퓨터공학과"]),
+    ("컴퓨터공학과", ["컴퓨터공학과"]),
+    ("컴퓨터 공학과", ["컴퓨터공학과"]),
+    ("약학", ["약학과"]),           # 접미어 뗀 이름
+    ("수의", ["수의예과", "수의학과"]),
+    ("전체", ["전체"]),
+])
+def test_department_alias_and_exact(resolver, text, expected):
+    assert names(resolver.departments(text)) == expected
+
+
+def test_college_alias_expands_to_members(resolver):
+    members = names(resolver.departments("공대"))
+    assert "건축학과" in members and len(members) > 1
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("장학금", ["장학"]),
+    ("공모", ["공모전"]),
+    ("수강신청", ["수강신청"]),
+])
+def test_topic_alias_and_exact(resolver, text, expected):
+    assert names(resolver.topics(text)) == expected
+
+
+@pytest.mark.parametrize("kind, text", [
+    ("departments", "장학"),   # 약학과/의학과/사학전공 … 과 한 글자 차이
+    ("topics", "공대"),        # 공모(→ 공모전)
+    ("topics", "수의"),        # 수강(→ 수강신청)
+    ("topics", "취엄"),
+    ("departments", "학사"),
+])
+def test_short_input_is_not_fuzzy_matched(resolver, kind, text):
+    assert len(text) < FUZZY_MIN_LENGTH
+    assert getattr(resolver, kind)(text) == ()
+
+
+@pytest.mark.parametrize("kind, text, expected", [
+    ("departments", "컴퓨터공핛과", ["컴퓨터공학과"]),
+    ("topics", "수강신쳥", ["수강신청"]),
+    ("topics", "대외활똥", ["대외활동"]),
+])
+def test_typo_with_unique_nearest_key(resolver, kind, text, expected):
+    assert names(getattr(resolver, kind)(text)) == expected
+
+
+@pytest.mark.parametrize("text", ["경엉학전공", "의힉과"])
+def test_tied_nearest_keys_are_not_guessed(resolver, text):
+    # 경영학전공/경제학전공, 의예과/의학과 가 같은 거리 → 추측하지 않고 접두 LIKE 폴백
+    assert resolver.departments(text) == ()
+
+
+def test_unknown_input_falls_back(resolver):
+    assert resolver.departments("xyz") == ()
+    assert resolver.topics("") == ()
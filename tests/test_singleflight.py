@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.utils.singleflight import SingleFlight
+
+
+def _wait_for(pred, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not pred():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_run():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "rows"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flights.do, "장학|전체", load)
+        assert started.wait(5)
+        followers = [pool.submit(flights.do, "장학|전체", load) for _ in range(3)]
+        _wait_for(lambda: flights.stats()["coalesced"] == 3)
+        release.set()
+        assert leader.result(5) == ("rows", False)
+        assert [f.result(5) for f in followers] == [("rows", True)] * 3
+    assert len(calls) == 1
+    assert flights.stats() == {"leaders": 1, "coalesced": 3, "inflight": 0}
+
+
+def test_finished_key_runs_again():
+    flights = SingleFlight()
+    assert flights.do("k", lambda: 1) == (1, False)
+    assert flights.do("k", lambda: 2) == (2, False)
+    assert flights.stats()["leaders"] == 2
+
+
+def test_exception_reaches_every_waiter_and_clears_the_key():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def boom():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("db down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "k", boom)
+        assert started.wait(5)
+        follower = pool.submit(flights.do, "k", boom)
+        _wait_for(lambda: flights.stats()["coalesced"] == 1)
+        release.set()
+        for f in (leader, follower):
+            with pytest.raises(RuntimeError, match="db down"):
+                f.result(5)
+    assert flights.stats()["inflight"] == 0
+    assert flights.do("k", lambda: "ok") == ("ok", False)
+
+
+def test_do_async_coalesces_on_the_event_loop():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return "rows"
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            tasks = [asyncio.create_task(flights.do_async("k", load, pool)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {value for value, _ in results} == {"rows"}
+    assert len(calls) == 1
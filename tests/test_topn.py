@@ -0,0 +1,62 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from scripts.db_tasks.topn_repo import affected_pairs, full_rebuild_due, rebuild_topn
+from scripts.serving.notice_query import TOPN_MAX_AGE_DAYS, fetch_topn_rows
+from scripts.utils import sqlite_backend
+
+TODAY = date(2025, 3, 10)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite_backend.connect(":memory:")
+    for i in range(1, 6):
+        c.execute("""
+            INSERT INTO dbo.notice (id, title, url, url_hash, topic, topic_norm, oneline, deadline, llm_status, created_at)
+            VALUES (?, ?, ?, ?, '장학', '장학', '', NULL, 1, ?)
+        """, i, f"공지 {i}", f"https://example.com/{i}", f"h{i}", datetime(2025, 3, 1) + timedelta(hours=i))
+        c.execute("""
+            INSERT INTO dbo.notice_department (notice_id, department, department_norm)
+            VALUES (?, '경영학과', '경영학과')
+        """, i)
+    c.commit()
+    yield c
+    c.close()
+
+
+def _ids(conn, today):
+    rows = fetch_topn_rows(conn, ("장학",), ("경영학과",), "최신순", today, limit=10)
+    return None if rows is None else [r[0] for r in rows]
+
+
+def test_full_rebuild_is_due_once_per_day(conn):
+    assert full_rebuild_due(conn, TODAY)
+    rebuild_topn(conn, today=TODAY, size=10)
+    assert not full_rebuild_due(conn, TODAY)
+    assert full_rebuild_due(conn, TODAY + timedelta(days=1))
+
+
+def test_pair_rebuild_does_not_advance_built_for(conn):
+    rebuild_topn(conn, today=TODAY, size=10)
+    rebuild_topn(conn, pairs=affected_pairs(conn, [1]), today=TODAY + timedelta(days=1), size=10)
+    assert full_rebuild_due(conn, TODAY + timedelta(days=1))
+
+
+def test_full_rebuild_drops_rows_of_deactivated_notices(conn):
+    rebuild_topn(conn, today=TODAY, size=10)
+    conn.execute("UPDATE dbo.notice SET llm_status = 0 WHERE id = 3;")
+    conn.commit()
+    # 다른 조합의 새 공지만 다시 채우면 빠진 공지의 행은 남음
+    rebuild_topn(conn, pairs=[("취업", "경영학과")], today=TODAY, size=10)
+    assert 3 in _ids(conn, TODAY)
+
+    rebuild_topn(conn, today=TODAY, size=10)
+    assert _ids(conn, TODAY) == [5, 4, 2, 1]
+
+
+def test_stale_table_falls_back(conn):
+    rebuild_topn(conn, today=TODAY, size=10)
+    assert _ids(conn, TODAY + timedelta(days=TOPN_MAX_AGE_DAYS)) == [5, 4, 3, 2, 1]
+    assert _ids(conn, TODAY + timedelta(days=TOPN_MAX_AGE_DAYS + 1)) is None